@@ -1,21 +1,35 @@
 # backend/app.py
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-import joblib
 import numpy as np
 import jwt
 from datetime import datetime, timedelta
+import base64
 import json
 import os
 import re
-import pandas as pd
 import logging
+import time
 import bcrypt
 from functools import wraps
 from google.oauth2 import id_token
 from google.auth.transport.requests import Request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from insights import generate_insights 
+from insights import follow_datasets, generate_insights, refresh_dataset
+from user_store import open_user_store
+from feature_store import FeatureStore
+from models import Education, Skills, User
+from prediction_history import PredictionHistory, SORT_FIELDS
+from feedback_store import FeedbackStore, parse_rating
+from dataset_ingest import DatasetStore, ValidationError
+from inference import build_feature_text, predict_batch
+from batcher import MicroBatcher
+from prediction_cache import PredictionCache
+from artifacts import ModelArtifacts, MODEL_PATH, VECTORIZER_PATH, install_artifacts
+from model_registry import ModelRegistry
+from retrain_jobs import RetrainJobManager
+from metrics import render_prometheus
+from tracing import STAGE_MS, REQUEST_MS, span, start_trace, finish_trace, record, record_stages
 
 # ---------- Configuration ----------
 app = Flask(__name__)
@@ -32,38 +46,50 @@ app.config["JWT_TOKEN_LOCATION"] = ["headers"]
 app.config["JWT_HEADER_NAME"] = "Authorization"
 app.config["JWT_HEADER_TYPE"] = "Bearer"
 
-# File paths
-USERS_FILE = os.path.join(os.path.dirname(__file__), "users.json")
-MODEL_PATH = "models/job_model.pkl"
-VECTORIZER_PATH = "models/vectorizer.pkl"
-
-model = joblib.load(MODEL_PATH)
-vectorizer = joblib.load(VECTORIZER_PATH)
-
-print("✅ ML Model & Vectorizer Loaded")
+# Model & vectorizer: loaded lazily on first prediction (mmap'd when the
+# fast .joblib copies exist, see artifacts.py). Served from the registry's
+# current version when one is published; new versions are picked up by a
+# background reloader every MODEL_RELOAD_SECONDS (0 = off).
+model_registry = ModelRegistry()
+artifacts = ModelArtifacts(
+    MODEL_PATH, VECTORIZER_PATH,
+    resolver=model_registry.resolve,
+    reload_seconds=float(os.environ.get("MODEL_RELOAD_SECONDS", 10))
+)
 
 
 # Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# ---------- Helpers (IO) ----------
-def load_users():
-    if not os.path.exists(USERS_FILE):
-        return []
-    with open(USERS_FILE, "r", encoding="utf-8") as f:
-        try:
-            return json.load(f)
-        except Exception as e:
-            logger.error("Failed to load users.json: %s", str(e))
-            return []
 
-def save_users(users):
+# Per-request stage timings (tracing.py); breakdowns of requests slower than
+# SLOW_REQUEST_MS are logged
+@app.before_request
+def open_request_trace():
+    start_trace(request.endpoint or "unknown", request.path)
+
+
+@app.after_request
+def close_request_trace(response):
+    finish_trace(response.status_code)
+    return response
+
+# ---------- User store ----------
+# SQLite by default (see user_store.py); users.json is migrated on first run
+user_store = open_user_store()
+
+# ---------- Feature store ----------
+# Per-user feature vectors (feature_store.py), refreshed on profile writes
+feature_store = FeatureStore()
+
+
+def refresh_features(email):
+    """Recompute one user's vector; a failure here never fails the write."""
     try:
-        with open(USERS_FILE, "w", encoding="utf-8") as f:
-            json.dump(users, f, indent=2)
-    except Exception as e:
-        logger.exception("Failed to save users.json: %s", str(e))
+        feature_store.update([user_store.get_by_email(email)])
+    except Exception:
+        logger.exception("Feature store update failed for %s", email)
 
 # ---------- Password helpers (bcrypt) ----------
 def hash_password(password: str) -> str:
@@ -111,6 +137,14 @@ def token_required(f):
         return f(decoded, *args, **kwargs)
     return decorated
 
+def admin_required(f):
+    @wraps(f)
+    def decorated(current_user, *args, **kwargs):
+        if current_user.get("role") != "admin":
+            return jsonify({"error": "Admin access only"}), 403
+        return f(current_user, *args, **kwargs)
+    return decorated
+
 # ---------- Validation helpers ----------
 EMAIL_REGEX = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
 
@@ -165,14 +199,13 @@ def signup():
         if err:
             return jsonify({"error": err}), 400
 
-        users = load_users()
-        if any(u.get("email") == email for u in users):
+        if user_store.get_by_email(email):
             return jsonify({"error": "User already exists"}), 409
 
         # Hash password with bcrypt
         hashed_pass = hash_password(password)
 
-        users.append({
+        created = user_store.create_user({
             "username": username,
             "email": email,
             "password": hashed_pass,
@@ -182,7 +215,8 @@ def signup():
             "cgpa": "",
             "certifications": ""
         })
-        save_users(users)
+        if not created:
+            return jsonify({"error": "User already exists"}), 409
         return jsonify({"message": "User created"}), 201
 
     except Exception as e:
@@ -201,9 +235,8 @@ def login():
         if not identifier or not password:
             return jsonify({"error": "email/username and password required"}), 400
 
-        users = load_users()
         # find user by email or username
-        user = next((u for u in users if (u.get("email") == identifier or u.get("username") == identifier)), None)
+        user = user_store.get_by_login(identifier)
 
         if not user:
             return jsonify({"error": "Invalid username or password"}), 401
@@ -231,8 +264,7 @@ def login():
 def profile(decoded):
     try:
         email = decoded.get("email")
-        users = load_users()
-        user = next((u for u in users if u["email"] == email), None)
+        user = user_store.get_by_email(email)
         if not user:
             return jsonify({"error": "User not found"}), 404
         return jsonify({"user": user}), 200
@@ -252,24 +284,18 @@ def edit_profile(decoded):
         if err:
             return jsonify({"error": err}), 400
 
-        users = load_users()
         email = decoded.get("email")
-        updated = False
-        for user in users:
-            if user["email"] == email:
-                # Only update fields provided
-                if "username" in data and data["username"] is not None:
-                    user["username"] = data["username"]
-                if "about" in data and data["about"] is not None:
-                    user["about"] = data["about"]
-
-                updated = True
-                break
-
-        if not updated:
+
+        # Only update fields provided
+        fields = {}
+        if "username" in data and data["username"] is not None:
+            fields["username"] = data["username"]
+        if "about" in data and data["about"] is not None:
+            fields["about"] = data["about"]
+
+        if not user_store.update_profile(email, fields):
             return jsonify({"error": "User not found"}), 404
 
-        save_users(users)
         return jsonify({"message": "Profile updated successfully"}), 200
 
     except Exception as e:
@@ -295,16 +321,14 @@ def google_login():
         username = idinfo.get("name")
         picture = idinfo.get("picture")
 
-        users = load_users()
-        user = next((u for u in users if u["email"] == email), None)
+        user = user_store.get_by_email(email)
         if not user:
             user = {
                 "username": username,
                 "email": email,
                 "password": None,
             }
-            users.append(user)
-            save_users(users)
+            user_store.create_user(user)
 
         token = generate_token({
             "email":email,
@@ -365,28 +389,23 @@ def add_education(decoded):
         if errors:
             return jsonify({"errors": errors}), 400
 
-        # -------- Find user --------
-        users = load_users()
+        # -------- SAVE UNDER education OBJECT (🔥 FIX) --------
         email = decoded["email"]
-        user = next((u for u in users if u.get("email") == email), None)
+        education = Education(
+            degree=degree,
+            specialization=specialization,
+            cgpa=cgpa,
+            year=year,
+            college_tier=college_tier,
+            internship=internship,
+            projects=projects,
+            backlogs=backlogs,
+            certifications=certifications
+        )
 
-        if not user:
+        if not user_store.set_education(email, education.to_dict()):
             return jsonify({"error": "User not found"}), 404
-
-        # -------- SAVE UNDER education OBJECT (🔥 FIX) --------
-        user["education"] = {
-            "degree": degree,
-            "specialization": specialization,
-            "cgpa": cgpa,
-            "year": year,
-            "collegeTier": college_tier,
-            "internship": internship,
-            "projects": projects,
-            "backlogs": backlogs,
-            "certifications": certifications
-        }
-
-        save_users(users)
+        refresh_features(email)
 
         return jsonify({"message": "Education details saved successfully"}), 200
 
@@ -401,13 +420,12 @@ def add_education(decoded):
 def get_education(decoded):
     email = decoded["email"]
 
-    users = load_users()
-    user = next((u for u in users if u.get("email") == email), None)
+    user = user_store.get_record(email)
 
-    if not user or "education" not in user:
+    if not user or user.education is None:
         return jsonify({"education": None})
 
-    return jsonify({"education": user["education"]})
+    return jsonify({"education": user.education.to_dict()})
 
 
 # ---------------- Skills Add ----------------
@@ -420,17 +438,13 @@ def add_skills():
 
         if not email or not skills:
             return jsonify({"error": "Email and skills required"}), 400
-
-        users = load_users()
-
-        user = next((u for u in users if u.get("email") == email), None)
-        if not user:
-            return jsonify({"error": "User not found"}), 404
+        if not isinstance(skills, dict):
+            return jsonify({"error": "Skills must be an object of name: rating"}), 400
 
         # Save skills inside user object
-        user["skills"] = skills
-
-        save_users(users)
+        if not user_store.set_skills(email, Skills.from_dict(skills).to_dict()):
+            return jsonify({"error": "User not found"}), 404
+        refresh_features(email)
 
         return jsonify({"message": "Skills saved successfully"}), 200
 
@@ -442,14 +456,13 @@ def add_skills():
 @app.route("/skills/get/<email>", methods=["GET"])
 def get_skills(email):
     try:
-        users = load_users()
-        user = next((u for u in users if u.get("email") == email), None)
+        user = user_store.get_record(email)
 
         if not user:
             return jsonify({"error": "User not found"}), 404
 
         return jsonify({
-            "skills": user.get("skills", {})
+            "skills": user.skills.to_dict() if user.skills is not None else {}
         }), 200
 
     except Exception as e:
@@ -465,106 +478,59 @@ def get_prediction_history(decoded):
 
     user_email = decoded["email"]   # 🔐 Logged-in user
 
-    # If file doesn't exist → no history
-    if not os.path.exists("prediction_history.json"):
-        return jsonify([])
+    # Optional pagination: ?offset=0&limit=20 (default: everything)
+    offset = request.args.get("offset", default=0, type=int)
+    limit = request.args.get("limit", default=None, type=int)
 
-    # Safely read JSON
-    try:
-        with open("prediction_history.json", "r") as f:
-            all_history = json.load(f)
-    except json.JSONDecodeError:
-        return jsonify([])
+    # ✅ ONLY CURRENT USER'S DATA (per-user index, no full scan)
+    return jsonify(history_store.for_user(user_email, max(offset, 0), limit))
 
-    # ✅ FILTER ONLY CURRENT USER'S DATA
-    user_history = [
-        item for item in all_history
-        if item.get("user_id") == user_email
-    ]
 
-    return jsonify(user_history)
 
+TOP_CONFIDENCE_THRESHOLD = 40
+MAX_BATCH_SIZE = 1000
+MAX_LOG_PAGE_SIZE = 500
 
 
-# -----------------------------
-# JOB ROLE MAPPING (REALISTIC)
-# -----------------------------
-JOB_ROLE_MAP = {
- 21: 'Database Administrator',
- 17: 'Cybersecurity Analyst',
- 62: 'Software Engineer',
- 41: 'Machine Learning Engineer',
- 71: 'Web Developer',
- 64: 'Systems Analyst',
- 0: 'AI Researcher',
- 18: 'Data Analyst',
- 12: 'Cloud Architect',
- 1: 'AI Specialist',
- 56: 'Robotics Engineer',
- 19: 'Data Science',
- 70: 'Web Designing',
- 37: 'Java Developer',
- 57: 'SAP Developer',
- 6: 'Automation Testing',
- 26: 'Electrical Engineering',
- 54: 'Python Developer',
- 23: 'DevOps Engineer',
- 44: 'Network Security Engineer',
- 20: 'Database',
- 35: 'Hadoop',
- 25: 'ETL Developer',
- 24: 'DotNet Developer',
- 8: 'Blockchain',
- 66: 'Testing',
- 31: 'Fitness Coach',
- 50: 'Physician',
- 30: 'Financial Analyst',
- 63: 'Supply Chain Manager',
- 4: 'Architect',
- 46: 'Operations Manager',
- 68: 'Urban Planner',
- 48: 'Personal Trainer',
- 7: 'Biomedical Engineer',
- 45: 'Nurse',
- 52: 'Product Manager',
- 14: 'Content Writer',
- 49: 'Pharmacist',
- 10: 'Chef',
- 53: 'Psychologist',
- 11: 'Civil Engineer',
- 2: 'Accountant',
- 32: 'Graphic Designer',
- 22: 'Dentist',
- 51: 'Pilot',
- 67: 'UX Designer',
- 65: 'Teacher',
- 34: 'HR Specialist',
- 69: 'Veterinarian',
- 28: 'Environmental Scientist',
- 40: 'Legal Consultant',
- 60: 'Sales Representative',
- 58: 'SEO Specialist',
- 9: 'Business Analyst',
- 16: 'Customer Service Representative',
- 42: 'Marketing Manager',
- 61: 'Social Worker',
- 27: 'Electrician',
- 38: 'Journalist',
- 29: 'Event Planner',
- 39: 'Lawyer',
- 43: 'Mechanical Engineer',
- 13: 'Construction Manager',
- 55: 'Research Scientist',
- 15: 'Creative Director',
- 33: 'HR',
- 3: 'Advocate',
- 5: 'Arts',
- 59: 'Sales',
- 36: 'Health and fitness',
- 47: 'PMO'
-}
-
-HISTORY_FILE = "prediction_history.json"
+def score_texts(texts, top_k=5, timings=None, min_confidence=None):
+    """(recommendations per text, version of the model that scored them)."""
+    start = time.perf_counter()
+    with artifacts.acquire() as loaded:
+        if timings is not None:
+            # lazy first load shows up here
+            timings["model_acquire"] = (time.perf_counter() - start) * 1000
+        scored = predict_batch(loaded.model, loaded.vectorizer, texts, top_k, timings, min_confidence)
+        return scored, loaded.version
+
+
+def score_batch(texts):
+    # each request gets its batch's stage timings and model version along with its result
+    timings = {}
+    scored, version = score_texts(texts, timings=timings)
+    return [(recommendations, timings, version) for recommendations in scored]
+
+
+# Concurrent single predictions are grouped into one predict_proba call.
+# PREDICT_BATCH_MAX_SIZE=1 turns batching off.
+prediction_batcher = MicroBatcher(
+    score_batch,
+    max_batch_size=int(os.environ.get("PREDICT_BATCH_MAX_SIZE", 32)),
+    max_wait_ms=float(os.environ.get("PREDICT_BATCH_MAX_WAIT_MS", 2))
+)
+
+# Top-5 results per feature text; cleared when a new model version is served.
+# PREDICTION_CACHE_SIZE=0 turns caching off.
+prediction_cache = PredictionCache(
+    version_fn=lambda: artifacts.version,
+    max_entries=int(os.environ.get("PREDICTION_CACHE_SIZE", 4096)),
+    ttl_seconds=float(os.environ.get("PREDICTION_CACHE_TTL", 3600))
+)
+
+
+HISTORY_FILE = "prediction_history.json"   # legacy, imported once
+HISTORY_DIR = os.environ.get("HISTORY_DIR", "prediction_history")
+
+history_store = PredictionHistory(HISTORY_DIR, legacy_file=HISTORY_FILE)
 
 # -----------------------------
 # PREDICT JOB ROLE API
@@ -576,20 +542,20 @@ def predict_job_role(decoded_user):
     try:
         data = request.get_json()
         
-        users = load_users()
-        user = next((u for u in users if u.get("email") == decoded_user["email"]), None)
+        with span("user_lookup"):
+            user = user_store.get_record(decoded_user["email"])
 
-        if not user or "education" not in user:
+        if not user or user.education is None:
             return jsonify({
                 "status": "error",
                 "message": "Education details not found"
             }), 400
-        education = user["education"]
-        skills = user.get("skills", {})
-        degree = education.get("degree", "")
-        specialization = education.get("specialization", "")
-        cgpa = education.get("cgpa", "")
-        certifications = education.get("certifications", [])
+        education = user.education
+        skills = user.skills
+        degree = education.degree
+        specialization = education.specialization
+        cgpa = education.cgpa
+        certifications = education.certifications
 
         if not degree or not specialization:
             return jsonify({
@@ -597,34 +563,17 @@ def predict_job_role(decoded_user):
                 "message": "Degree and specialization are required"
             }), 400
 
-        skills_text = " ".join([
-            f"{k}_{v}" for k, v in skills.items()
-        ])
-
-        text_input = (
-            f"{degree} {specialization} CGPA {cgpa} "
-            + " ".join(certifications)
-            + " "
-            + skills_text
-        )
-
-        vectorized_input = vectorizer.transform([text_input])
-        probabilities = model.predict_proba(vectorized_input)[0]
-        classes = model.classes_
-
-        top_indices = np.argsort(probabilities)[::-1][:5]
-        
-        top_probs = probabilities[top_indices]
-        normalized_probs = (top_probs / top_probs.sum()) * 100
-        
-        recommendations = []
-        for idx, conf in zip(top_indices, normalized_probs):
-            encoded_label = classes[idx]
-            recommendations.append({
-                "job_role": JOB_ROLE_MAP.get(encoded_label, f"Role_{encoded_label}"),
-                "confidence": round(float(conf), 2)
-            })
-        TOP_CONFIDENCE_THRESHOLD = 40
+        with span("feature_text"):
+            text_input = build_feature_text(education, skills)
+
+        with span("cache_lookup"):
+            recommendations = prediction_cache.get(text_input)
+        if recommendations is None:
+            submitted = time.perf_counter()
+            recommendations, timings, version = prediction_batcher.submit(text_input)
+            record("batch_wait", (time.perf_counter() - submitted) * 1000 - sum(timings.values()))
+            record_stages(timings)
+            prediction_cache.put(text_input, recommendations, version)
         
         top_confidence = recommendations[0]["confidence"]
         is_flagged = top_confidence < TOP_CONFIDENCE_THRESHOLD
@@ -641,31 +590,9 @@ def predict_job_role(decoded_user):
             "flagged": is_flagged
         }
 
-        if os.path.exists(HISTORY_FILE):
-            with open(HISTORY_FILE, "r") as f:
-                history_data = json.load(f)
-        else:
-            history_data = []
-
-        updated = False
-        for item in history_data:
-
-    # 🔒 skip old entries that don’t belong to logged-in users
-            if item.get("user_id") != new_entry["user_id"]:
-               continue
-
-            if item.get("input_details") == new_entry["input_details"]:
-                item["predictions"] = new_entry["predictions"]
-                item["timestamp"] = new_entry["timestamp"]
-                updated = True
-                break
-
-
-        if not updated:
-            history_data.append(new_entry)
-
-        with open(HISTORY_FILE, "w") as f:
-            json.dump(history_data, f, indent=4)
+        # Append-only; same input_details → that entry gets the new predictions
+        with span("history_persist"):
+            history_store.record(new_entry)
 
         return jsonify({
             "status": "success",
@@ -687,42 +614,158 @@ def predict_job_role(decoded_user):
 
 
 
-@app.route("/api/visualizations/degree-job", methods=["GET"])
-def degree_job_chart():
-    if not os.path.exists(HISTORY_FILE):
-        return jsonify({})
+# -----------------------------
+# BATCH PREDICTION (COHORTS)
+# -----------------------------
+def predict_profiles(profiles, top_k=5, min_confidence=None):
+    """
+    Score many profiles in one pass.
+    Each profile is a raw resume string, {"education": {...}, "skills": {...}}
+    or a models.User record.
+    Returns one result dict per profile, in order.
+    """
+    results = [None] * len(profiles)
+    texts, positions = [], []
+    use_cache = top_k == 5 and min_confidence is None   # the cache only holds full top-5 lists
+
+    for i, profile in enumerate(profiles):
+        if isinstance(profile, str):
+            text = profile.strip()
+        elif isinstance(profile, (dict, User)):
+            if isinstance(profile, dict):
+                education = Education.from_dict(profile.get("education"))
+                skills = Skills.from_dict(profile.get("skills"))
+            else:
+                education = profile.education or Education()
+                skills = profile.skills
+            if not education.degree or not education.specialization:
+                results[i] = {"status": "error", "message": "Degree and specialization are required"}
+                continue
+            text = build_feature_text(education, skills)
+        else:
+            text = ""
+
+        if not text:
+            results[i] = {"status": "error", "message": "Empty profile"}
+            continue
+
+        cached = prediction_cache.get(text) if use_cache else None
+        if cached is not None:
+            results[i] = batch_result(cached)
+            continue
+        texts.append(text)
+        positions.append(i)
+
+    timings = {}
+    scored, version = score_texts(texts, top_k, timings, min_confidence)
+    record_stages(timings)
+    for i, text, recommendations in zip(positions, texts, scored):
+        if use_cache:
+            prediction_cache.put(text, recommendations, version)
+        results[i] = batch_result(recommendations)
+    return results
+
+
+def batch_result(recommendations):
+    return {
+        "status": "success",
+        "top_recommendation": recommendations[0],
+        "alternative_careers": recommendations[1:],
+        "all_predictions": recommendations
+    }
 
-    with open(HISTORY_FILE) as f:
-        history = json.load(f)
 
-    job_counts = {}
+@app.route("/predict-job-role/batch", methods=["POST"])
+@token_required
+def predict_job_role_batch(decoded_user):
+    """
+    Body: {"texts": [...]} and/or {"profiles": [...]}, optional "emails": [...]
+    (admin only, scores stored users), "top_k" and "min_confidence" (drops
+    recommendations below that %, the top one is always kept). Results are
+    not written to prediction history.
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"status": "error", "message": "Body must be a JSON object"}), 400
+    try:
+        top_k = int(data.get("top_k", 5))
+        min_confidence = data.get("min_confidence")
+        if min_confidence is not None:
+            min_confidence = float(min_confidence)
+    except (TypeError, ValueError):
+        return jsonify({
+            "status": "error",
+            "message": "top_k must be an integer and min_confidence a number"
+        }), 400
 
-    for record in history:
-        predictions = record.get("predictions", [])
-        for pred in predictions:
-            role = pred.get("job_role")
-            if role:
-                job_counts[role] = job_counts.get(role, 0) + 1
+    lists = {name: data.get(name) or [] for name in ("texts", "profiles", "emails")}
+    for name, value in lists.items():
+        if not isinstance(value, list):
+            return jsonify({"status": "error", "message": f"{name} must be a list"}), 400
+    profiles = lists["texts"] + lists["profiles"]
+    emails = lists["emails"]
+    if emails and decoded_user.get("role") != "admin":
+        return jsonify({"error": "Admin access only"}), 403
+
+    # size limit first: an oversized request never reaches the user lookups
+    if not profiles and not emails:
+        return jsonify({"status": "error", "message": "No profiles provided"}), 400
+    if len(profiles) + len(emails) > MAX_BATCH_SIZE:
+        return jsonify({
+            "status": "error",
+            "message": f"At most {MAX_BATCH_SIZE} profiles per request"
+        }), 400
 
-    return jsonify(job_counts)
+    try:
+        for email in emails:
+            profiles.append(user_store.get_record(email) or User(email))
 
+        model, _ = artifacts.get()
+        top_k = max(1, min(top_k, len(model.classes_)))
+
+        return jsonify({
+            "status": "success",
+            "count": len(profiles),
+            "results": predict_profiles(profiles, top_k, min_confidence)
+        }), 200
+
+    except Exception as e:
+        logger.exception("Batch prediction error")
+        return jsonify({"status": "error", "message": str(e)}), 500
 
-@app.route("/api/visualizations/job-domain", methods=["GET"])
-def job_domain_chart():
-    if not os.path.exists(HISTORY_FILE):
-        return jsonify({})
 
-    with open(HISTORY_FILE) as f:
-        history = json.load(f)
+@app.route("/admin/inference-metrics", methods=["GET"])
+@token_required
+@admin_required
+def inference_metrics(user):
+    return jsonify({
+        "batcher": prediction_batcher.metrics(),
+        "cache": prediction_cache.stats(),
+        "model": artifacts.status()
+    })
+
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    batcher = prediction_batcher
+    text = render_prometheus([
+        REQUEST_MS, STAGE_MS,
+        batcher.queue_depth, batcher.batch_size, batcher.wait_ms, batcher.run_ms
+    ])
+    return Response(text, mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/api/visualizations/degree-job", methods=["GET"])
+def degree_job_chart():
+    # incremental counters (prediction_stats.py); optional ?degree= filter
+    job_counts = history_store.stats.role_counts(request.args.get("degree"))
+
+    return jsonify(job_counts)
 
-    domain_counts = {}
 
-    for record in history:
-        predictions = record.get("predictions", [])
-        for pred in predictions:
-            role = pred.get("job_role")
-            if role:
-                domain_counts[role] = domain_counts.get(role, 0) + 1
+@app.route("/api/visualizations/job-domain", methods=["GET"])
+def job_domain_chart():
+    domain_counts = history_store.stats.role_counts(request.args.get("degree"))
 
     total = sum(domain_counts.values())
     if total == 0:
@@ -736,105 +779,175 @@ def job_domain_chart():
     return jsonify(percentages)
 
 
+@app.route("/api/visualizations/daily", methods=["GET"])
+def daily_predictions_chart():
+    return jsonify(history_store.stats.daily_counts())
+
+
 @app.route("/api/latest-prediction", methods=["GET"])
 @token_required
 def latest_prediction(decoded):
     email = decoded["email"]
 
-    if not os.path.exists(HISTORY_FILE):
-        return jsonify(None)
-
-    with open(HISTORY_FILE) as f:
-        history = json.load(f)
-
-    user_history = [
-        h for h in history if h.get("user_id") == email
-    ]
-
-    if not user_history:
-        return jsonify(None)
-
-    return jsonify(user_history[-1])
+    return jsonify(history_store.latest_for_user(email))
 
 
 
 @app.route("/admin/prediction-logs", methods=["GET"])
 @token_required
+@admin_required
 def admin_prediction_logs(decoded):
+    """
+    Cursor-paginated prediction log.
+
+    Query params: user, role, flagged (true/false), min_confidence,
+    max_confidence, from / to (timestamps, "to" matches by prefix),
+    sort (timestamp|confidence), order (asc|desc), limit, cursor (from the
+    previous page's next_cursor). The page is streamed as it is read.
+    """
+    args = request.args
+    try:
+        sort = args.get("sort", "timestamp")
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_FIELDS)}")
+        flagged = args.get("flagged")
+        if flagged is not None:
+            flagged = flagged.lower() in ("1", "true", "yes")
+        min_confidence = args.get("min_confidence", type=float)
+        max_confidence = args.get("max_confidence", type=float)
+        limit = max(1, min(int(args.get("limit", 50)), MAX_LOG_PAGE_SIZE))
+        after = decode_cursor(args["cursor"], sort) if args.get("cursor") else None
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": f"Invalid query: {e}"}), 400
+
+    records, next_key = history_store.query(
+        user=args.get("user") or None,
+        role=args.get("role") or None,
+        flagged=flagged,
+        min_confidence=min_confidence,
+        max_confidence=max_confidence,
+        since=args.get("from") or None,
+        until=args.get("to") or None,
+        sort=sort,
+        descending=args.get("order", "desc") != "asc",
+        after=after,
+        limit=limit
+    )
 
-    with open("prediction_history.json") as f:
-        history = json.load(f)
-
-    logs = []
-    for h in history:
-        top = h["predictions"][0]
-        logs.append({
-            "user": h["user_id"],
-            "predicted_role": top["job_role"],
-            "confidence": top["confidence"],
-            "timestamp": h["timestamp"],
-            "flagged": h.get("flagged", False)
-        })
+    def generate():
+        yield '{"items":['
+        for i, h in enumerate(records):
+            predictions = h.get("predictions") or []
+            top = predictions[0] if predictions else {}
+            item = {
+                "id": h.get("id"),
+                "user": h.get("user_id"),
+                "predicted_role": top.get("job_role"),
+                "confidence": top.get("confidence"),
+                "timestamp": h.get("timestamp"),
+                "flagged": h.get("flagged", False)
+            }
+            yield ("," if i else "") + json.dumps(item)
+        yield '],"next_cursor":' + json.dumps(encode_cursor(next_key) if next_key else None) + "}"
 
-    return jsonify(logs)
+    return Response(stream_with_context(generate()), mimetype="application/json")
 
 
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
 
-FEEDBACK_FILE = "feedback.json"
+
+def decode_cursor(cursor, sort="timestamp"):
+    """[sort value, record id]: a timestamp string or a confidence number."""
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("bad cursor") from e
+    if not isinstance(key, list) or len(key) != 2:
+        raise ValueError("bad cursor")
+    value, record_id = key
+    if sort == "timestamp":
+        value_ok = isinstance(value, str)
+    else:
+        value_ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if not value_ok or not isinstance(record_id, str):
+        raise ValueError(f"bad cursor for sort={sort}")
+    return key
+
+
+FEEDBACK_FILE = "feedback.json"   # legacy, imported once
+FEEDBACK_DIR = os.environ.get("FEEDBACK_DIR", "feedback")
+MAX_FEEDBACK_PAGE_SIZE = 500
+
+feedback_store = FeedbackStore(FEEDBACK_DIR, legacy_file=FEEDBACK_FILE)
 
 @app.route("/feedback", methods=["POST"])
 @token_required
 def submit_feedback(user):
-    data = request.get_json()
+    data = request.get_json() or {}
+
+    rating = data.get("rating")
+    if rating not in (None, "") and parse_rating(rating) is None:
+        return jsonify({"error": "rating must be between 1 and 5"}), 400
 
-    feedback = {
+    feedback_store.add({
         "user": user["email"],
         "role": data.get("job_role"),
-        "rating": data.get("rating"),
+        "rating": rating,
         "comment": data.get("comment"),
         "timestamp": datetime.utcnow().isoformat()
-    }
-
-    feedbacks = []
-    if os.path.exists(FEEDBACK_FILE):
-        with open(FEEDBACK_FILE) as f:
-            feedbacks = json.load(f)
-
-    feedbacks.append(feedback)
-
-    with open(FEEDBACK_FILE, "w") as f:
-        json.dump(feedbacks, f, indent=2)
+    })
 
     return jsonify({"message": "Feedback received successfully"}), 200
 
 
 
-def admin_required(f):
-    @wraps(f)
-    def decorated(current_user, *args, **kwargs):
-        if current_user.get("role") != "admin":
-            return jsonify({"error": "Admin access only"}), 403
-        return f(current_user, *args, **kwargs)
-    return decorated
-
-
 @app.route("/admin/feedback", methods=["GET"])
 @token_required
 @admin_required
 def get_feedback(user):
-    if not os.path.exists(FEEDBACK_FILE):
-        return jsonify([])
+    """Newest first. Query: offset, limit (max MAX_FEEDBACK_PAGE_SIZE)."""
+    try:
+        offset = max(0, int(request.args.get("offset", 0)))
+        limit = max(1, min(int(request.args.get("limit", 50)), MAX_FEEDBACK_PAGE_SIZE))
+    except ValueError as e:
+        return jsonify({"error": f"Invalid query: {e}"}), 400
+
+    items = feedback_store.page(offset, limit)
+    total = feedback_store.count()
+    return jsonify({
+        "items": items,
+        "total": total,
+        "next_offset": offset + limit if offset + limit < total else None
+    })
 
-    with open(FEEDBACK_FILE) as f:
-        return jsonify(json.load(f))
 
+@app.route("/admin/feedback/summary", methods=["GET"])
+@token_required
+@admin_required
+def feedback_summary(user):
+    """Per-role count, mean rating and rating histogram."""
+    return jsonify(feedback_store.summary())
 
 
 
+
+# /api/career-insights indexes the current uploaded version (the bundled
+# CSV until the first upload). The worker that handled an upload re-indexes
+# right away; the others notice the manifest moved on their next check.
+dataset_store = DatasetStore(on_publish=refresh_dataset)
+follow_datasets(dataset_store.current_path)
+
+
 @app.route("/admin/upload-dataset", methods=["POST"])
 @token_required
 # @admin_required
 def upload_dataset(user):
+    """
+    The upload is written to disk once and validated chunk by chunk. Files
+    above INGEST_ASYNC_BYTES are validated in the background: the response
+    is 202 with a job_id to poll at /admin/upload-dataset/<job_id>.
+    """
     if "file" not in request.files:
         return jsonify({"error": "No file uploaded"}), 400
 
@@ -843,103 +956,166 @@ def upload_dataset(user):
     if not file.filename.endswith(".csv"):
         return jsonify({"error": "Only CSV allowed"}), 400
 
-    df = pd.read_csv(file)
+    staged, sha256, size = dataset_store.stage(file.stream)
 
-    # ✅ Basic validation
-    required_cols = {"job_role", "Resume", "job_role_encoded"}
-    if not required_cols.issubset(df.columns):
+    if size > dataset_store.async_bytes:
+        job_id = dataset_store.submit(staged, sha256, size, file.filename, user.get("email"))
         return jsonify({
-            "error": f"CSV must contain columns: {required_cols}"
-        }), 400
-
-    filename = f"dataset_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-    path = f"./datasets/{filename}"
-    df.to_csv(path, index=False)
+            "success": True,
+            "message": "Dataset is being validated",
+            "job_id": job_id
+        }), 202
 
-    # Optional: mark as current dataset
-    df.to_csv("./datasets/current.csv", index=False)
+    try:
+        result = dataset_store.ingest(staged, sha256, file.filename, user.get("email"))
+    except ValidationError as e:
+        return jsonify({"error": "Invalid dataset", "details": e.errors}), 400
 
     return jsonify({
         "success": True,
-        "message": "Dataset uploaded successfully",
-        "version": filename
+        "message": "Dataset already uploaded" if result["duplicate"] else "Dataset uploaded successfully",
+        **result
     })
 
 
+@app.route("/admin/upload-dataset/<job_id>", methods=["GET"])
+@token_required
+@admin_required
+def upload_dataset_status(user, job_id):
+    status = dataset_store.job_status(job_id)
+    if status is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(status)
+
+
 
 @app.route("/admin/flag-prediction", methods=["POST"])
 @token_required
+@admin_required
 def flag_prediction(decoded):
-    if decoded.get("role") != "admin":
-        return jsonify({"error": "Unauthorized"}), 403
+    """
+    Body: {"id": ...} or {"ids": [...]} (bulk), optional "flagged"
+    (default true; false unflags). {"timestamp": ...} is still accepted from
+    older clients and flags the first prediction with that timestamp.
+    """
+    data = request.get_json() or {}
+    flagged = bool(data.get("flagged", True))
+
+    ids = list(data.get("ids") or [])
+    if data.get("id"):
+        ids.append(data["id"])
+    if not ids and data.get("timestamp"):
+        match_id = history_store.find_by_timestamp(data["timestamp"])
+        if match_id:
+            ids.append(match_id)
+
+    if not ids:
+        return jsonify({"error": "Prediction not found"}), 404
+    if len(ids) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} ids per request"}), 400
+
+    updated = history_store.set_flags(ids, flagged)
+    if not updated:
+        return jsonify({"error": "Prediction not found"}), 404
 
-    data = request.get_json()
-    timestamp = data.get("timestamp")
+    found = set(updated)
+    action = "flagged" if flagged else "unflagged"
+    return jsonify({
+        "message": f"Prediction {action} successfully" if len(updated) == 1
+        else f"{len(updated)} predictions {action} successfully",
+        "updated": updated,
+        "not_found": [i for i in ids if i not in found]
+    })
 
-    if not os.path.exists(HISTORY_FILE):
-        return jsonify({"error": "No history found"}), 404
 
-    with open(HISTORY_FILE, "r") as f:
-        history = json.load(f)
 
-    updated = False
-    for h in history:
-        if str(h.get("timestamp")) == str(timestamp):
-            h["flagged"] = True
-            updated = True
-            break
 
-    if not updated:
-        return jsonify({"error": "Prediction not found"}), 404
+def promote_retrained_model(job_dir, result):
+    """Publish the candidate, hot-swap it here, then make it current for all workers."""
+    model_path = result["model_path"]
+    vectorizer_path = result["vectorizer_path"]
 
-    with open(HISTORY_FILE, "w") as f:
-        json.dump(history, f, indent=4)
+    version = model_registry.publish(
+        model_path, vectorizer_path,
+        metrics={"accuracy": result["accuracy"], "f1": result["f1"]},
+        source=f"retrain:{os.path.basename(job_dir)}",
+        activate=False
+    )
+    # load + pre-warm first: a broken candidate never becomes current
+    artifacts.reload(
+        (version, *model_registry.paths(version)),
+        before_swap=lambda: model_registry.activate(version)
+    )
 
-    return jsonify({"message": "Prediction flagged successfully"})
+    # keep models/*.pkl in step for the offline scripts
+    install_artifacts(model_path, vectorizer_path, MODEL_PATH, VECTORIZER_PATH)
+    logger.info("Retrained model %s promoted (accuracy %.4f)", version, result["accuracy"])
 
 
+retrain_jobs = RetrainJobManager(on_success=promote_retrained_model)
 
 
 @app.route("/admin/retrain-model", methods=["POST"])
 @token_required
 @admin_required
 def retrain_model(user):
-    # 🔁 Simulated retraining pipeline
+    # 🔁 Runs day6_train_model.run_training() in a background process
     try:
-        # Example future steps:
-        # load dataset
-        # preprocess
-        # train model
-        # save model
+        job_id = retrain_jobs.submit(requested_by=user.get("email"))
 
         return jsonify({
             "success": True,
-            "status": "Retraining started",
-            "note": "Model retraining runs asynchronously"
-        })
+            "job_id": job_id,
+            "status": "queued",
+            "message": f"Retraining started (job {job_id})"
+        }), 202
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@app.route("/admin/retrain-model", methods=["GET"])
+@token_required
+@admin_required
+def list_retrain_jobs(user):
+    return jsonify(retrain_jobs.list_jobs())
+
+
+@app.route("/admin/retrain-model/<job_id>", methods=["GET"])
+@token_required
+@admin_required
+def retrain_status(user, job_id):
+    status = retrain_jobs.status(job_id)
+    if not status:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(status)
+
+
+@app.route("/admin/retrain-model/<job_id>/cancel", methods=["POST"])
+@token_required
+@admin_required
+def cancel_retrain(user, job_id):
+    status = retrain_jobs.cancel(job_id)
+    if not status:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(status)
     
 
 @app.route("/api/career-insights", methods=["POST"])
 @token_required
 def career_insights(decoded_user):
-    users = load_users()
-    user = next(
-        (u for u in users if u.get("email") == decoded_user["email"]),
-        None
-    )
+    with span("user_lookup"):
+        user = user_store.get_record(decoded_user["email"])
 
-    if not user or "education" not in user:
+    if not user or user.education is None:
         return jsonify({"error": "Education not found"}), 400
 
-    edu = user["education"]
+    edu = user.education
 
     insight = generate_insights({
-        "degree": edu.get("degree"),
-        "specialization": edu.get("specialization"),
-        "cgpa": edu.get("cgpa")
+        "degree": edu.degree,
+        "specialization": edu.specialization,
+        "cgpa": edu.cgpa
     })
 
     return jsonify({
@@ -956,6 +1132,4 @@ def career_insights(decoded_user):
 
 # ---------------- Run Server ----------------
 if __name__ == "__main__":
-    if not os.path.exists(USERS_FILE):
-        save_users([])
     app.run(debug=True)
@@ -0,0 +1,143 @@
+# append_log.py — segment-rotated JSON Lines log
+#
+# Records are appended as one JSON object per line to
+#   <dir>/segment-000001.jsonl, segment-000002.jsonl, ...
+# A new segment is started once the active one passes `segment_bytes`.
+# Every append returns a location (segment, offset, length) that can be read
+# back directly with a single seek, so callers keep their own indexes.
+#
+# Appends are serialized with a thread lock plus an OS file lock, so several
+# Flask workers can share the same directory without interleaving lines.
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from fsutil import fcntl
+
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+class SegmentedLog:
+    def __init__(self, directory, segment_bytes=DEFAULT_SEGMENT_BYTES):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._lock_path = os.path.join(directory, ".lock")
+
+    # ---------- locking ----------
+
+    @contextmanager
+    def lock(self):
+        """Exclusive lock across threads and processes (re-entrant)."""
+        with self._thread_lock:
+            # only the outermost holder takes the file lock: a second flock()
+            # on a new descriptor would block on our own lock
+            if fcntl is None or self._depth:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+            with open(self._lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # ---------- segments ----------
+
+    def segment_path(self, segment):
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{segment:06d}{SEGMENT_SUFFIX}")
+
+    def segments(self):
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                numbers.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+        return sorted(numbers)
+
+    def _active_segment(self):
+        segments = self.segments()
+        if not segments:
+            return 1
+        last = segments[-1]
+        if os.path.getsize(self.segment_path(last)) >= self.segment_bytes:
+            return last + 1
+        return last
+
+    # ---------- read / write ----------
+
+    def append(self, record):
+        """Append one record. Caller may already hold lock()."""
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        with self.lock():
+            segment = self._active_segment()
+            with open(self.segment_path(segment), "ab") as f:
+                offset = f.tell()
+                f.write(line)
+                f.flush()
+        return [segment, offset, len(line)]
+
+    def read(self, location):
+        segment, offset, length = location
+        with open(self.segment_path(segment), "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def scan(self):
+        """Yield (location, record) for every record in append order."""
+        for segment in self.segments():
+            offset = 0
+            with open(self.segment_path(segment), "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # torn write at the tail
+                    yield [segment, offset, len(line)], json.loads(line)
+                    offset += len(line)
+
+
+class LineTail:
+    """
+    Follows a JSON Lines file that other processes append to.
+    read_new() returns only the complete lines written since the last call.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.position = 0
+
+    def read_new(self):
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return []
+        if size <= self.position:
+            return []
+
+        with open(self.path, "rb") as f:
+            f.seek(self.position)
+            chunk = f.read(size - self.position)
+
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return []
+        self.position += end + 1
+        return [json.loads(line) for line in chunk[:end].split(b"\n") if line]
+
+    def append(self, entry):
+        self.extend([entry])
+
+    def extend(self, entries):
+        data = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries)
+        with open(self.path, "ab") as f:
+            f.write(data.encode("utf-8"))
@@ -0,0 +1,328 @@
+# artifacts.py — fast-start model artifacts
+#
+# The .pkl files written by the training scripts are loaded eagerly and fully
+# copied into every worker. export_artifacts() additionally writes
+# uncompressed joblib files (models/*.joblib) whose NumPy arrays
+# (LogisticRegression coefficients, TF-IDF idf, ...) can be opened with
+# mmap_mode="r": workers then read them straight from the OS page cache and
+# share those pages instead of each holding a private copy.
+#
+# RandomForest models are also exported as a CompiledForest
+# (models/job_model.forest.joblib, see compiled_forest.py): flat node arrays
+# that mmap cleanly and score small batches without per-tree Python overhead.
+# When present and up to date it serves batches of up to COMPILED_MAX_ROWS
+# rows; larger batches still go to the sklearn forest.
+#
+# ModelArtifacts loads lazily, on the first prediction, so importing app.py
+# (and forking gunicorn workers) no longer pays for unpickling the model.
+# With a resolver (model_registry.ModelRegistry.resolve) it also follows the
+# registry's current version and hot-swaps new ones in the background.
+# Without one it serves the plain files: install_artifacts() replaces them
+# under an exclusive lock on the directory's .install.lock, and a reload
+# reads them under a shared one, so a new model is never loaded with the
+# old vectorizer.
+#
+# Convert existing pickles:   python artifacts.py export
+
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import joblib
+
+from compiled_forest import CompiledForest, compiled_path, export_compiled_forest
+from fsutil import locked
+
+MODEL_PATH = os.environ.get("MODEL_PATH", "models/job_model.pkl")
+VECTORIZER_PATH = os.environ.get("VECTORIZER_PATH", "models/vectorizer.pkl")
+FAST_SUFFIX = ".joblib"
+WARMUP_TEXT = "B.Tech Computer Science 8.0 python sql machine learning"
+
+logger = logging.getLogger(__name__)
+
+_install_thread_lock = threading.Lock()
+
+
+def fast_path(path):
+    return os.path.splitext(path)[0] + FAST_SUFFIX
+
+
+def export_artifacts(model, vectorizer, model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH):
+    """Write mmap-able (uncompressed) copies next to the .pkl files."""
+    written = []
+    for obj, path in ((model, model_path), (vectorizer, vectorizer_path)):
+        target = fast_path(path)
+        tmp_path = target + ".tmp"
+        joblib.dump(obj, tmp_path, compress=0)
+        os.replace(tmp_path, target)
+        written.append(target)
+
+    forest_path = export_compiled_forest(model, model_path)
+    if forest_path:
+        written.append(forest_path)
+    return written
+
+
+def is_fresh(derived, source):
+    """derived exists and was written after (or with) the .pkl it came from."""
+    return os.path.exists(derived) and (
+        not os.path.exists(source) or os.path.getmtime(derived) >= os.path.getmtime(source)
+    )
+
+
+def resolve_path(path):
+    """Prefer the fast copy unless the .pkl was retrained after it."""
+    fast = fast_path(path)
+    if is_fresh(fast, path):
+        return fast, True
+    return path, False
+
+
+def load_artifact(path, mmap_mode="r"):
+    resolved, is_fast = resolve_path(path)
+    return joblib.load(resolved, mmap_mode=mmap_mode if is_fast else None)
+
+
+def load_model(path, mmap_mode="r"):
+    """
+    Compiled forest if one matches the current model (small batches; larger
+    ones go to the sklearn estimator it wraps), else the estimator.
+    """
+    estimator = load_artifact(path, mmap_mode)
+    forest_path = compiled_path(path)
+    if is_fresh(forest_path, path):
+        return CompiledForest.load(forest_path, mmap_mode=mmap_mode, fallback=estimator)
+    return estimator
+
+
+def local_version(*paths):
+    """
+    Version of plain (unregistered) .pkl files: their mtime/size, so a
+    retrain that writes new files is seen by the reloader and the cache.
+    """
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            signature.append("missing")
+    return "local:" + "|".join(signature)
+
+
+def install_locked(model_path=MODEL_PATH, shared=False):
+    """Lock for the plain model files: exclusive to install, shared to load."""
+    lock_path = os.path.join(os.path.dirname(model_path) or ".", ".install.lock")
+    return locked(lock_path, _install_thread_lock, shared=shared)
+
+
+def install_artifacts(source_model_path, source_vectorizer_path,
+                      model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH):
+    """
+    Move a trained candidate (pkl + fast copies) over the served files.
+    Each file is an atomic os.replace; the .pkl files go first so the fast
+    copies keep their "at least as new" mtime. A derived file the candidate
+    doesn't have is removed so a stale one can't shadow the new model. The
+    whole set is replaced under install_locked(), so a reload sees either
+    the old pair or the new one.
+    """
+    pairs = [
+        (source_model_path, model_path),
+        (source_vectorizer_path, vectorizer_path),
+        (fast_path(source_model_path), fast_path(model_path)),
+        (compiled_path(source_model_path), compiled_path(model_path)),
+        (fast_path(source_vectorizer_path), fast_path(vectorizer_path)),
+    ]
+    with install_locked(model_path):
+        for source, target in pairs:
+            if os.path.exists(source):
+                os.replace(source, target)
+            elif os.path.exists(target):
+                os.remove(target)
+
+
+class LoadedModel:
+    """One loaded version. `refs` counts requests currently scoring with it."""
+
+    def __init__(self, version, model, vectorizer):
+        self.version = version
+        self.model = model
+        self.vectorizer = vectorizer
+        self.loaded_at = time.time()
+        self.refs = 0
+        self.retired = False
+
+
+class ModelArtifacts:
+    """
+    The (model, vectorizer) pair being served, loaded lazily.
+
+    `resolver()` names the version to serve as (version, model_path,
+    vectorizer_path) — ModelRegistry.resolve — or None to use the plain
+    model_path / vectorizer_path files, versioned by local_version().
+    reload() loads and pre-warms a new version before swapping it in, so
+    requests never wait on a load. With reload_seconds > 0 a background
+    thread calls reload() periodically.
+
+    Requests hold a version through acquire(); a swapped-out version is
+    released (references dropped, mmaps closed) once its last request ends.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH, mmap_mode="r",
+                 resolver=None, reload_seconds=0, warmup_text=WARMUP_TEXT):
+        self.model_path = model_path
+        self.vectorizer_path = vectorizer_path
+        self.mmap_mode = mmap_mode
+        self.resolver = resolver
+        self.reload_seconds = reload_seconds
+        self.warmup_text = warmup_text
+
+        self._current = None
+        self._retired = []
+        self._lock = threading.Lock()        # _current, refs, _retired
+        self._load_lock = threading.Lock()   # one load at a time
+        self._reloader_pid = None
+
+    @property
+    def loaded(self):
+        return self._current is not None
+
+    @property
+    def version(self):
+        current = self._current
+        return current.version if current else None
+
+    def resolve(self):
+        found = self.resolver() if self.resolver else None
+        if found:
+            return found
+        version = local_version(self.model_path, self.vectorizer_path)
+        return version, self.model_path, self.vectorizer_path
+
+    # ---------- loading ----------
+
+    def _load(self, version, model_path, vectorizer_path):
+        loaded = LoadedModel(
+            version,
+            load_model(model_path, self.mmap_mode),
+            load_artifact(vectorizer_path, self.mmap_mode)
+        )
+        # pre-warm: touch the mmap'd pages and any lazy estimator state
+        if self.warmup_text:
+            loaded.model.predict_proba(loaded.vectorizer.transform([self.warmup_text]))
+        return loaded
+
+    def reload(self, target=None, before_swap=None):
+        """
+        Serve `target` — (version, model_path, vectorizer_path), default the
+        resolver's current version. `before_swap()` runs once the new version
+        is loaded and warm. Returns True if the served version changed.
+        """
+        with self._load_lock:
+            if target is None and self.resolver:
+                target = self.resolver()
+            if target is None:
+                # plain files: no install may run between version and load
+                with install_locked(self.model_path, shared=True):
+                    return self._reload(self.resolve(), before_swap)
+            return self._reload(target, before_swap)
+
+    def _reload(self, target, before_swap):
+        # caller holds self._load_lock
+        version, model_path, vectorizer_path = target
+        if self._current is not None and self._current.version == version:
+            return False
+        loaded = self._load(version, model_path, vectorizer_path)
+        if before_swap:
+            before_swap()
+        self._install(loaded)
+        print(f"✅ ML Model & Vectorizer Loaded (version {version})")
+        return True
+
+    def _install(self, loaded):
+        with self._lock:
+            old, self._current = self._current, loaded
+            if old is not None:
+                old.retired = True
+                if old.refs:
+                    self._retired.append(old)
+                else:
+                    self._release(old)
+
+    def _release(self, loaded):
+        # caller holds self._lock
+        if loaded in self._retired:
+            self._retired.remove(loaded)
+        loaded.model = loaded.vectorizer = None
+        logger.info("Released model version %s", loaded.version)
+
+    def swap(self, model, vectorizer, version="manual"):
+        self._install(LoadedModel(version, model, vectorizer))
+
+    # ---------- background reloader ----------
+
+    def _ensure_reloader(self):
+        # started lazily so a forking server starts one per worker
+        if not self.reload_seconds or self._reloader_pid == os.getpid():
+            return
+        self._reloader_pid = os.getpid()
+        threading.Thread(target=self._reload_loop, name="model-reloader", daemon=True).start()
+
+    def _reload_loop(self):
+        while True:
+            time.sleep(self.reload_seconds)
+            try:
+                self.reload()
+            except Exception:
+                # keep serving the old version; retried next interval
+                logger.exception("Model reload failed")
+
+    # ---------- serving ----------
+
+    @contextmanager
+    def acquire(self):
+        """Hold the current version for the duration of a request."""
+        self._ensure_reloader()
+        if self._current is None:
+            self.reload()
+        with self._lock:
+            loaded = self._current
+            loaded.refs += 1
+        try:
+            yield loaded
+        finally:
+            with self._lock:
+                loaded.refs -= 1
+                if loaded.retired and not loaded.refs:
+                    self._release(loaded)
+
+    def get(self):
+        """Current (model, vectorizer) without holding it (quick lookups)."""
+        with self.acquire() as loaded:
+            return loaded.model, loaded.vectorizer
+
+    def status(self):
+        with self._lock:
+            current = self._current
+            return {
+                "version": current.version if current else None,
+                "loaded_at": current.loaded_at if current else None,
+                "in_flight": current.refs if current else 0,
+                "retired": [{"version": r.version, "in_flight": r.refs} for r in self._retired]
+            }
+
+
+# ------------------ MAIN ------------------
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "export":
+        print("Usage: python artifacts.py export")
+        sys.exit(1)
+
+    model = joblib.load(MODEL_PATH)
+    vectorizer = joblib.load(VECTORIZER_PATH)
+    for path in export_artifacts(model, vectorizer):
+        print(f"💾 Fast artifact saved: {path}")
@@ -0,0 +1,118 @@
+# batcher.py — dynamic micro-batching for single predictions
+#
+# Concurrent /predict-job-role requests each used to pay the full
+# vectorizer + predict_proba overhead on their own. MicroBatcher queues
+# them for up to `max_wait_ms` (or until `max_batch_size` items are
+# waiting), scores the whole group with one batched call, and hands each
+# request its own row back.
+#
+#   batcher = MicroBatcher(score_fn, max_batch_size=32, max_wait_ms=2)
+#   result = batcher.submit(text)      # blocks until the batch has run
+#
+# score_fn(list_of_items) must return a list of results in the same order.
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from metrics import Histogram, Gauge, LATENCY_BUCKETS_MS, BATCH_SIZE_BUCKETS
+
+
+class MicroBatcher:
+    def __init__(self, score_fn, max_batch_size=32, max_wait_ms=2.0, name="predict"):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+
+        # tuning metrics
+        self.queue_depth = Gauge(f"{name}_batcher_queue_depth", "Requests waiting to be batched")
+        self.batch_size = Histogram(f"{name}_batcher_batch_size", BATCH_SIZE_BUCKETS, "Requests per batched call")
+        self.wait_ms = Histogram(f"{name}_batcher_wait_ms", LATENCY_BUCKETS_MS, "Time spent queued before scoring")
+        self.run_ms = Histogram(f"{name}_batcher_run_ms", LATENCY_BUCKETS_MS, "Batched score_fn duration")
+
+    @property
+    def enabled(self):
+        return self.max_batch_size > 1
+
+    # ---------- worker ----------
+
+    def _ensure_worker(self):
+        # started lazily (and again after fork) so pre-forking servers work
+        if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is not None and self._worker_pid == os.getpid() and self._worker.is_alive():
+                return
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+            self._worker_pid = os.getpid()
+            self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+            self._worker.start()
+
+    def _collect(self):
+        """Block for the first item, then gather more until size or time limit."""
+        first = self._queue.get()
+        batch = [first]
+        deadline = first[2] + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # window closed: still take whatever piled up meanwhile
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            self.queue_depth.set(self._queue.qsize())
+
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.wait_ms.observe((started - enqueued) * 1000)
+            self.batch_size.observe(len(batch))
+
+            try:
+                results = self.score_fn([item for item, _, _ in batch])
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                self.run_ms.observe((time.perf_counter() - started) * 1000)
+
+    # ---------- public ----------
+
+    def submit(self, item, timeout=None):
+        if not self.enabled:
+            return self.score_fn([item])[0]
+
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        self.queue_depth.set(self._queue.qsize())
+        return future.result(timeout=timeout)
+
+    def metrics(self):
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self.queue_depth.snapshot(),
+            "batch_size": self.batch_size.snapshot(),
+            "wait_ms": self.wait_ms.snapshot(),
+            "run_ms": self.run_ms.snapshot()
+        }
@@ -0,0 +1,109 @@
+# bench_compiled_forest.py — sklearn predict_proba vs CompiledForest
+#
+# Checks that both give the same probabilities, then times single-row and
+# batch scoring.
+#
+#   python bench_compiled_forest.py [--rows 2000] [--batch 256] [--repeat 200]
+#   python bench_compiled_forest.py --sweep     # batch sizes 1..256, picks
+#                                               # COMPILED_FOREST_MAX_ROWS
+
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from artifacts import MODEL_PATH, VECTORIZER_PATH
+from compiled_forest import CompiledForest, is_random_forest
+
+DATASET_PATH = "dataset/edu2job_cleaned.csv"
+
+
+def load_texts(n_rows):
+    if os.path.exists(DATASET_PATH):
+        return pd.read_csv(DATASET_PATH, usecols=["Resume"])["Resume"].astype(str).head(n_rows).tolist()
+    # fall back to profile-like texts
+    return [
+        f"B.Tech Computer Science CGPA {6 + i % 4}.{i % 10} python sql programming_{i % 10}"
+        for i in range(n_rows)
+    ]
+
+
+def time_calls(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.percentile(timings, 50), np.percentile(timings, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--sweep", action="store_true", help="time batch sizes 1..256")
+    args = parser.parse_args()
+
+    model = joblib.load(MODEL_PATH)
+    vectorizer = joblib.load(VECTORIZER_PATH)
+    if not is_random_forest(model):
+        print(f"❌ {MODEL_PATH} is not a RandomForest ({type(model).__name__})")
+        return
+
+    start = time.perf_counter()
+    compiled = CompiledForest.from_sklearn(model)
+    print(f"✅ Forest compiled in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"({len(compiled.roots)} trees, {len(compiled.feature)} nodes, max depth {compiled.max_depth})")
+
+    X = vectorizer.transform(load_texts(args.rows))
+
+    # -------- correctness --------
+    expected = model.predict_proba(X)
+    actual = compiled.predict_proba(X)
+    max_diff = float(np.abs(expected - actual).max())
+    same_top = bool((expected.argmax(axis=1) == actual.argmax(axis=1)).all())
+    print(f"\n📊 Max |Δprob| = {max_diff:.2e}, same top class for all rows: {same_top}")
+
+    # -------- latency --------
+    single = X[:1]
+    batch = X[:args.batch]
+    n_batch = batch.shape[0]
+
+    results = {
+        "sklearn single": time_calls(lambda: model.predict_proba(single), args.repeat),
+        "compiled single": time_calls(lambda: compiled.predict_proba(single), args.repeat),
+        f"sklearn batch({n_batch})": time_calls(lambda: model.predict_proba(batch), max(args.repeat // 10, 5)),
+        f"compiled batch({n_batch})": time_calls(lambda: compiled.predict_proba(batch), max(args.repeat // 10, 5)),
+    }
+
+    print(f"\n{'path':<24}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, (p50, p95) in results.items():
+        print(f"{name:<24}{p50:>10.3f}{p95:>10.3f}")
+
+    if args.sweep:
+        sweep(model, compiled, X, max(args.repeat // 10, 5))
+
+
+def sweep(model, compiled, X, repeat):
+    """p50 of both paths per batch size; the crossover is the row threshold."""
+    print(f"\n{'rows':>6}{'sklearn ms':>12}{'compiled ms':>13}")
+    largest_win = 0
+    for n_rows in (1, 2, 4, 8, 16, 32, 64, 128, 256):
+        if n_rows > X.shape[0]:
+            break
+        batch = X[:n_rows]
+        sklearn_p50, _ = time_calls(lambda: model.predict_proba(batch), repeat)
+        compiled_p50, _ = time_calls(lambda: compiled.predict_proba(batch), repeat)
+        print(f"{n_rows:>6}{sklearn_p50:>12.3f}{compiled_p50:>13.3f}")
+        if compiled_p50 < sklearn_p50:
+            largest_win = n_rows
+    print(f"\n👉 Compiled forest wins up to {largest_win} rows "
+          f"(COMPILED_FOREST_MAX_ROWS={largest_win})")
+
+
+if __name__ == "__main__":
+    main()
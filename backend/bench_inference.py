@@ -0,0 +1,275 @@
+# bench_inference.py — latency / throughput benchmark for the prediction path
+#
+# Scenarios:
+#   predict    POST /predict-job-role through the Flask test client
+#   insights   POST /api/career-insights (generate_insights) through the client
+#   raw        vectorizer.transform + model.predict_proba on one profile text
+#
+# Each scenario runs at several concurrency levels (threads) against user
+# stores of several sizes, filled with synthetic users shaped like users.json
+# (education + skills). Reports p50/p95/p99 latency and throughput, and saves
+# everything as JSON so runs can be compared across commits:
+#
+#   python bench_inference.py [--users 100,1000,10000] [--concurrency 1,4,16]
+#                             [--requests 400] [--scenarios predict,insights,raw]
+#   python bench_inference.py --compare benchmarks/inference-<old>.json
+#
+# The app runs against a throwaway user store and prediction history (temp
+# dir); the prediction cache is off unless --cache is given.
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from models import Education, Skills
+from preprocess import DEGREES, SPECIALIZATIONS, COLLEGE_TIERS, SKILL_FIELDS
+
+OUTPUT_DIR = "benchmarks"
+
+CERTIFICATIONS = [
+    "AWS Certified", "Microsoft Certified", "Google Data Analytics",
+    "Proficient in SQL, R, Data Visualization, Statistics, Excel",
+    "Data Visualization, Data Science, Machine Learning, Python",
+    "Full Stack Web Development", "Tally ERP", "AutoCAD", "HR Analytics",
+]
+PROJECTS = ["0-1", "2-3", "4+"]
+
+
+# ------------------ SYNTHETIC USERS ------------------
+
+def synthetic_education(rng):
+    return {
+        "degree": rng.choice(DEGREES[:-1]),
+        "specialization": rng.choice(SPECIALIZATIONS[:-1]),
+        "cgpa": round(rng.uniform(5.5, 9.8), 1),
+        "year": rng.randint(2018, 2026),
+        "collegeTier": rng.choice(COLLEGE_TIERS[:-1]),
+        "internship": rng.choice(["Yes", "No"]),
+        "projects": rng.choice(PROJECTS),
+        "backlogs": str(rng.choice([0, 0, 0, 1, 2])),
+        "certifications": rng.sample(CERTIFICATIONS, rng.randint(0, 3))
+    }
+
+
+def synthetic_skills(rng):
+    return {field: rng.randint(1, 10) for field in SKILL_FIELDS}
+
+
+def synthetic_user(i, rng):
+    return {
+        "username": f"Bench User {i}",
+        "email": f"bench{i}@example.com",
+        "password": None,
+        "role": "user",
+        "about": "",
+        "education": synthetic_education(rng),
+        "skills": synthetic_skills(rng)
+    }
+
+
+def fill_user_store(store, n_users, seed=42):
+    rng = random.Random(seed)
+    users = [synthetic_user(i, rng) for i in range(n_users)]
+    for user in users:
+        store.create_user(user)
+    return users
+
+
+# ------------------ MEASUREMENT ------------------
+
+def run_load(call, n_requests, concurrency):
+    """Run `call(i)` n_requests times from `concurrency` threads."""
+    latencies = [0.0] * n_requests
+    errors = [0]
+    counter = iter(range(n_requests))
+    counter_lock = threading.Lock()
+
+    def worker():
+        while True:
+            with counter_lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            start = time.perf_counter()
+            try:
+                ok = call(i)
+            except Exception:
+                ok = False
+            latencies[i] = (time.perf_counter() - start) * 1000
+            if not ok:
+                with counter_lock:
+                    errors[0] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "requests": n_requests,
+        "errors": errors[0],
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(np.mean(latencies)), 3),
+        "throughput_rps": round(n_requests / elapsed, 1)
+    }
+
+
+# ------------------ SCENARIOS ------------------
+
+def make_scenarios(app_module, users, names):
+    """{name: call(i)} — each call handles request i for user i % len(users)."""
+    headers = [
+        {"Authorization": "Bearer " + app_module.generate_token({"email": u["email"], "role": "user"})}
+        for u in users
+    ]
+    local = threading.local()
+
+    def client():
+        # one test client per thread
+        if not hasattr(local, "client"):
+            local.client = app_module.app.test_client()
+        return local.client
+
+    def predict(i):
+        response = client().post("/predict-job-role", json={}, headers=headers[i % len(users)])
+        return response.status_code == 200
+
+    def insights(i):
+        response = client().post("/api/career-insights", json={}, headers=headers[i % len(users)])
+        return response.status_code == 200
+
+    texts = [
+        app_module.build_feature_text(Education.from_dict(u["education"]), Skills.from_dict(u["skills"]))
+        for u in users
+    ]
+
+    def raw(i):
+        model, vectorizer = app_module.artifacts.get()
+        model.predict_proba(vectorizer.transform([texts[i % len(texts)]]))
+        return True
+
+    available = {"predict": predict, "insights": insights, "raw": raw}
+    return {name: available[name] for name in names}
+
+
+# ------------------ REPORT ------------------
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def result_key(row):
+    return (row["scenario"], row["users"], row["concurrency"])
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {result_key(row): row for row in json.load(f)["results"]}
+
+    print(f"\n📊 Compared with {baseline_path}")
+    print(f"{'scenario':<10}{'users':>8}{'conc':>6}{'p95 ms':>10}{'Δp95':>9}{'rps':>9}{'Δrps':>9}")
+    for row in results:
+        old = baseline.get(result_key(row))
+        if old is None:
+            continue
+        d_p95 = (row["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+        d_rps = (row["throughput_rps"] - old["throughput_rps"]) / old["throughput_rps"] * 100 if old["throughput_rps"] else 0.0
+        print(f"{row['scenario']:<10}{row['users']:>8}{row['concurrency']:>6}"
+              f"{row['p95_ms']:>10.2f}{d_p95:>+8.1f}%{row['throughput_rps']:>9.1f}{d_rps:>+8.1f}%")
+
+
+# ------------------ MAIN ------------------
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", default="100,1000,10000", help="user-store sizes")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--requests", type=int, default=400, help="requests per run")
+    parser.add_argument("--scenarios", default="predict,insights,raw")
+    parser.add_argument("--cache", action="store_true", help="keep the prediction cache on")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--compare", default=None, help="earlier results JSON")
+    args = parser.parse_args()
+
+    user_sizes = [int(n) for n in args.users.split(",")]
+    levels = [int(n) for n in args.concurrency.split(",")]
+    names = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+
+    # throwaway state, set before app.py is imported
+    workdir = tempfile.mkdtemp(prefix="bench-inference-")
+    os.environ["USER_DB_PATH"] = os.path.join(workdir, "seed.db")
+    os.environ["HISTORY_DIR"] = os.path.join(workdir, "history")
+    os.environ["MODEL_RELOAD_SECONDS"] = "0"
+    if not args.cache:
+        os.environ["PREDICTION_CACHE_SIZE"] = "0"
+
+    import app as app_module
+    from user_store import SqliteUserStore
+
+    app_module.artifacts.get()   # load + warm outside the timings
+    print(f"✅ Model version {app_module.artifacts.version} loaded")
+
+    results = []
+    for n_users in user_sizes:
+        store = SqliteUserStore(os.path.join(workdir, f"users-{n_users}.db"))
+        start = time.perf_counter()
+        users = fill_user_store(store, n_users)
+        app_module.user_store = store
+        print(f"\n👥 {n_users} synthetic users ({time.perf_counter() - start:.1f}s to insert)")
+
+        for name, call in make_scenarios(app_module, users, names).items():
+            call(0)   # warm-up (insights index, first-request setup)
+            for concurrency in levels:
+                row = {"scenario": name, "users": n_users, "concurrency": concurrency}
+                row.update(run_load(call, args.requests, concurrency))
+                results.append(row)
+                print(f"  {name:<9} c={concurrency:<3} p50 {row['p50_ms']:>8.2f} ms  "
+                      f"p95 {row['p95_ms']:>8.2f} ms  p99 {row['p99_ms']:>8.2f} ms  "
+                      f"{row['throughput_rps']:>8.1f} req/s  errors {row['errors']}")
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "model_version": app_module.artifacts.version,
+            "cache": args.cache,
+            "requests_per_run": args.requests
+        },
+        "results": results
+    }
+
+    output = args.output or os.path.join(OUTPUT_DIR, f"inference-{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
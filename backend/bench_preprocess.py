@@ -0,0 +1,89 @@
+# bench_preprocess.py — preprocess_users vs the per-row preprocess_user loop
+#
+# Checks that the batch matrix equals preprocess_user() row by row on
+# synthetic users with messy values, as a list of dicts and as a DataFrame,
+# plus columns that hold no strings at all (numeric backlogs / cgpa as they
+# come from SQLite or a DataFrame, None mixed with ints). Then times both.
+#
+#   python bench_preprocess.py [--users 20000] [--repeat 5]
+
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from preprocess import (
+    COLLEGE_TIERS, DEGREES, SKILL_FIELDS, SPECIALIZATIONS,
+    preprocess_user, preprocess_users
+)
+
+MESSY = [None, "", "  ", "n/a", "3.5", " 2 ", "+1", "-1", "abc", 0, 2, 3.9, -2.5, True, float("nan")]
+
+
+def synthetic_users(n, rng):
+    users = []
+    for _ in range(n):
+        user = {
+            "degree": rng.choice(DEGREES + [None, "", " B.Tech ", "PhD"]),
+            "specialization": rng.choice(SPECIALIZATIONS + [None, "", "Physics"]),
+            "college_tier": rng.choice(COLLEGE_TIERS + [None, "Tier 9"]),
+            "cgpa": rng.choice([None, "", "8.1", "abc", 7, 9.25, "10"]),
+            "internship": rng.choice([None, "Yes", " yes ", "No", True]),
+            "projects": rng.choice([None, "", "0-1", "2-3", "4+", 3]),
+            "backlogs": rng.choice(MESSY),
+        }
+        if rng.random() < 0.8:
+            user["skills"] = {s: rng.choice([None, "7", 8, "x", 10.0]) for s in SKILL_FIELDS}
+        users.append(user)
+    return users
+
+
+def same(users):
+    expected = np.array([preprocess_user(u) for u in users], dtype=np.float32)
+    expected = expected.reshape(len(users), -1) if len(users) else expected
+    return all(
+        np.array_equal(preprocess_users(batch), expected)
+        for batch in (users, pd.DataFrame(users))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    users = synthetic_users(args.users, rng)
+
+    # -------- correctness --------
+    cases = {
+        "messy": users,
+        "numeric backlogs": [dict(u, backlogs=i % 4) for i, u in enumerate(users[:200])],
+        "None/int backlogs": [dict(u, backlogs=None if i % 2 else i) for i, u in enumerate(users[:200])],
+        "numeric cgpa": [dict(u, cgpa=float(i % 10)) for i, u in enumerate(users[:200])],
+    }
+    for name, case in cases.items():
+        if not same(case):
+            print(f"❌ Results differ ({name})")
+            return
+
+    timings = {"preprocess_user loop": [], "preprocess_users": []}
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        [preprocess_user(u) for u in users]
+        timings["preprocess_user loop"].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        preprocess_users(users)
+        timings["preprocess_users"].append(time.perf_counter() - start)
+
+    print(f"{'path':<24}{'users':>8}{'p50 ms':>10}")
+    for name, values in timings.items():
+        print(f"{name:<24}{args.users:>8}{np.median(values) * 1000:>10.1f}")
+    print("\n✅ Same features from both paths")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# bench_ranking.py — ranking.rank vs the old argsort + dict-decode path
+#
+# Checks that both give the same recommendations on synthetic predict_proba
+# output (including rows with tied values and many exact zeros, as a forest
+# produces), then times single-row and batch ranking.
+#
+#   python bench_ranking.py [--classes 72,1000] [--batch 256] [--repeat 500]
+
+import argparse
+import time
+
+import numpy as np
+
+from ranking import JOB_ROLE_MAP, LabelDecoder, rank
+
+
+def argsort_rank(probabilities, classes, k=5):
+    """
+    What app.py / day7 used to do per row. The sort is pinned to "stable":
+    with the default quicksort the order of equal values was unspecified.
+    """
+    results = []
+    for row in np.atleast_2d(probabilities):
+        top_indices = np.argsort(row, kind="stable")[::-1][:k]
+        top_probs = row[top_indices]
+        normalized = (top_probs / top_probs.sum()) * 100
+        results.append([
+            {
+                "job_role": JOB_ROLE_MAP.get(classes[idx], f"Role_{classes[idx]}"),
+                "confidence": round(float(conf), 2)
+            }
+            for idx, conf in zip(top_indices, normalized)
+        ])
+    return results
+
+
+def with_ties(probabilities, rng):
+    """Copy with most entries zeroed and some rows sharing a repeated value."""
+    tied = probabilities.copy()
+    tied[rng.random(tied.shape) < 0.9] = 0.0
+    tied[::4] = np.ceil(tied[::4] * 10) / 10    # coarse values: many equal
+    tied[1::4, :8] = tied[1::4, :1]             # a run of equal values
+    tied[2::4, :] = 0.0
+    tied[2::4, -1] = 1.0                        # one winner, the rest all zero
+    tied[tied.sum(axis=1) == 0, 0] = 1.0        # argsort_rank can't normalize 0
+    return tied
+
+
+def time_calls(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.percentile(timings, 50), np.percentile(timings, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--classes", default="72,1000")
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'path':<28}{'classes':>8}{'p50 ms':>10}{'p95 ms':>10}")
+
+    for n_classes in [int(n) for n in args.classes.split(",")]:
+        classes = np.arange(n_classes)
+        probabilities = rng.dirichlet(np.ones(n_classes), size=args.batch)
+        decoder = LabelDecoder(classes)
+
+        # -------- correctness --------
+        tied = with_ties(probabilities, rng)
+        for name, batch in (("random", probabilities), ("tied", tied)):
+            expected = argsort_rank(batch, classes)
+            if rank(batch, decoder) != expected or [rank(row, decoder) for row in batch] != expected:
+                print(f"❌ Results differ for {n_classes} classes ({name} rows)")
+                return
+
+        single = probabilities[0]
+        results = {
+            "argsort single": time_calls(lambda: argsort_rank(single, classes), args.repeat),
+            "rank single": time_calls(lambda: rank(single, decoder), args.repeat),
+            f"argsort batch({args.batch})": time_calls(lambda: argsort_rank(probabilities, classes), max(args.repeat // 10, 5)),
+            f"rank batch({args.batch})": time_calls(lambda: rank(probabilities, decoder), max(args.repeat // 10, 5)),
+        }
+        for name, (p50, p95) in results.items():
+            print(f"{name:<28}{n_classes:>8}{p50:>10.3f}{p95:>10.3f}")
+
+    print("\n✅ Same recommendations from both paths")
+
+
+if __name__ == "__main__":
+    main()
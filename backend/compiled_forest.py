@@ -0,0 +1,166 @@
+# compiled_forest.py — flattened RandomForest for fast inference
+#
+# A fitted RandomForestClassifier is 100 separate Tree objects; each
+# predict_proba call walks them one by one (plus joblib dispatch overhead).
+# CompiledForest copies every tree into one set of contiguous arrays:
+#
+#   feature[n]     split feature of node n (0 for leaves)
+#   threshold[n]   split threshold (float64, compared against float32 X)
+#   left[n]        left child, global node index (leaves point to themselves)
+#   right[n]       right child, global node index (leaves point to themselves)
+#   leaf_proba[n]  normalized class distribution of node n
+#   roots[t]       root node of tree t
+#
+# and evaluates all (row, tree) pairs of a batch together with NumPy
+# gathers, one tree level per step. Leaf distributions are normalized and
+# averaged exactly like sklearn does, so probabilities match predict_proba
+# (up to float summation order across trees).
+#
+# The arrays are saved with joblib uncompressed, so the file can be
+# mmap-loaded and shared by all workers.
+#
+# The level-by-level gathers only win for small batches: with deep trees the
+# compiled evaluator is faster for a handful of rows but falls behind sklearn
+# from about 8 rows on (50 trees, depth ~110-230: 1 row 3.0 vs 4.6 ms, 256 rows
+# 44 vs 15 ms). Given the sklearn estimator as `fallback`, predict_proba hands
+# batches above COMPILED_MAX_ROWS to it (see bench_compiled_forest.py --sweep).
+
+import os
+
+import joblib
+import numpy as np
+
+COMPILED_SUFFIX = ".forest.joblib"
+ROWS_PER_CHUNK = 256
+COMPILED_MAX_ROWS = int(os.environ.get("COMPILED_FOREST_MAX_ROWS", 8))
+
+
+def compiled_path(model_path):
+    return os.path.splitext(model_path)[0] + COMPILED_SUFFIX
+
+
+def is_random_forest(model):
+    return hasattr(model, "estimators_") and all(
+        hasattr(tree, "tree_") for tree in getattr(model, "estimators_", [])
+    ) and hasattr(model, "predict_proba")
+
+
+class CompiledForest:
+    ARRAYS = ("feature", "threshold", "left", "right", "leaf_proba", "roots", "classes_")
+
+    def __init__(self, feature, threshold, left, right, leaf_proba, roots, classes_,
+                 max_depth, n_features_in_, fallback=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.classes_ = classes_
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(n_features_in_)
+        self.fallback = fallback   # sklearn forest for large batches
+
+    # ---------- export ----------
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        n_classes = len(forest.classes_)
+        features, thresholds, lefts, rights, probas, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            is_leaf = tree.children_left == -1
+            own = np.arange(n_nodes) + offset
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset).astype(np.int32))
+
+            # same normalization as DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :n_classes].astype(np.float64)
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            probas.append(proba / normalizer)
+
+            roots.append(offset)
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            leaf_proba=np.concatenate(probas),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes_=np.asarray(forest.classes_),
+            max_depth=max_depth,
+            n_features_in_=forest.n_features_in_
+        )
+
+    def save(self, path):
+        payload = {name: getattr(self, name) for name in self.ARRAYS}
+        payload["max_depth"] = self.max_depth
+        payload["n_features_in_"] = self.n_features_in_
+        tmp_path = path + ".tmp"
+        joblib.dump(payload, tmp_path, compress=0)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r", fallback=None):
+        return cls(**joblib.load(path, mmap_mode=mmap_mode), fallback=fallback)
+
+    # ---------- inference ----------
+
+    def _evaluate(self, X):
+        """X: dense float32 (rows, n_features) → (rows, n_classes) probabilities."""
+        n_rows, n_trees = X.shape[0], len(self.roots)
+
+        # one slot per (row, tree); only slots still on a split node are advanced
+        node = np.tile(self.roots, n_rows)
+        row = np.repeat(np.arange(n_rows), n_trees)
+        active = np.arange(node.size)
+
+        for _ in range(self.max_depth):
+            current = node[active]
+            internal = self.left[current] != current   # leaves point to themselves
+            active, current = active[internal], current[internal]
+            if active.size == 0:
+                break
+            go_left = X[row[active], self.feature[current]] <= self.threshold[current]
+            node[active] = np.where(go_left, self.left[current], self.right[current])
+
+        leaves = node.reshape(n_rows, n_trees)
+        proba = np.zeros((n_rows, self.leaf_proba.shape[1]), dtype=np.float64)
+        for t in range(n_trees):
+            proba += self.leaf_proba[leaves[:, t]]
+        proba /= n_trees
+        return proba
+
+    def predict_proba(self, X):
+        n_rows = X.shape[0]
+        if self.fallback is not None and n_rows > COMPILED_MAX_ROWS:
+            return self.fallback.predict_proba(X)
+        out = np.empty((n_rows, self.leaf_proba.shape[1]), dtype=np.float64)
+        for start in range(0, n_rows, ROWS_PER_CHUNK):
+            chunk = X[start:start + ROWS_PER_CHUNK]
+            dense = chunk.toarray() if hasattr(chunk, "toarray") else np.asarray(chunk)
+            out[start:start + ROWS_PER_CHUNK] = self._evaluate(dense.astype(np.float32, copy=False))
+        return out
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def export_compiled_forest(model, model_path):
+    """Write the flattened forest next to model_path. Returns the path or None."""
+    if not is_random_forest(model):
+        return None
+    path = compiled_path(model_path)
+    CompiledForest.from_sklearn(model).save(path)
+    return path
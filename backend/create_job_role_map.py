@@ -1,9 +1,6 @@
-import pandas as pd
+from dataset_store import load_label_map
 
-df = pd.read_csv("dataset/edu2job_cleaned.csv")
-
-JOB_ROLE_MAP = dict(
-    zip(df["job_role_encoded"], df["job_role"])
-)
+# reads only the two label columns (Parquet when available)
+JOB_ROLE_MAP = load_label_map()
 
 print(JOB_ROLE_MAP)
@@ -0,0 +1,310 @@
+# dataset_ingest.py — streaming, validated CSV uploads for /admin/upload-dataset
+#
+# The upload handler used to pd.read_csv() the whole file in the request
+# thread and then write it twice (datasets/dataset_<ts>.csv + current.csv).
+# Uploads now go through here:
+#
+#   1. the upload is streamed to datasets/.incoming/ once, hashing as it goes
+#   2. the staged file is validated chunk by chunk: required columns, no empty
+#      job_role, integer job_role_encoded, and a one-to-one job_role ↔
+#      job_role_encoded mapping across the whole file
+#   3. it is renamed (not copied) to datasets/<sha16>.csv; uploading the same
+#      content again reuses that version
+#   4. datasets/manifest.json {"current", "versions"} is replaced atomically,
+#      and datasets/current.csv is re-pointed with an atomic symlink swap
+#
+# Files above INGEST_ASYNC_BYTES are validated in a background thread; the
+# request returns a job id and the job state is written to
+# datasets/jobs/<job_id>.json:
+#
+#   queued → validating → published | duplicate | invalid | failed
+#
+#   python dataset_ingest.py ingest <file.csv>
+#   python dataset_ingest.py list
+#   python dataset_ingest.py activate <version>
+
+import argparse
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from fsutil import JOB_ID_RE, locked, now as _now, read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+DATASETS_DIR = os.environ.get("DATASETS_DIR", "datasets")
+ASYNC_BYTES = int(os.environ.get("INGEST_ASYNC_BYTES", 20 * 1024 * 1024))
+CHUNK_ROWS = 50_000
+BLOCK_BYTES = 1024 * 1024
+MAX_ERRORS = 20
+
+REQUIRED_COLUMNS = ("job_role", "Resume", "job_role_encoded")
+TERMINAL_STATES = {"published", "duplicate", "invalid", "failed"}
+
+
+class ValidationError(Exception):
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+# ------------------ VALIDATION ------------------
+
+def validate_csv(path, chunk_rows=CHUNK_ROWS):
+    """
+    Check a CSV without loading it whole. Returns {"rows", "roles"};
+    raises ValidationError with up to MAX_ERRORS messages.
+    """
+    errors = []
+    role_to_code = {}
+    code_to_role = {}
+    rows = 0
+
+    try:
+        chunks = pd.read_csv(path, chunksize=chunk_rows, dtype={"job_role": str})
+        for chunk in chunks:
+            if rows == 0:
+                missing = [c for c in REQUIRED_COLUMNS if c not in chunk.columns]
+                if missing:
+                    raise ValidationError([f"missing columns: {', '.join(missing)}"])
+
+            roles = chunk["job_role"]
+            codes = pd.to_numeric(chunk["job_role_encoded"], errors="coerce")
+
+            # data row numbers (the chunk index runs on across chunks); not file
+            # lines, which differ once a quoted Resume spans several lines
+            for i in chunk.index[roles.isna() | (roles.str.strip() == "")]:
+                errors.append(f"row {i + 1}: empty job_role")
+            bad = codes.isna() | (codes != codes.round())
+            for i in chunk.index[bad]:
+                errors.append(f"row {i + 1}: job_role_encoded is not an integer")
+
+            ok = ~(bad | roles.isna())
+            pairs = pd.DataFrame({"role": roles[ok], "code": codes[ok].astype("int64")}).drop_duplicates()
+            for role, code in zip(pairs["role"], pairs["code"]):
+                if role_to_code.setdefault(role, code) != code:
+                    errors.append(f"job_role {role!r} encoded as both {role_to_code[role]} and {code}")
+                if code_to_role.setdefault(code, role) != role:
+                    errors.append(f"job_role_encoded {code} used for both {code_to_role[code]!r} and {role!r}")
+
+            rows += len(chunk)
+            if len(errors) >= MAX_ERRORS:
+                break
+    except pd.errors.EmptyDataError:
+        raise ValidationError(["file is empty"])
+    except pd.errors.ParserError as e:
+        raise ValidationError([f"not a valid CSV: {e}"])
+
+    if errors:
+        raise ValidationError(errors[:MAX_ERRORS])
+    if rows == 0:
+        raise ValidationError(["no data rows"])
+    return {"rows": rows, "roles": len(role_to_code)}
+
+
+# ------------------ STORE ------------------
+
+class DatasetStore:
+    def __init__(self, directory=DATASETS_DIR, on_publish=None, async_bytes=ASYNC_BYTES):
+        self.directory = directory
+        self.incoming_dir = os.path.join(directory, ".incoming")
+        self.jobs_dir = os.path.join(directory, "jobs")
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.current_link = os.path.join(directory, "current.csv")
+        self.on_publish = on_publish   # on_publish(path) after `current` moves
+        self.async_bytes = async_bytes
+        self._thread_lock = threading.Lock()
+        self._pool = None
+
+    # ---------- manifest ----------
+
+    def _locked(self):
+        return locked(os.path.join(self.directory, ".lock"), self._thread_lock)
+
+    def manifest(self):
+        return read_json(self.manifest_path) or {"current": None, "versions": {}}
+
+    def _write_manifest(self, manifest):
+        write_json_atomic(self.manifest_path, manifest, indent=2)
+
+    def version_path(self, version):
+        return os.path.join(self.directory, f"{version}.csv")
+
+    def current_path(self):
+        version = self.manifest().get("current")
+        return self.version_path(version) if version else None
+
+    def versions(self):
+        manifest = self.manifest()
+        return [
+            dict(info, version=version, current=version == manifest.get("current"))
+            for version, info in manifest.get("versions", {}).items()
+        ]
+
+    def _point_current(self, version):
+        """Swap the current.csv symlink in one rename. Caller holds the lock."""
+        if not hasattr(os, "symlink"):
+            return
+        tmp_link = f"{self.current_link}.{uuid.uuid4().hex}.tmp"
+        try:
+            os.symlink(f"{version}.csv", tmp_link)
+            os.replace(tmp_link, self.current_link)
+        except OSError:
+            # no symlink support: manifest.json alone is authoritative
+            if os.path.lexists(tmp_link):
+                os.remove(tmp_link)
+
+    def activate(self, version):
+        with self._locked():
+            manifest = self.manifest()
+            if version not in manifest.get("versions", {}):
+                raise KeyError(version)
+            manifest["current"] = version
+            self._write_manifest(manifest)
+            self._point_current(version)
+        if self.on_publish:
+            self.on_publish(self.version_path(version))
+
+    # ---------- ingestion ----------
+
+    def stage(self, stream):
+        """Copy an upload stream to disk once. Returns (staged_path, sha256, size)."""
+        os.makedirs(self.incoming_dir, exist_ok=True)
+        staged = os.path.join(self.incoming_dir, f"{uuid.uuid4().hex}.csv")
+        digest = hashlib.sha256()
+        size = 0
+        with open(staged, "wb") as f:
+            for block in iter(lambda: stream.read(BLOCK_BYTES), b""):
+                digest.update(block)
+                f.write(block)
+                size += len(block)
+        return staged, digest.hexdigest(), size
+
+    def ingest(self, staged, sha256, filename=None, uploaded_by=None, progress=None):
+        """
+        Validate a staged file and make it current. Returns
+        {"version", "duplicate", "rows", "roles"}; raises ValidationError.
+        """
+        version = sha256[:16]
+        known = self.manifest().get("versions", {}).get(version)
+        if known is not None:
+            os.remove(staged)
+            self.activate(version)
+            return {"version": version, "duplicate": True, "rows": known["rows"], "roles": known["roles"]}
+
+        if progress:
+            progress("validating")
+        try:
+            summary = validate_csv(staged)
+        except ValidationError:
+            os.remove(staged)
+            raise
+
+        target = self.version_path(version)
+        with self._locked():
+            os.replace(staged, target)
+            manifest = self.manifest()
+            manifest.setdefault("versions", {})[version] = {
+                "filename": filename,
+                "uploaded_by": uploaded_by,
+                "uploaded_at": _now(),
+                "sha256": sha256,
+                **summary
+            }
+            manifest["current"] = version
+            self._write_manifest(manifest)
+            self._point_current(version)
+
+        if self.on_publish:
+            self.on_publish(target)
+        return {"version": version, "duplicate": False, **summary}
+
+    # ---------- jobs ----------
+
+    def _job_path(self, job_id):
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def _write_job(self, job_id, **fields):
+        status = self.job_status(job_id) or {}
+        status.update(fields, job_id=job_id, updated_at=_now())
+        write_json_atomic(self._job_path(job_id), status, indent=2)
+        return status
+
+    def job_status(self, job_id):
+        if not JOB_ID_RE.match(job_id or ""):
+            return None
+        return read_json(self._job_path(job_id))
+
+    def _run_job(self, job_id, staged, sha256, filename, uploaded_by):
+        try:
+            result = self.ingest(
+                staged, sha256, filename, uploaded_by,
+                progress=lambda state: self._write_job(job_id, state=state)
+            )
+        except ValidationError as e:
+            self._write_job(job_id, state="invalid", errors=e.errors)
+            return
+        except Exception as e:
+            logger.exception("Dataset ingest job %s failed", job_id)
+            self._write_job(job_id, state="failed", message=str(e))
+            return
+        self._write_job(job_id, state="duplicate" if result["duplicate"] else "published", result=result)
+
+    def submit(self, staged, sha256, size, filename=None, uploaded_by=None):
+        """Validate + publish in the background. Returns the job id."""
+        job_id = uuid.uuid4().hex[:12]
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        self._write_job(
+            job_id, state="queued", filename=filename, bytes=size,
+            uploaded_by=uploaded_by, created_at=_now()
+        )
+        with self._thread_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dataset-ingest")
+        self._pool.submit(self._run_job, job_id, staged, sha256, filename, uploaded_by)
+        return job_id
+
+
+# ------------------ MAIN ------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_ingest = sub.add_parser("ingest")
+    p_ingest.add_argument("path")
+    sub.add_parser("list")
+    p_activate = sub.add_parser("activate")
+    p_activate.add_argument("version")
+    args = parser.parse_args()
+
+    store = DatasetStore()
+
+    if args.command == "ingest":
+        with open(args.path, "rb") as f:
+            staged, sha256, size = store.stage(f)
+        try:
+            result = store.ingest(staged, sha256, filename=os.path.basename(args.path))
+        except ValidationError as e:
+            print("❌ Invalid dataset:")
+            for error in e.errors:
+                print("  -", error)
+            raise SystemExit(1)
+        label = "already present" if result["duplicate"] else "published"
+        print(f"✅ {result['version']} {label}: {result['rows']} rows, {result['roles']} roles")
+    elif args.command == "list":
+        for info in sorted(store.versions(), key=lambda v: v.get("uploaded_at", ""), reverse=True):
+            marker = "*" if info["current"] else " "
+            print(f"{marker} {info['version']}  {info.get('uploaded_at', '')}  "
+                  f"{info.get('rows')} rows  {info.get('filename') or ''}")
+    elif args.command == "activate":
+        try:
+            store.activate(args.version)
+        except KeyError:
+            print(f"❌ Unknown version {args.version}")
+            raise SystemExit(1)
+        print(f"✅ Current dataset is now {args.version}")
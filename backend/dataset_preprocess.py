@@ -2,6 +2,8 @@
 import pandas as pd
 from sklearn.preprocessing import LabelEncoder
 
+from dataset_store import write_columnar
+
 print("\n==============================")
 print("📌 RESUME DATASET PREPROCESSING")
 print("==============================\n")
@@ -35,4 +37,8 @@ df["job_role_encoded"] = label_encoder.fit_transform(df["job_role"])
 df.to_csv("dataset/edu2job_cleaned.csv", index=False)
 print("💾 Cleaned dataset saved: dataset/edu2job_cleaned.csv")
 
+# Columnar copy (job_role dictionary-encoded) for faster loads
+if write_columnar(df):
+    print("💾 Columnar dataset saved: dataset/edu2job_cleaned.parquet")
+
 print("\n🎯 Preprocessing completed successfully!")
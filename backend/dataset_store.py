@@ -0,0 +1,129 @@
+# dataset_store.py — columnar storage for the cleaned resume corpus
+#
+# Every script used to re-parse dataset/edu2job_cleaned.csv as text. The
+# cleaned corpus is now also written as Parquet (job_role dictionary-encoded)
+# and load_dataset() reads only the columns a caller asks for:
+#
+#   df = load_dataset(["job_role_encoded", "job_role"])   # label maps
+#   df = load_dataset(["Resume", "job_role_encoded"])     # training
+#
+# The CSV stays the import format: if Parquet is missing, older than the CSV,
+# or pyarrow isn't installed, load_dataset() falls back to reading the CSV
+# (still only the requested columns).
+#
+#   python dataset_store.py convert [csv_path] [parquet_path]
+
+import os
+import sys
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: CSV only
+    pa = pq = None
+
+CSV_PATH = "dataset/edu2job_cleaned.csv"
+PARQUET_PATH = "dataset/edu2job_cleaned.parquet"
+DICTIONARY_COLUMNS = ("job_role",)
+CHUNK_SIZE = 50_000
+
+
+# ------------------ WRITE ------------------
+
+def _schema_for(df):
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    for name in DICTIONARY_COLUMNS:
+        if name in schema.names:
+            index = schema.get_field_index(name)
+            schema = schema.set(index, pa.field(name, pa.dictionary(pa.int32(), pa.string())))
+    return schema
+
+
+def write_columnar(df, path=PARQUET_PATH):
+    """Write a DataFrame as Parquet. Returns False when pyarrow is missing."""
+    if pq is None:
+        return False
+    tmp_path = path + ".tmp"
+    table = pa.Table.from_pandas(df, schema=_schema_for(df), preserve_index=False)
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    return True
+
+
+def convert_csv(csv_path=CSV_PATH, parquet_path=PARQUET_PATH, chunksize=CHUNK_SIZE):
+    """Stream a CSV into Parquet chunk by chunk. Returns rows written or None."""
+    if pq is None:
+        return None
+
+    tmp_path = parquet_path + ".tmp"
+    writer = None
+    rows = 0
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            if writer is None:
+                schema = _schema_for(chunk)
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is None:
+        return 0
+    os.replace(tmp_path, parquet_path)
+    return rows
+
+
+# ------------------ READ ------------------
+
+def columnar_available(csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """Parquet exists, is readable, and is at least as new as the CSV."""
+    if pq is None or not os.path.exists(parquet_path):
+        return False
+    if os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(parquet_path):
+        return False
+    return True
+
+
+def load_dataset(columns=None, csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """
+    Load the cleaned corpus, reading only `columns` (None = all).
+    Requested columns that don't exist are skipped, like a missing CSV column.
+    """
+    if columnar_available(csv_path, parquet_path):
+        if columns is not None:
+            available = set(pq.read_schema(parquet_path).names)
+            columns = [c for c in columns if c in available]
+        return pd.read_parquet(parquet_path, columns=columns)
+
+    if columns is None:
+        return pd.read_csv(csv_path)
+    wanted = set(columns)
+    return pd.read_csv(csv_path, usecols=lambda c: c in wanted)
+
+
+def load_label_map(csv_path=CSV_PATH, parquet_path=PARQUET_PATH):
+    """{job_role_encoded: job_role} from just those two columns."""
+    df = load_dataset(["job_role_encoded", "job_role"], csv_path, parquet_path)
+    df = df.drop_duplicates("job_role_encoded")
+    return dict(zip(df["job_role_encoded"].tolist(), df["job_role"].astype(str).tolist()))
+
+
+# ------------------ MAIN ------------------
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "convert":
+        print("Usage: python dataset_store.py convert [csv_path] [parquet_path]")
+        sys.exit(1)
+
+    csv_path = sys.argv[2] if len(sys.argv) > 2 else CSV_PATH
+    parquet_path = sys.argv[3] if len(sys.argv) > 3 else PARQUET_PATH
+
+    rows = convert_csv(csv_path, parquet_path)
+    if rows is None:
+        print("❌ pyarrow is not installed; CSV will keep being used")
+    else:
+        print(f"💾 Columnar dataset saved: {parquet_path} ({rows} rows)")
@@ -1,12 +1,9 @@
-import pandas as pd
-import os
+from dataset_store import load_dataset
 
 print("\n📌 DAY-4: DATA CHECK\n")
 
-# Correct path (inside backend/dataset)
-DATA_PATH = os.path.join("dataset", "edu2job_cleaned.csv")
-
-df = pd.read_csv(DATA_PATH)
+# Cleaned dataset (inside backend/dataset; Parquet when available)
+df = load_dataset()
 
 print("✅ Dataset loaded successfully")
 print("Shape:", df.shape)
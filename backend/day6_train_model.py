@@ -1,114 +1,182 @@
 # day6_train_model.py
 # # DAY 6 - RANDOM FOREST MODEL TRAINING (BEGINNER FRIENDLY)
+#
+# Run directly:  python day6_train_model.py
+# Or import run_training() (used by the /admin/retrain-model job runner).
 
 import pandas as pd
 import os
+import shutil
+import tempfile
 import joblib
 
+from artifacts import export_artifacts, install_artifacts
+from dataset_store import load_dataset
+from model_registry import ModelRegistry
+
 # ML tools
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, f1_score
 
-print("\n📌 DAY-6: MODEL TRAINING STARTED\n")
 
-# -----------------------------
-# STEP 1: LOAD DATASET
-# -----------------------------
+class TrainingCancelled(Exception):
+    pass
+
 
-DATA_PATH = "dataset/edu2job_cleaned.csv"
+def run_training(output_dir="models", progress=print, cancelled=None):
+    """
+    Full training flow. `progress(message, percent)` is called after each
+    step; `cancelled()` is checked between steps and aborts the run with
+    TrainingCancelled. Returns the evaluation metrics and artifact paths.
+    """
 
-df = pd.read_csv(DATA_PATH)
+    def step_done(message, percent):
+        progress(message, percent)
+        if cancelled and cancelled():
+            raise TrainingCancelled(message)
 
-print("✅ Dataset Loaded Successfully")
-print("Shape:", df.shape)
-print(df.head(), "\n")
+    print("\n📌 DAY-6: MODEL TRAINING STARTED\n")
 
-# -----------------------------
-# STEP 2: FEATURES & TARGET
-# -----------------------------
+    # -----------------------------
+    # STEP 1: LOAD DATASET
+    # -----------------------------
 
-# X → Resume text (input feature)
-X = df["Resume"]
+    # only the columns training needs (Parquet when available)
+    df = load_dataset(["job_role", "Resume", "job_role_encoded"])
 
-# y → Encoded job role (target)
-y = df["job_role_encoded"]
+    print("✅ Dataset Loaded Successfully")
+    print("Shape:", df.shape)
+    print(df.head(), "\n")
+    step_done("Dataset loaded", 10)
 
-print("✅ Features (X) and Target (y) selected\n")
+    # -----------------------------
+    # STEP 2: FEATURES & TARGET
+    # -----------------------------
 
-# -----------------------------
-# STEP 3: TRAIN-TEST SPLIT
-# -----------------------------
+    # X → Resume text (input feature)
+    X = df["Resume"]
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X,
-    y,
-    test_size=0.2,
-    random_state=42
-)
+    # y → Encoded job role (target)
+    y = df["job_role_encoded"]
 
-print("✅ Train-Test Split Done")
-print("Training samples:", len(X_train))
-print("Testing samples:", len(X_test), "\n")
+    print("✅ Features (X) and Target (y) selected\n")
 
-# -----------------------------
-# STEP 4: TF-IDF VECTORIZATION
-# -----------------------------
+    # -----------------------------
+    # STEP 3: TRAIN-TEST SPLIT
+    # -----------------------------
 
-vectorizer = TfidfVectorizer(
-    max_features=5000,
-    stop_words="english"
-)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X,
+        y,
+        test_size=0.2,
+        random_state=42
+    )
 
-X_train_vec = vectorizer.fit_transform(X_train)
-X_test_vec = vectorizer.transform(X_test)
+    print("✅ Train-Test Split Done")
+    print("Training samples:", len(X_train))
+    print("Testing samples:", len(X_test), "\n")
+    step_done("Train-test split done", 15)
 
-print("✅ TF-IDF Vectorization Completed\n")
+    # -----------------------------
+    # STEP 4: TF-IDF VECTORIZATION
+    # -----------------------------
 
-# -----------------------------
-# STEP 5: TRAIN RANDOM FOREST
-# -----------------------------
+    vectorizer = TfidfVectorizer(
+        max_features=5000,
+        stop_words="english"
+    )
 
-model = RandomForestClassifier(
-    n_estimators=100,
-    random_state=42,
-    n_jobs=-1
-)
+    X_train_vec = vectorizer.fit_transform(X_train)
+    X_test_vec = vectorizer.transform(X_test)
 
-model.fit(X_train_vec, y_train)
+    print("✅ TF-IDF Vectorization Completed\n")
+    step_done("TF-IDF vectorization completed", 30)
 
-print("✅ Random Forest Model Trained\n")
+    # -----------------------------
+    # STEP 5: TRAIN RANDOM FOREST
+    # -----------------------------
 
-# -----------------------------
-# STEP 6: PREDICTIONS
-# -----------------------------
+    model = RandomForestClassifier(
+        n_estimators=100,
+        random_state=42,
+        n_jobs=-1
+    )
 
-y_pred = model.predict(X_test_vec)
+    model.fit(X_train_vec, y_train)
 
-print("✅ Predictions Generated\n")
+    print("✅ Random Forest Model Trained\n")
+    step_done("Random Forest trained", 80)
 
-# -----------------------------
-# STEP 7: EVALUATION
-# -----------------------------
+    # -----------------------------
+    # STEP 6: PREDICTIONS
+    # -----------------------------
 
-accuracy = accuracy_score(y_test, y_pred)
-f1 = f1_score(y_test, y_pred, average="weighted")
+    y_pred = model.predict(X_test_vec)
 
-print("📊 MODEL PERFORMANCE")
-print(f"Accuracy : {accuracy * 100:.2f}%")
-print(f"F1 Score : {f1:.4f}\n")
+    print("✅ Predictions Generated\n")
 
-# -----------------------------
-# STEP 8: SAVE MODEL & VECTORIZER
-# -----------------------------
+    # -----------------------------
+    # STEP 7: EVALUATION
+    # -----------------------------
 
-os.makedirs("models", exist_ok=True)
+    accuracy = accuracy_score(y_test, y_pred)
+    f1 = f1_score(y_test, y_pred, average="weighted")
 
-joblib.dump(model, "models/job_model.pkl")
-joblib.dump(vectorizer, "models/vectorizer.pkl")
+    print("📊 MODEL PERFORMANCE")
+    print(f"Accuracy : {accuracy * 100:.2f}%")
+    print(f"F1 Score : {f1:.4f}\n")
+    step_done("Evaluation done", 90)
+
+    # -----------------------------
+    # STEP 8: SAVE MODEL & VECTORIZER
+    # -----------------------------
+
+    os.makedirs(output_dir, exist_ok=True)
 
-print("💾 Model saved: models/job_model.pkl")
-print("💾 Vectorizer saved: models/vectorizer.pkl")
+    model_path = os.path.join(output_dir, "job_model.pkl")
+    vectorizer_path = os.path.join(output_dir, "vectorizer.pkl")
 
-print("\n🎉 DAY-6 COMPLETED SUCCESSFULLY")
+    # written to a staging dir, then moved over the live files one atomic
+    # os.replace at a time: a running app never reads a half-written pickle
+    staging_dir = tempfile.mkdtemp(prefix=".staging-", dir=output_dir)
+    try:
+        staged_model = os.path.join(staging_dir, "job_model.pkl")
+        staged_vectorizer = os.path.join(staging_dir, "vectorizer.pkl")
+        with open(staged_model, "wb") as f:
+            joblib.dump(model, f)
+        with open(staged_vectorizer, "wb") as f:
+            joblib.dump(vectorizer, f)
+
+        # fast-start (mmap-able) copies used by app.py
+        fast_paths = export_artifacts(model, vectorizer, staged_model, staged_vectorizer)
+
+        install_artifacts(staged_model, staged_vectorizer, model_path, vectorizer_path)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    print(f"💾 Model saved: {model_path}")
+    print(f"💾 Vectorizer saved: {vectorizer_path}")
+    for path in fast_paths:
+        print(f"💾 Fast artifact saved: {os.path.join(output_dir, os.path.basename(path))}")
+    progress("Artifacts saved", 100)
+
+    return {
+        "accuracy": float(accuracy),
+        "f1": float(f1),
+        "model_path": model_path,
+        "vectorizer_path": vectorizer_path
+    }
+
+
+if __name__ == "__main__":
+    result = run_training(progress=lambda message, percent: None)
+
+    version = ModelRegistry().publish(
+        result["model_path"], result["vectorizer_path"],
+        metrics={"accuracy": result["accuracy"], "f1": result["f1"]},
+        source="day6_train_model.py"
+    )
+    print(f"💾 Published model version {version}")
+    print("\n🎉 DAY-6 COMPLETED SUCCESSFULLY")
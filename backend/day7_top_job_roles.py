@@ -3,8 +3,9 @@ import joblib
 import json
 import os
 from datetime import datetime
-import numpy as np
-import pandas as pd
+
+from dataset_store import load_label_map
+from ranking import LabelDecoder, rank
 
 print("\n📌 DAY-7: TOP JOB ROLE RECOMMENDATION\n")
 
@@ -13,7 +14,6 @@ print("\n📌 DAY-7: TOP JOB ROLE RECOMMENDATION\n")
 # =========================
 MODEL_PATH = "models/job_model.pkl"
 VECTORIZER_PATH = "models/vectorizer.pkl"
-DATASET_PATH = "dataset/edu2job_cleaned.csv"
 HISTORY_FILE = "prediction_history.json"
 
 # =========================
@@ -23,20 +23,12 @@ model = joblib.load(MODEL_PATH)
 vectorizer = joblib.load(VECTORIZER_PATH)
 print("✅ Model & Vectorizer Loaded Successfully")
 
-# =========================
-# LOAD DATASET
-# =========================
-df = pd.read_csv(DATASET_PATH)
-
 # =========================
 # BUILD LABEL DECODER
 # =========================
-label_decoder = (
-    df[["job_role_encoded", "job_role"]]
-    .drop_duplicates()
-    .set_index("job_role_encoded")["job_role"]
-    .to_dict()
-)
+# role names from the dataset labels (reads only job_role_encoded + job_role,
+# Parquet when available) — these can differ from the API's JOB_ROLE_MAP
+label_decoder = LabelDecoder(model.classes_, load_label_map(), missing="Unknown Role ({})")
 
 print("✅ Job role label mapping created")
 
@@ -62,21 +54,17 @@ print("\n✅ Probability Prediction Generated")
 # TOP 5 ROLES (UI NORMALIZED)
 # =========================
 TOP_N = 5
-top_indices = np.argsort(probabilities)[::-1][:TOP_N]
-
-# 🔹 extract top probabilities
-top_probs = probabilities[top_indices]
 
-# 🔹 normalize to 100% (UI purpose only)
-normalized_probs = (top_probs / top_probs.sum()) * 100
+# 🔹 partial top-k, normalized to 100% (UI purpose only)
+recommendations = rank(probabilities, label_decoder, TOP_N)
 
 results = []
 
 print("\n🏆 TOP JOB ROLE RECOMMENDATIONS:\n")
 
-for idx, conf in zip(top_indices, normalized_probs):
-    role_name = label_decoder.get(idx, f"Unknown Role ({idx})")
-    confidence = round(conf, 2)
+for rec in recommendations:
+    role_name = rec["job_role"]
+    confidence = rec["confidence"]
 
     results.append({
         "role": role_name,
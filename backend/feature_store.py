@@ -0,0 +1,215 @@
+# feature_store.py — incremental, memory-mappable user feature vectors
+#
+# run_preprocessing used to recompute every user's vector and dump them all
+# as JSON. Vectors now live in a feature store that only recomputes users
+# whose raw fields changed:
+#
+#   features/
+#     matrix.npy    float32 (capacity × len(FEATURE_NAMES)), np.load(mmap_mode="r")
+#     index.json    {"columns": [...], "size": rows used, "rows": {email: [row, hash]},
+#                  "free": [rows of removed users, reused first]}
+#
+# `hash` covers the fields preprocess_user reads (raw_fields). update() skips
+# users whose hash is unchanged, writes the dirty rows in place (the file is
+# re-allocated at double capacity when full) and then replaces index.json
+# atomically. app.py calls update() after /education/add and /skills/add;
+# run_preprocessing calls sync() for the whole user base, then writes
+# users_preprocessed.json from the stored vectors as before.
+#
+#   python feature_store.py sync              # all users from the user store
+#   python feature_store.py export out.npz    # dense copy with emails + columns
+
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+
+from fsutil import locked, write_json_atomic
+from preprocess import FEATURE_NAMES, INPUT_FIELDS, has_academic_data, preprocess_users, save_features
+
+FEATURES_DIR = os.environ.get("FEATURES_DIR", "features")
+MATRIX_FILE = "matrix.npy"
+INDEX_FILE = "index.json"
+MIN_CAPACITY = 64
+
+# flat profile field -> key in the `education` object /education/add writes
+EDUCATION_KEYS = {"college_tier": "collegeTier"}
+
+
+def raw_fields(user):
+    """The fields preprocess_user reads; flat values win over `education`."""
+    education = user.get("education") or {}
+    raw = {
+        name: user.get(name) or education.get(EDUCATION_KEYS.get(name, name))
+        for name in INPUT_FIELDS
+    }
+    raw["skills"] = user.get("skills") or {}
+    return raw
+
+
+def fields_hash(raw):
+    encoded = json.dumps(raw, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+class FeatureStore:
+    def __init__(self, directory=FEATURES_DIR):
+        self.directory = directory
+        self.matrix_path = os.path.join(directory, MATRIX_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._thread_lock = threading.Lock()
+        self._mapped = (None, None)   # (matrix stat key, mmap)
+
+    # ---------- files ----------
+
+    def _locked(self):
+        return locked(os.path.join(self.directory, ".lock"), self._thread_lock)
+
+    def index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"columns": FEATURE_NAMES, "size": 0, "rows": {}, "free": []}
+        if index.get("columns") != FEATURE_NAMES:
+            # feature layout changed: every row is dirty
+            return {"columns": FEATURE_NAMES, "size": 0, "rows": {}, "free": []}
+        return index
+
+    def _write_index(self, index):
+        write_json_atomic(self.index_path, index, separators=(",", ":"))
+
+    def matrix(self):
+        """Read-only memory map of the whole matrix (rows per index()), or None."""
+        try:
+            stat = os.stat(self.matrix_path)
+        except OSError:
+            return None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._mapped[0] != key:
+            self._mapped = (key, np.load(self.matrix_path, mmap_mode="r"))
+        return self._mapped[1]
+
+    def _writable(self, rows_needed):
+        """r+ memmap with room for rows_needed rows. Caller holds the lock."""
+        width = len(FEATURE_NAMES)
+        current = None
+        if os.path.exists(self.matrix_path):
+            current = np.lib.format.open_memmap(self.matrix_path, mode="r+")
+            if current.shape[1] == width and current.shape[0] >= rows_needed:
+                return current
+
+        capacity = max(rows_needed, MIN_CAPACITY, 2 * (current.shape[0] if current is not None else 0))
+        tmp_path = self.matrix_path + ".tmp"
+        grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(capacity, width))
+        if current is not None and current.shape[1] == width:
+            grown[:current.shape[0]] = current
+        grown.flush()
+        del grown, current
+        os.replace(tmp_path, self.matrix_path)
+        return np.lib.format.open_memmap(self.matrix_path, mode="r+")
+
+    # ---------- updates ----------
+
+    def update(self, users, remove_missing=False):
+        """
+        Recompute the vectors of users whose raw fields changed. Users without
+        academic data are dropped. With remove_missing, users not in `users`
+        are dropped too. Returns the number of rows recomputed.
+        """
+        users = [u for u in users if u and u.get("email")]
+        raws = [raw_fields(u) for u in users]
+        keep = has_academic_data(raws) if raws else []
+
+        with self._locked():
+            index = self.index()
+            rows, free = index["rows"], index["free"]
+            seen = set()
+            dropped = 0
+            dirty = []   # (email, raw, hash)
+
+            for user, raw, kept in zip(users, raws, keep):
+                email = user["email"]
+                seen.add(email)
+                if not kept:
+                    if email in rows:
+                        free.append(rows.pop(email)[0])
+                        dropped += 1
+                    continue
+                digest = fields_hash(raw)
+                if rows.get(email, (None, None))[1] != digest:
+                    dirty.append((email, raw, digest))
+
+            if remove_missing:
+                for email in [e for e in rows if e not in seen]:
+                    free.append(rows.pop(email)[0])
+                    dropped += 1
+
+            if dirty:
+                targets = []
+                for email, _, _ in dirty:
+                    if email in rows:
+                        targets.append(rows[email][0])
+                    elif free:
+                        targets.append(free.pop())
+                    else:
+                        targets.append(index.get("size", 0))
+                        index["size"] = targets[-1] + 1
+
+                matrix = self._writable(max(targets) + 1)
+                matrix[targets] = preprocess_users([raw for _, raw, _ in dirty])
+                matrix.flush()
+                del matrix
+                for (email, _, digest), row in zip(dirty, targets):
+                    rows[email] = [row, digest]
+
+            if dirty or dropped:
+                self._write_index(index)
+        return len(dirty)
+
+    def sync(self, users):
+        """Full pass over the user base: recompute dirty rows, drop stale ones."""
+        return self.update(users, remove_missing=True)
+
+    # ---------- reads ----------
+
+    def get(self, email):
+        entry = self.index()["rows"].get(email)
+        matrix = self.matrix()
+        if entry is None or matrix is None:
+            return None
+        return np.array(matrix[entry[0]])
+
+    def dense(self):
+        """(emails, float32 matrix) in row order — a copy, for export."""
+        rows = sorted(self.index()["rows"].items(), key=lambda item: item[1][0])
+        matrix = self.matrix()
+        if not rows or matrix is None:
+            return [], np.zeros((0, len(FEATURE_NAMES)), dtype=np.float32)
+        return [email for email, _ in rows], np.array(matrix[[row for _, (row, _) in rows]])
+
+
+# ------------------ MAIN ------------------
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in ("sync", "export"):
+        print("Usage: python feature_store.py sync | export <out.npz|out.npy>")
+        sys.exit(1)
+
+    store = FeatureStore()
+
+    if sys.argv[1] == "sync":
+        from user_store import open_user_store
+        users = list(open_user_store().all_users())
+        changed = store.sync(users)
+        print(f"✅ Feature store synced: {changed} of {len(users)} users recomputed")
+    else:
+        if len(sys.argv) < 3:
+            print("Usage: python feature_store.py export <out.npz|out.npy>")
+            sys.exit(1)
+        emails, matrix = store.dense()
+        save_features(sys.argv[2], matrix, emails)
+        print(f"💾 {len(emails)} vectors written to {sys.argv[2]}")
@@ -0,0 +1,132 @@
+# feedback_store.py — append-only feedback log with per-role rating aggregates
+#
+# /feedback used to read feedback.json, append one item and rewrite the whole
+# file. Feedback now goes through the same segmented log as prediction
+# history (append_log.SegmentedLog):
+#
+#   segment-*.jsonl  full feedback records
+#   index.jsonl      {"loc": [segment, offset, length], "r": role, "s": rating}
+#
+# Appends are O(1). The index is replayed on startup and tailed on every
+# call, keeping per-role aggregates (count, mean rating, rating histogram)
+# and the record locations needed for paginated reads, across workers.
+
+import json
+import os
+import threading
+import uuid
+
+from append_log import SegmentedLog, LineTail
+
+INDEX_FILE = "index.jsonl"
+RATINGS = (1, 2, 3, 4, 5)
+
+
+def parse_rating(value):
+    """1-5 as int, or None."""
+    try:
+        rating = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return rating if rating in RATINGS else None
+
+
+class RoleAggregate:
+    def __init__(self):
+        self.count = 0
+        self.rated = 0
+        self.total = 0
+        self.histogram = dict.fromkeys(RATINGS, 0)
+
+    def add(self, rating):
+        self.count += 1
+        if rating is not None:
+            self.rated += 1
+            self.total += rating
+            self.histogram[rating] += 1
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_rating": round(self.total / self.rated, 2) if self.rated else None,
+            "histogram": {str(r): n for r, n in self.histogram.items()}
+        }
+
+
+class FeedbackStore:
+    def __init__(self, directory, legacy_file=None):
+        self.log = SegmentedLog(directory)
+        self._index = LineTail(os.path.join(directory, INDEX_FILE))
+
+        self._locations = []    # in submission order
+        self._by_role = {}      # role -> RoleAggregate
+        self._overall = RoleAggregate()
+        self._mutex = threading.Lock()
+
+        with self.log.lock():
+            self._catch_up()
+            if not self._locations and legacy_file and os.path.exists(legacy_file):
+                self._import_legacy(legacy_file)
+
+    # ---------- index ----------
+
+    def _catch_up(self):
+        with self._mutex:
+            for entry in self._index.read_new():
+                self._locations.append(entry["loc"])
+                role = entry.get("r") or "N/A"
+                self._by_role.setdefault(role, RoleAggregate()).add(entry.get("s"))
+                self._overall.add(entry.get("s"))
+
+    def _write(self, record):
+        """Append record + index line. Caller holds the log lock."""
+        location = self.log.append(record)
+        self._index.append({
+            "loc": location,
+            "r": record.get("role"),
+            "s": parse_rating(record.get("rating"))
+        })
+        self._catch_up()
+        return record
+
+    def _import_legacy(self, legacy_file):
+        """One-shot import of the old feedback.json array."""
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return
+        for entry in entries:
+            entry.setdefault("id", uuid.uuid4().hex)
+            self._write(entry)
+
+    # ---------- public ----------
+
+    def add(self, feedback):
+        with self.log.lock():
+            self._catch_up()
+            return self._write(dict(feedback, id=uuid.uuid4().hex))
+
+    def count(self):
+        self._catch_up()
+        with self._mutex:
+            return len(self._locations)
+
+    def page(self, offset=0, limit=50, newest_first=True):
+        self._catch_up()
+        with self._mutex:
+            if newest_first:
+                # walk back from the end: no reversed copy of the whole index
+                end = len(self._locations) - 1 - offset
+                selected = [self._locations[i] for i in range(end, max(end - limit, -1), -1)]
+            else:
+                selected = self._locations[offset:offset + limit]
+        return [self.log.read(location) for location in selected]
+
+    def summary(self):
+        self._catch_up()
+        with self._mutex:
+            return {
+                "overall": self._overall.to_dict(),
+                "by_role": {role: agg.to_dict() for role, agg in sorted(self._by_role.items())}
+            }
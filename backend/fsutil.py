@@ -0,0 +1,70 @@
+# fsutil.py — file locking and atomic JSON writes shared by the on-disk stores
+#
+# The model registry, dataset store, feature store, retrain jobs and the
+# append-only logs all keep small JSON files (manifests, indexes, job
+# status) next to their data and update them from several Flask workers:
+#
+#   with locked(os.path.join(directory, ".lock"), thread_lock):
+#       manifest = read_json(path) or {...}
+#       ...
+#       write_json_atomic(path, manifest, indent=2)
+#
+# locked() is a thread lock plus an exclusive flock (thread lock only where
+# fcntl is missing); write_json_atomic() writes a temp file and os.replace()s
+# it, so readers never see a partial file.
+
+import json
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: thread lock only
+    fcntl = None
+
+JOB_ID_RE = re.compile(r"^[0-9a-f]{12}$")
+
+
+def now():
+    return datetime.utcnow().isoformat()
+
+
+@contextmanager
+def locked(lock_path, thread_lock, shared=False):
+    """
+    Hold `thread_lock` and an flock on `lock_path` (created if missing):
+    exclusive, or shared with other `shared` holders in other processes.
+    """
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_json(path):
+    """Parsed JSON file, or None when missing / unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def write_json_atomic(path, data, tmp_suffix=".tmp", **dump_kwargs):
+    """
+    Replace `path` in one rename. Writers that don't share a lock pass a
+    per-process tmp_suffix so their temp files don't collide.
+    """
+    tmp_path = path + tmp_suffix
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, **dump_kwargs)
+    os.replace(tmp_path, path)
@@ -0,0 +1,303 @@
+# hyperparam_search.py — parallel model comparison with k-fold CV
+#
+# train_model.py (LogisticRegression) and day6_train_model.py (RandomForest)
+# each train one hard-coded config on one 80/20 split. This harness searches
+# vectorizer × model settings instead:
+#
+#   - grid search, or random search over the same grid (--mode random)
+#   - stratified k-fold CV, folds run in a process pool
+#   - one pool task per (vectorizer config, fold): the TF-IDF matrices are
+#     fitted once and shared by every model candidate using that config,
+#     and cached on disk (models/search_cache/) for the next run
+#
+# The leaderboard reports accuracy / weighted F1 next to training time,
+# single-profile inference latency and model size, and picks the fastest
+# candidate that meets the quality bar (--min-accuracy / --min-f1).
+#
+#   python hyperparam_search.py [--mode grid|random] [--n-iter 20] [--folds 5]
+#                               [--models logreg,random_forest] [--sample 20000]
+#                               [--min-accuracy 0.8] [--workers 4]
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import scipy.sparse as sp
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.naive_bayes import ComplementNB
+
+from dataset_store import CSV_PATH, PARQUET_PATH, load_dataset
+
+CACHE_DIR = "models/search_cache"
+OUTPUT_PATH = "models/search_results.json"
+SEED = 42
+LATENCY_SAMPLES = 50
+
+
+# ------------------ SEARCH SPACE ------------------
+
+VECTORIZER_GRID = {
+    "max_features": [5000, 20000],
+    "ngram_range": [(1, 1), (1, 2)],
+    "sublinear_tf": [False, True],
+}
+
+MODEL_GRID = {
+    "logreg": {"C": [0.5, 1.0, 4.0]},
+    "random_forest": {"n_estimators": [50, 100], "max_depth": [None, 40]},
+    "sgd": {"alpha": [1e-5, 1e-4]},
+    "complement_nb": {"alpha": [0.1, 0.5, 1.0]},
+}
+
+
+def expand(grid):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def make_vectorizer(params):
+    return TfidfVectorizer(stop_words="english", **params)
+
+
+def make_model(name, params):
+    # n_jobs=1: parallelism comes from the process pool
+    if name == "logreg":
+        return LogisticRegression(max_iter=1000, **params)
+    if name == "random_forest":
+        return RandomForestClassifier(random_state=SEED, n_jobs=1, **params)
+    if name == "sgd":
+        return SGDClassifier(loss="log_loss", random_state=SEED, **params)
+    if name == "complement_nb":
+        return ComplementNB(**params)
+    raise ValueError(f"Unknown model: {name}")
+
+
+def build_candidates(models, mode="grid", n_iter=20, seed=SEED):
+    """[(vectorizer_params, model_name, model_params)]"""
+    candidates = [
+        (vec_params, name, model_params)
+        for vec_params in expand(VECTORIZER_GRID)
+        for name in models
+        for model_params in expand(MODEL_GRID[name])
+    ]
+    if mode == "random" and n_iter < len(candidates):
+        candidates = random.Random(seed).sample(candidates, n_iter)
+    return candidates
+
+
+def describe(params):
+    return ", ".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+
+# ------------------ WORKER ------------------
+
+_data = {}
+
+
+def load_texts(sample=None, seed=SEED):
+    df = load_dataset(["Resume", "job_role_encoded"]).dropna()
+    if sample and sample < len(df):
+        df = df.sample(n=sample, random_state=seed)
+    return df["Resume"].astype(str).to_numpy(dtype=object), df["job_role_encoded"].to_numpy()
+
+
+def _init_worker(sample, folds, seed):
+    texts, labels = load_texts(sample, seed)
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed)
+    _data.update(texts=texts, labels=labels, folds=list(splitter.split(texts, labels)))
+
+
+def _cache_key(vec_params, fold, sample, folds, seed):
+    source = PARQUET_PATH if os.path.exists(PARQUET_PATH) else CSV_PATH
+    raw = json.dumps([vec_params, fold, sample, folds, seed, os.path.getmtime(source)], default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def fold_matrices(vec_params, fold, cache_key):
+    """TF-IDF train/test matrices for one fold, from the disk cache if fitted before."""
+    base = os.path.join(CACHE_DIR, cache_key)
+    if os.path.exists(base + ".vectorizer.joblib"):
+        return (
+            sp.load_npz(base + ".train.npz"),
+            sp.load_npz(base + ".test.npz"),
+            joblib.load(base + ".vectorizer.joblib")
+        )
+
+    train_idx, test_idx = _data["folds"][fold]
+    vectorizer = make_vectorizer(vec_params)
+    X_train = vectorizer.fit_transform(_data["texts"][train_idx])
+    X_test = vectorizer.transform(_data["texts"][test_idx])
+    vectorizer.stop_words_ = None   # only kept for introspection; large
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    sp.save_npz(base + ".train.npz", X_train)
+    sp.save_npz(base + ".test.npz", X_test)
+    joblib.dump(vectorizer, base + ".vectorizer.joblib")   # written last = cache complete
+    return X_train, X_test, vectorizer
+
+
+def single_latency_ms(model, vectorizer, texts):
+    """Median time to vectorize + score one profile, like /predict-job-role."""
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        model.predict_proba(vectorizer.transform([text]))
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _run_fold(vec_params, model_specs, fold, cache_key):
+    """Fit every model candidate of one vectorizer config on one fold."""
+    X_train, X_test, vectorizer = fold_matrices(vec_params, fold, cache_key)
+    train_idx, test_idx = _data["folds"][fold]
+    y_train, y_test = _data["labels"][train_idx], _data["labels"][test_idx]
+
+    results = []
+    for name, model_params in model_specs:
+        model = make_model(name, model_params)
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        train_seconds = time.perf_counter() - start
+
+        y_pred = model.predict(X_test)
+        result = {
+            "model": name,
+            "model_params": model_params,
+            "fold": fold,
+            "accuracy": float(accuracy_score(y_test, y_pred)),
+            "f1": float(f1_score(y_test, y_pred, average="weighted")),
+            "train_seconds": train_seconds,
+        }
+        # latency and size don't vary by fold; measure them once
+        if fold == 0:
+            sample_texts = _data["texts"][test_idx][:LATENCY_SAMPLES]
+            result["latency_ms"] = single_latency_ms(model, vectorizer, sample_texts)
+            result["size_kb"] = (len(pickle.dumps(model)) + len(pickle.dumps(vectorizer))) / 1024
+        results.append(result)
+    return results
+
+
+# ------------------ SEARCH ------------------
+
+def summarize(vec_params, fold_results):
+    first = next(r for r in fold_results if r["fold"] == 0)
+    accuracies = [r["accuracy"] for r in fold_results]
+    return {
+        "model": first["model"],
+        "model_params": first["model_params"],
+        "vectorizer_params": vec_params,
+        "accuracy": statistics.mean(accuracies),
+        "accuracy_std": statistics.pstdev(accuracies),
+        "f1": statistics.mean(r["f1"] for r in fold_results),
+        "train_seconds": statistics.mean(r["train_seconds"] for r in fold_results),
+        "latency_ms": first["latency_ms"],
+        "size_kb": first["size_kb"],
+    }
+
+
+def pick_model(leaderboard, min_accuracy=None, min_f1=None):
+    """Fastest (inference latency) candidate meeting the quality bar."""
+    eligible = [
+        row for row in leaderboard
+        if (min_accuracy is None or row["accuracy"] >= min_accuracy)
+        and (min_f1 is None or row["f1"] >= min_f1)
+    ]
+    return min(eligible, key=lambda row: (row["latency_ms"], row["train_seconds"])) if eligible else None
+
+
+def run_search(models, mode="grid", n_iter=20, folds=5, sample=None, workers=None, seed=SEED):
+    candidates = build_candidates(models, mode, n_iter, seed)
+
+    # group by vectorizer config: one TF-IDF fit per (config, fold)
+    groups = {}
+    for vec_params, name, model_params in candidates:
+        groups.setdefault(json.dumps(vec_params, default=str), (vec_params, []))[1].append((name, model_params))
+
+    print(f"🔍 {len(candidates)} candidates × {folds} folds "
+          f"({len(groups)} vectorizer configs, {len(groups) * folds} pool tasks)")
+
+    by_candidate = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(sample, folds, seed)) as pool:
+        futures = {}
+        for key, (vec_params, model_specs) in groups.items():
+            for fold in range(folds):
+                cache_key = _cache_key(vec_params, fold, sample, folds, seed)
+                future = pool.submit(_run_fold, vec_params, model_specs, fold, cache_key)
+                futures[future] = key
+
+        for done, future in enumerate(as_completed(futures), 1):
+            key = futures[future]
+            for result in future.result():
+                candidate = (key, result["model"], json.dumps(result["model_params"], default=str))
+                by_candidate.setdefault(candidate, []).append(result)
+            print(f"✅ {done}/{len(futures)} fold tasks done")
+
+    leaderboard = [
+        summarize(groups[key][0], fold_results)
+        for (key, _, _), fold_results in by_candidate.items()
+    ]
+    leaderboard.sort(key=lambda row: (-row["accuracy"], row["latency_ms"]))
+    print(f"⏱️ Search time: {time.perf_counter() - start:.1f}s\n")
+    return leaderboard
+
+
+def print_leaderboard(leaderboard, limit=20):
+    print("📊 LEADERBOARD")
+    print(f"{'#':>3}  {'accuracy':>9}  {'f1':>6}  {'train s':>8}  {'lat ms':>7}  {'size KB':>9}  model")
+    for rank, row in enumerate(leaderboard[:limit], 1):
+        print(
+            f"{rank:>3}  {row['accuracy']:>9.4f}  {row['f1']:>6.4f}  {row['train_seconds']:>8.2f}  "
+            f"{row['latency_ms']:>7.2f}  {row['size_kb']:>9.0f}  "
+            f"{row['model']}({describe(row['model_params'])}) | tfidf({describe(row['vectorizer_params'])})"
+        )
+
+
+# ------------------ MAIN ------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["grid", "random"], default="grid")
+    parser.add_argument("--n-iter", type=int, default=20)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--models", default="logreg,random_forest",
+                        help=f"comma separated, from: {', '.join(MODEL_GRID)}")
+    parser.add_argument("--sample", type=int, default=None, help="rows to sample from the corpus")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--min-accuracy", type=float, default=None)
+    parser.add_argument("--min-f1", type=float, default=None)
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    print("\n📌 HYPERPARAMETER SEARCH STARTED\n")
+    leaderboard = run_search(
+        [m.strip() for m in args.models.split(",") if m.strip()],
+        args.mode, args.n_iter, args.folds, args.sample, args.workers
+    )
+    print_leaderboard(leaderboard)
+
+    pick = pick_model(leaderboard, args.min_accuracy, args.min_f1)
+    if pick:
+        print(f"\n🏆 Fastest model meeting the bar: {pick['model']}({describe(pick['model_params'])}) "
+              f"| tfidf({describe(pick['vectorizer_params'])}) — "
+              f"accuracy {pick['accuracy']:.4f}, {pick['latency_ms']:.2f} ms/profile")
+    else:
+        print("\n❌ No candidate meets the quality bar")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"leaderboard": leaderboard, "pick": pick}, f, indent=2, default=str)
+    print(f"💾 Results saved: {args.output}")
@@ -0,0 +1,49 @@
+# inference.py — shared job-role inference helpers
+#
+# Both /predict-job-role and /predict-job-role/batch go through here:
+#   build_feature_text() → the same text the single-user route always built
+#   predict_batch()      → one vectorizer.transform + one predict_proba for
+#                          the whole list, then ranking.rank() on all rows
+
+import time
+
+from ranking import TOP_K, decoder_for, rank
+
+
+def build_feature_text(education, skills=None):
+    """
+    Degree, specialization, CGPA, certifications and skills as one string.
+    `education` is a models.Education, `skills` a models.Skills (or None).
+    """
+    skills_text = " ".join([
+        f"{k}_{v}" for k, v in (skills.items() if skills is not None else ())
+    ])
+
+    return (
+        f"{education.degree} {education.specialization} "
+        f"CGPA {education.cgpa} "
+        + " ".join(education.certification_list())
+        + " "
+        + skills_text
+    )
+
+
+def predict_batch(model, vectorizer, texts, k=TOP_K, timings=None, min_confidence=None):
+    """
+    Score many feature texts with a single sparse transform + predict_proba.
+    If given, `timings` is filled with the vectorize / predict / top_k ms.
+    """
+    if not texts:
+        return []
+    start = time.perf_counter()
+    matrix = vectorizer.transform(texts)
+    vectorized = time.perf_counter()
+    probabilities = model.predict_proba(matrix)
+    predicted = time.perf_counter()
+    results = rank(probabilities, decoder_for(model), k, min_confidence)
+
+    if timings is not None:
+        timings["vectorize"] = (vectorized - start) * 1000
+        timings["predict"] = (predicted - vectorized) * 1000
+        timings["top_k"] = (time.perf_counter() - predicted) * 1000
+    return results
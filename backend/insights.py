@@ -1,27 +1,256 @@
 # insights.py
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+
 import pandas as pd
 
+from dataset_store import load_dataset
+from preprocess import DEGREES
+from tracing import span
+
 DATASET_PATH = "dataset/edu2job_cleaned.csv"
+DATASET_COLUMNS = ["Resume", "job_role"]
+RECHECK_SECONDS = float(os.environ.get("INSIGHTS_RECHECK_SECONDS", 5))
+HISTOGRAM_CACHE_SIZE = 1024
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def phrase_pattern(tokens):
+    """Tokens next to each other, separated by any non-alphanumeric run ("b.tech", "b tech")."""
+    return re.compile(
+        r"(?<![a-z0-9])" + r"[^a-z0-9]+".join(map(re.escape, tokens)) + r"(?![a-z0-9])"
+    )
+
+
+class InsightsEngine:
+    """
+    Inverted index over the lowercased resumes.
+
+    token → set of doc ids, built once at load time. A degree lookup
+    intersects the posting lists of its tokens (multi-token degrees are
+    then confirmed as a phrase on the few candidate docs only), and the
+    resulting role histogram is memoized per degree (LRU, at most
+    HISTOGRAM_CACHE_SIZE entries). Histograms for the known degrees are
+    precomputed up front.
+
+    sync() updates the index incrementally: rows are keyed by a hash of
+    (resume, role), so only added/removed rows touch the postings.
+
+    `source()` names the dataset file to index (the uploaded version that
+    is current), or None for `path`. Every worker re-checks it at most
+    every recheck_seconds and re-indexes in a background thread when it
+    moved, serving the old index meanwhile.
+    """
+
+    def __init__(self, path=None, source=None, recheck_seconds=RECHECK_SECONDS):
+        self.default_path = path
+        self.path = path       # file the index was built from
+        self.source = source
+        self.recheck_seconds = recheck_seconds
+        self._loaded = path is None
+        self._checked = 0.0
+        self._refreshing = False
+        self.texts = {}        # doc id -> lowercased resume
+        self.roles = {}        # doc id -> job role
+        self.postings = {}     # token -> set of doc ids
+        self.doc_keys = {}     # row hash -> [doc ids]
+        self.histograms = OrderedDict()   # degree phrase -> (Counter of roles, matched docs), LRU
+        self.columns = set()
+        self.rows = 0
+        self._next_id = 0
+        self._lock = threading.RLock()
+
+    @property
+    def empty(self):
+        return self.rows == 0
+
+    # ---------- index maintenance ----------
+
+    @staticmethod
+    def _row_key(resume, role):
+        return hashlib.sha1(f"{resume}\0{role}".encode("utf-8")).hexdigest()
+
+    def _add(self, key, resume, role):
+        doc_id = self._next_id
+        self._next_id += 1
+        text = str(resume).lower()
+        self.texts[doc_id] = text
+        self.roles[doc_id] = role
+        self.doc_keys.setdefault(key, []).append(doc_id)
+        for token in set(TOKEN_RE.findall(text)):
+            self.postings.setdefault(token, set()).add(doc_id)
+
+    def _remove(self, key):
+        doc_id = self.doc_keys[key].pop()
+        if not self.doc_keys[key]:
+            del self.doc_keys[key]
+        for token in set(TOKEN_RE.findall(self.texts[doc_id])):
+            docs = self.postings.get(token)
+            if docs is not None:
+                docs.discard(doc_id)
+                if not docs:
+                    del self.postings[token]
+        del self.texts[doc_id]
+        del self.roles[doc_id]
+
+    def sync(self, df):
+        """Make the index match `df`, touching only rows that changed."""
+        with self._lock:
+            self._loaded = True
+            self.columns = set(df.columns)
+            self.rows = len(df)
+            if "Resume" not in df.columns or "job_role" not in df.columns:
+                return
 
-try:
-    df = pd.read_csv(DATASET_PATH)
-except Exception as e:
-    print("Dataset load error:", e)
-    df = pd.DataFrame()
+            wanted = {}
+            rows = {}
+            for resume, role in zip(df["Resume"].astype(str), df["job_role"]):
+                key = self._row_key(resume, role)
+                wanted[key] = wanted.get(key, 0) + 1
+                rows.setdefault(key, (resume, role))
+
+            for key in list(self.doc_keys):
+                surplus = len(self.doc_keys[key]) - wanted.get(key, 0)
+                for _ in range(max(surplus, 0)):
+                    self._remove(key)
+
+            for key, count in wanted.items():
+                missing = count - len(self.doc_keys.get(key, ()))
+                for _ in range(max(missing, 0)):
+                    self._add(key, *rows[key])
+
+            self.histograms.clear()
+            for degree in DEGREES:
+                if degree != "Unknown":
+                    self.role_histogram(degree)
+
+    def current_path(self):
+        found = self.source() if self.source else None
+        return found or self.default_path
+
+    def _read(self, path):
+        if path == DATASET_PATH:
+            return load_dataset(DATASET_COLUMNS, csv_path=path)  # Parquet when fresh
+        wanted = set(DATASET_COLUMNS)
+        return pd.read_csv(path, usecols=lambda c: c in wanted)
+
+    def load(self, path):
+        try:
+            df = self._read(path)
+        except Exception as e:
+            print("Dataset load error:", e)
+            df = pd.DataFrame()
+        self.sync(df)
+        self.path = path
+
+    def refresh(self, path):
+        """Re-index from `path` in a background thread (one at a time)."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, args=(path,), name="insights-reindex", daemon=True).start()
+
+    def _refresh(self, path):
+        try:
+            df = self._read(path)   # parsed outside the lock: lookups keep running
+            self.sync(df)
+            self.path = path
+        except Exception as e:
+            # keep the old index; retried on the next check
+            print("Dataset reindex error:", e)
+        finally:
+            self._refreshing = False
+
+    def ensure_loaded(self):
+        """Read the dataset on first use instead of at import time."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self.load(self.current_path())
+            return
+
+        now = time.monotonic()
+        if self.source is None or now - self._checked < self.recheck_seconds:
+            return
+        self._checked = now
+        path = self.current_path()
+        if path != self.path:
+            self.refresh(path)
+
+    # ---------- lookups ----------
+
+    def _match(self, phrase):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return set(self.texts)
+
+        posting_lists = sorted(
+            (self.postings.get(token, set()) for token in set(tokens)), key=len
+        )
+        candidates = set(posting_lists[0])
+        for docs in posting_lists[1:]:
+            candidates &= docs
+            if not candidates:
+                return candidates
+
+        if len(tokens) == 1:
+            return candidates
+        pattern = phrase_pattern(tokens)
+        return {doc_id for doc_id in candidates if pattern.search(self.texts[doc_id])}
+
+    def role_histogram(self, degree):
+        key = " ".join(tokenize(degree))
+        with self._lock:
+            cached = self.histograms.get(key)
+            if cached is None:
+                matched = self._match(degree)
+                cached = (Counter(self.roles[doc_id] for doc_id in matched), len(matched))
+                self.histograms[key] = cached
+                while len(self.histograms) > HISTOGRAM_CACHE_SIZE:
+                    self.histograms.popitem(last=False)
+            else:
+                self.histograms.move_to_end(key)
+            return cached
+
+
+engine = InsightsEngine(DATASET_PATH)
+
+
+def follow_datasets(current_path):
+    """Index the uploaded version `current_path()` names, when there is one."""
+    engine.source = current_path
+
+
+def refresh_dataset(path):
+    """Called after a dataset upload: re-index `path` off the request thread."""
+    engine._checked = time.monotonic()
+    engine.refresh(path)
 
 
 def generate_insights(user):
     """
     Generate career insights using resume-based similarity.
     """
+    with span("insights_load"):
+        engine.ensure_loaded()
 
-    if df.empty:
+    if engine.empty:
         return {
             "message": "Insights data not available.",
             "top_roles": {}
         }
 
-    if "Resume" not in df.columns or "job_role" not in df.columns:
+    if "Resume" not in engine.columns or "job_role" not in engine.columns:
         return {
             "message": "Required columns not found in dataset.",
             "top_roles": {}
@@ -29,23 +258,21 @@ def generate_insights(user):
 
     user_degree = str(user.get("degree", "")).lower()
 
-    # 🔍 Degree matching from Resume text
-    similar_profiles = df[
-        df["Resume"].astype(str).str.lower().str.contains(user_degree, na=False)
-    ]
+    # 🔍 Degree matching from Resume text (inverted index lookup)
+    with span("insights_match"):
+        role_counts, matched = engine.role_histogram(user_degree)
 
-    if similar_profiles.empty:
+    if not matched:
         return {
             "message": f"No historical profiles found for {user_degree}.",
             "top_roles": {}
         }
 
     # 📊 Role distribution
-    role_counts = similar_profiles["job_role"].value_counts()
-    top_roles = role_counts.head(5).to_dict()
-
-    dominant_role = role_counts.idxmax()
-    percentage = round((role_counts.max() / len(similar_profiles)) * 100)
+    with span("insights_rank"):
+        top_roles = dict(role_counts.most_common(5))
+        dominant_role, dominant_count = role_counts.most_common(1)[0]
+    percentage = round((dominant_count / matched) * 100)
 
     insight_message = (
         f"{percentage}% of candidates with a {user.get('degree')} background "
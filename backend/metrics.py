@@ -0,0 +1,145 @@
+# metrics.py — tiny in-process metrics (histograms and gauges)
+#
+# Cumulative-bucket histograms in the Prometheus style, kept dependency-free.
+# render_prometheus() turns a list of metrics into the text exposition format
+# served at /metrics.
+
+import threading
+
+# milliseconds
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+# items per batch
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, buckets, help_text=""):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        slot = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                slot = i
+                break
+        with self._lock:
+            self._counts[slot] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative, buckets = 0, {}
+        for bound, n in zip(self.buckets + ("+Inf",), counts):
+            cumulative += n
+            buckets[str(bound)] = cumulative
+
+        return {
+            "count": count,
+            "sum": round(total, 4),
+            "mean": round(total / count, 4) if count else 0.0,
+            "buckets": buckets
+        }
+
+    def samples(self, labels=()):
+        snapshot = self.snapshot()
+        lines = [
+            f"{self.name}_bucket{_format_labels(tuple(labels) + (('le', bound),))} {count}"
+            for bound, count in snapshot["buckets"].items()
+        ]
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {snapshot['sum']}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {snapshot['count']}")
+        return lines
+
+
+class HistogramFamily:
+    """Histograms of one name, one child per label-value combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name, buckets, help_text="", label_names=()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(label_names)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, Histogram(self.name, self.buckets, self.help))
+        return child
+
+    def snapshot(self):
+        with self._lock:
+            children = dict(self._children)
+        return {
+            "/".join(values): child.snapshot()
+            for values, child in sorted(children.items())
+        }
+
+    def samples(self):
+        with self._lock:
+            children = dict(self._children)
+        lines = []
+        for values, child in sorted(children.items()):
+            lines.extend(child.samples(tuple(zip(self.label_names, values))))
+        return lines
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help = help_text
+        self._value = 0
+        self._max = 0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+            self._max = max(self._max, value)
+
+    def snapshot(self):
+        with self._lock:
+            return {"value": self._value, "max": self._max}
+
+    def samples(self):
+        with self._lock:
+            return [f"{self.name} {self._value}"]
+
+
+def render_prometheus(metrics):
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in metrics:
+        if metric.help:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,206 @@
+# model_registry.py — versioned, content-addressed model artifacts
+#
+# Training scripts used to overwrite models/job_model.pkl in place, so a
+# worker loading at the wrong moment could read a half-written pickle. Every
+# trained (model, vectorizer) pair is now published as an immutable version:
+#
+#   models/registry/
+#     manifest.json            {"current": "<version>", "versions": {...}}
+#     <version>/job_model.pkl, vectorizer.pkl (+ .joblib / .forest.joblib)
+#
+# <version> is a hash of the two .pkl files. A version directory is filled
+# under a temporary name and renamed into place, and manifest.json is
+# replaced atomically, so readers only ever see complete versions.
+#
+# app.py's ModelArtifacts follows `current` (see artifacts.py): a background
+# reloader loads the new version, pre-warms it and swaps it in.
+#
+#   python model_registry.py publish [model.pkl] [vectorizer.pkl]
+#   python model_registry.py list
+#   python model_registry.py activate <version>     # e.g. roll back
+#   python model_registry.py prune [--keep 5]
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+
+from artifacts import MODEL_PATH, VECTORIZER_PATH, fast_path, is_fresh
+from compiled_forest import compiled_path
+from fsutil import locked, now, write_json_atomic
+
+REGISTRY_DIR = os.environ.get("MODEL_REGISTRY_DIR", "models/registry")
+MODEL_FILE = "job_model.pkl"
+VECTORIZER_FILE = "vectorizer.pkl"
+
+
+def content_hash(paths, length=16):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    return digest.hexdigest()[:length]
+
+
+class ModelRegistry:
+    def __init__(self, directory=REGISTRY_DIR):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self._thread_lock = threading.Lock()
+        self._cached = (None, None)   # (manifest mtime_ns, manifest)
+
+    # ---------- manifest ----------
+
+    def _locked(self):
+        return locked(os.path.join(self.directory, ".lock"), self._thread_lock)
+
+    def manifest(self):
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            return {"current": None, "versions": {}}
+        if self._cached[0] == mtime:
+            return self._cached[1]
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self._cached = (mtime, manifest)
+        return manifest
+
+    def _write_manifest(self, manifest):
+        write_json_atomic(self.manifest_path, manifest, indent=2)
+
+    # ---------- versions ----------
+
+    def version_dir(self, version):
+        return os.path.join(self.directory, version)
+
+    def paths(self, version):
+        directory = self.version_dir(version)
+        return os.path.join(directory, MODEL_FILE), os.path.join(directory, VECTORIZER_FILE)
+
+    def current_version(self):
+        return self.manifest().get("current")
+
+    def resolve(self):
+        """(version, model_path, vectorizer_path) of the live version, or None."""
+        version = self.current_version()
+        if not version:
+            return None
+        return (version, *self.paths(version))
+
+    def versions(self):
+        manifest = self.manifest()
+        return [
+            dict(info, version=version, current=version == manifest.get("current"))
+            for version, info in manifest.get("versions", {}).items()
+        ]
+
+    def publish(self, model_path=MODEL_PATH, vectorizer_path=VECTORIZER_PATH,
+                metrics=None, source=None, activate=True):
+        """
+        Copy a trained pair (and its up-to-date fast copies) into a new
+        version directory. Publishing identical files again is a no-op apart
+        from `activate`. Returns the version id.
+        """
+        version = content_hash([model_path, vectorizer_path])
+        target = self.version_dir(version)
+        target_model, target_vectorizer = self.paths(version)
+
+        os.makedirs(self.directory, exist_ok=True)
+        if not os.path.isdir(target):
+            tmp_dir = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+            os.makedirs(tmp_dir)
+            try:
+                # copy2 keeps mtimes, so the fast copies stay "fresh"
+                copies = [(model_path, target_model), (vectorizer_path, target_vectorizer)]
+                for derive, source_path, target_path in (
+                    (fast_path, model_path, target_model),
+                    (compiled_path, model_path, target_model),
+                    (fast_path, vectorizer_path, target_vectorizer),
+                ):
+                    if is_fresh(derive(source_path), source_path):
+                        copies.append((derive(source_path), derive(target_path)))
+
+                for source_path, target_path in copies:
+                    shutil.copy2(source_path, os.path.join(tmp_dir, os.path.basename(target_path)))
+                os.rename(tmp_dir, target)
+            except OSError:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                if not os.path.isdir(target):   # not just a concurrent publish
+                    raise
+
+        with self._locked():
+            manifest = self.manifest()
+            versions = manifest.setdefault("versions", {})
+            if version not in versions:
+                versions[version] = {
+                    "created_at": now(),
+                    "source": source,
+                    "metrics": metrics or {}
+                }
+            if activate:
+                manifest["current"] = version
+            self._write_manifest(manifest)
+        return version
+
+    def activate(self, version):
+        with self._locked():
+            manifest = self.manifest()
+            if version not in manifest.get("versions", {}):
+                raise KeyError(version)
+            manifest["current"] = version
+            self._write_manifest(manifest)
+
+    def prune(self, keep=5):
+        """
+        Delete all but the newest `keep` versions (never the current one).
+        Workers still serving a pruned version keep their open/mmap'd files.
+        """
+        with self._locked():
+            manifest = self.manifest()
+            versions = manifest.get("versions", {})
+            ordered = sorted(versions, key=lambda v: versions[v].get("created_at", ""), reverse=True)
+            removed = [v for v in ordered[keep:] if v != manifest.get("current")]
+            for version in removed:
+                del versions[version]
+            self._write_manifest(manifest)
+
+        for version in removed:
+            shutil.rmtree(self.version_dir(version), ignore_errors=True)
+        return removed
+
+
+# ------------------ MAIN ------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    publish = commands.add_parser("publish")
+    publish.add_argument("model_path", nargs="?", default=MODEL_PATH)
+    publish.add_argument("vectorizer_path", nargs="?", default=VECTORIZER_PATH)
+    commands.add_parser("list")
+    activate = commands.add_parser("activate")
+    activate.add_argument("version")
+    prune = commands.add_parser("prune")
+    prune.add_argument("--keep", type=int, default=5)
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    if args.command == "publish":
+        version = registry.publish(args.model_path, args.vectorizer_path, source="cli")
+        print(f"💾 Published model version {version} (now current)")
+    elif args.command == "list":
+        for info in registry.versions():
+            marker = "*" if info["current"] else " "
+            print(f"{marker} {info['version']}  {info['created_at']}  {info.get('source') or ''}  {info.get('metrics') or ''}")
+    elif args.command == "activate":
+        registry.activate(args.version)
+        print(f"✅ Model version {args.version} is now current")
+    elif args.command == "prune":
+        for version in registry.prune(args.keep):
+            print(f"🗑️ Removed model version {version}")
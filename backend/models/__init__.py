@@ -0,0 +1,8 @@
+# backend/models — record types (the directory also holds trained artifacts)
+
+from models.education import Education
+from models.skills import Skills
+from models.user import User
+from models.columns import UserColumns
+
+__all__ = ["Education", "Skills", "User", "UserColumns"]
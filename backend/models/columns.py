@@ -0,0 +1,90 @@
+# backend/models/columns.py
+
+import numpy as np
+
+from models.user import User
+from preprocess import SKILL_FIELDS
+
+TEXT_COLUMNS = ("email", "username", "degree", "specialization", "college_tier",
+                "internship", "projects", "backlogs")
+
+
+class UserColumns:
+    """
+    Struct-of-arrays view of a user cohort for bulk work (batch scoring,
+    analytics): one NumPy array per field instead of one object per user.
+
+      text fields   object arrays (None when missing)
+      cgpa          float32, NaN when missing / not a number
+      year          int32, 0 when missing
+      skills        float32 (n_users × len(SKILL_FIELDS)), NaN when not rated
+      has_education bool
+    """
+
+    __slots__ = TEXT_COLUMNS + ("cgpa", "year", "skills", "has_education")
+
+    def __init__(self, n=0):
+        for name in TEXT_COLUMNS:
+            setattr(self, name, np.empty(n, dtype=object))
+        self.cgpa = np.full(n, np.nan, dtype=np.float32)
+        self.year = np.zeros(n, dtype=np.int32)
+        self.skills = np.full((n, len(SKILL_FIELDS)), np.nan, dtype=np.float32)
+        self.has_education = np.zeros(n, dtype=bool)
+
+    @staticmethod
+    def _number(value, kind, missing):
+        try:
+            return kind(value)
+        except (TypeError, ValueError):
+            return missing
+
+    @classmethod
+    def from_records(cls, users):
+        """Build from User records or user dicts."""
+        users = [u if isinstance(u, User) else User.from_dict(u) for u in users]
+        columns = cls(len(users))
+        skill_index = {name: j for j, name in enumerate(SKILL_FIELDS)}
+
+        for i, user in enumerate(users):
+            columns.email[i] = user.email
+            columns.username[i] = user.username
+            education = user.education
+            if education is not None:
+                columns.has_education[i] = True
+                columns.degree[i] = education.degree or None
+                columns.specialization[i] = education.specialization or None
+                columns.college_tier[i] = education.college_tier or None
+                columns.internship[i] = education.internship or None
+                columns.projects[i] = education.projects or None
+                columns.backlogs[i] = education.backlogs or None
+                columns.cgpa[i] = cls._number(education.cgpa, float, np.nan)
+                columns.year[i] = cls._number(education.year, int, 0)
+            if user.skills is not None:
+                for name, value in user.skills.items():
+                    j = skill_index.get(name)
+                    if j is not None:
+                        columns.skills[i, j] = cls._number(value, float, np.nan)
+        return columns
+
+    def __len__(self):
+        return len(self.email)
+
+    def take(self, rows):
+        """Subset by index array or boolean mask."""
+        subset = UserColumns.__new__(UserColumns)
+        for name in self.__slots__:
+            setattr(subset, name, getattr(self, name)[rows])
+        return subset
+
+    def skill(self, name):
+        return self.skills[:, SKILL_FIELDS.index(name)]
+
+    def to_frame(self):
+        import pandas as pd
+        frame = pd.DataFrame({name: getattr(self, name) for name in TEXT_COLUMNS})
+        frame["cgpa"] = self.cgpa
+        frame["year"] = self.year
+        frame["has_education"] = self.has_education
+        for j, name in enumerate(SKILL_FIELDS):
+            frame[f"skill_{name}"] = self.skills[:, j]
+        return frame
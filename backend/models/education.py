@@ -1,20 +1,62 @@
 # backend/models/education.py
 
 class Education:
-    def __init__(self, user_id, degree, specialization, cgpa, graduation_year, certifications):
-        self.user_id = user_id
+    """
+    One user's education, as /education/add stores it. Slotted: no
+    per-instance __dict__, so large cohorts stay small in memory.
+
+    from_dict/to_dict use the stored (wire) keys; missing keys read as ""
+    (certifications: []), the same defaults the handlers used with .get().
+    """
+
+    __slots__ = (
+        "degree", "specialization", "cgpa", "year", "college_tier",
+        "internship", "projects", "backlogs", "certifications"
+    )
+
+    # attribute -> stored key
+    KEYS = {
+        "degree": "degree",
+        "specialization": "specialization",
+        "cgpa": "cgpa",
+        "year": "year",
+        "college_tier": "collegeTier",
+        "internship": "internship",
+        "projects": "projects",
+        "backlogs": "backlogs",
+        "certifications": "certifications",
+    }
+
+    def __init__(self, degree="", specialization="", cgpa="", year="", college_tier="",
+                 internship="", projects="", backlogs="", certifications=None):
         self.degree = degree
         self.specialization = specialization
         self.cgpa = cgpa
-        self.graduation_year = graduation_year
-        self.certifications = certifications
+        self.year = year
+        self.college_tier = college_tier
+        self.internship = internship
+        self.projects = projects
+        self.backlogs = backlogs
+        self.certifications = [] if certifications is None else certifications
+
+    @classmethod
+    def from_dict(cls, data):
+        data = data or {}
+        get = data.get
+        return cls(
+            get("degree", ""), get("specialization", ""), get("cgpa", ""), get("year", ""),
+            get("collegeTier", ""), get("internship", ""), get("projects", ""),
+            get("backlogs", ""), get("certifications") or []
+        )
 
     def to_dict(self):
-        return {
-            "user_id": self.user_id,
-            "degree": self.degree,
-            "specialization": self.specialization,
-            "cgpa": self.cgpa,
-            "graduation_year": self.graduation_year,
-            "certifications": self.certifications
-        }
+        return {key: getattr(self, name) for name, key in self.KEYS.items()}
+
+    def certification_list(self):
+        """Certifications as a list (older records store a single string)."""
+        if isinstance(self.certifications, str):
+            return [self.certifications]
+        return list(self.certifications or [])
+
+    def __repr__(self):
+        return f"Education({self.degree!r}, {self.specialization!r}, cgpa={self.cgpa!r})"
@@ -0,0 +1,38 @@
+# backend/models/skills.py
+
+class Skills:
+    """
+    Skill ratings as submitted by /skills/add: ordered names and values in
+    two tuples. Key order is kept, since the model input text lists skills
+    in the order the user saved them.
+    """
+
+    __slots__ = ("names", "values")
+
+    def __init__(self, names=(), values=()):
+        self.names = tuple(names)
+        self.values = tuple(values)
+
+    @classmethod
+    def from_dict(cls, data):
+        if not data:
+            return cls()
+        return cls(data.keys(), data.values())
+
+    def to_dict(self):
+        return dict(zip(self.names, self.values))
+
+    def items(self):
+        return zip(self.names, self.values)
+
+    def get(self, name, default=None):
+        try:
+            return self.values[self.names.index(name)]
+        except ValueError:
+            return default
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"Skills({self.to_dict()!r})"
@@ -0,0 +1,54 @@
+# backend/models/user.py
+
+from models.education import Education
+from models.skills import Skills
+
+
+class User:
+    """
+    A user as the user store returns it. education / skills are records
+    (None when never saved); every other stored key (about, google_id,
+    legacy degree/cgpa, ...) is kept in `profile` so to_dict round-trips.
+    """
+
+    __slots__ = ("email", "username", "password", "role", "education", "skills", "profile")
+
+    FIELDS = ("email", "username", "password", "role", "education", "skills")
+
+    def __init__(self, email, username=None, password=None, role=None,
+                 education=None, skills=None, profile=None):
+        self.email = email
+        self.username = username
+        self.password = password
+        self.role = role
+        self.education = education
+        self.skills = skills
+        self.profile = profile if profile is not None else {}
+
+    @classmethod
+    def from_dict(cls, data):
+        education = data.get("education")
+        skills = data.get("skills")
+        return cls(
+            data.get("email"),
+            data.get("username"),
+            data.get("password"),
+            data.get("role"),
+            Education.from_dict(education) if education is not None else None,
+            Skills.from_dict(skills) if skills is not None else None,
+            {k: v for k, v in data.items() if k not in cls.FIELDS}
+        )
+
+    def to_dict(self):
+        data = {"username": self.username, "email": self.email, "password": self.password}
+        if self.role is not None:
+            data["role"] = self.role
+        data.update(self.profile)
+        if self.education is not None:
+            data["education"] = self.education.to_dict()
+        if self.skills is not None:
+            data["skills"] = self.skills.to_dict()
+        return data
+
+    def __repr__(self):
+        return f"User({self.email!r})"
@@ -0,0 +1,103 @@
+# prediction_cache.py — bounded LRU/TTL cache of top-k recommendations
+#
+# Keyed on a hash of the normalized feature text plus the model version, so a
+# user re-running a prediction with unchanged inputs never reaches the
+# vectorizer or the model. The model version comes from `version_fn()` (the
+# version ModelArtifacts is serving): when a new model is swapped in, the
+# next lookup notices and drops every cached entry. put() takes the version
+# that actually scored the entry, so results from a model swapped out
+# mid-request are never stored under the new version.
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    # the TF-IDF vectorizer lowercases and splits on whitespace anyway
+    return " ".join(str(text).lower().split())
+
+
+class PredictionCache:
+    def __init__(self, version_fn=lambda: None, max_entries=4096, ttl_seconds=3600):
+        self.version_fn = version_fn
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()   # key -> (expires_at, recommendations)
+        self._lock = threading.Lock()
+        self._version = version_fn()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def _check_version(self):
+        version = self.version_fn()
+        if version != self._version:
+            with self._lock:
+                self._entries.clear()
+                self._version = version
+        return version
+
+    def _key(self, text, version):
+        raw = f"{version}\n{normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, text):
+        if not self.enabled:
+            return None
+        key = self._key(text, self._check_version())
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            recommendations = entry[1]
+
+        return [dict(r) for r in recommendations]
+
+    def put(self, text, recommendations, version):
+        """Store what `version` of the model returned for `text`."""
+        if not self.enabled:
+            return
+        key = self._key(text, version)
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            if version != self._version:
+                if version != self.version_fn():
+                    return   # scored by a model that has been swapped out since
+                # first put since `version` went live: older entries are stale
+                self._entries.clear()
+                self._version = version
+            self._entries[key] = (expires_at, tuple(dict(r) for r in recommendations))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,331 @@
+# prediction_history.py — append-only prediction history with per-user index
+#
+# Layout of the history directory:
+#   segment-*.jsonl  full prediction records (see append_log.SegmentedLog)
+#   index.jsonl      one small line per append:
+#                    {"id": ..., "u": user_id, "loc": [segment, offset, length]}
+#                    (+ "s": [timestamp, top role, top confidence, flagged]
+#                     for the admin log filters, + "agg": chart counter
+#                     delta, see prediction_stats.py)
+#   stats.json       snapshot of the chart counters
+#   flags.jsonl      flag side-table: {"id": ..., "f": true|false} per change
+#
+# Every record gets a stable "id". Re-predicting with the same input_details
+# appends a new version of the existing record (same id); the index then
+# points the id at the newest location, so history keeps its original order
+# exactly like the old in-place update did.
+#
+# Flagging doesn't rewrite the record: set_flags() appends one tiny line per
+# id to flags.jsonl, and the latest value overrides the record's "flagged"
+# field on every read.
+#
+# The index is replayed into memory on startup and tailed on every call, so
+# appends from other worker processes become visible without re-reading the
+# record segments. query() pages through it in timestamp or confidence order
+# using sorted in-memory keys, and only reads the records of the page.
+
+import json
+import os
+import threading
+import uuid
+from bisect import bisect_left, bisect_right, insort
+
+from append_log import SegmentedLog, LineTail, DEFAULT_SEGMENT_BYTES
+from prediction_stats import PredictionStats, delta
+
+INDEX_FILE = "index.jsonl"
+FLAGS_FILE = "flags.jsonl"
+SORT_FIELDS = ("timestamp", "confidence")
+HIGH = "\uffff"   # sorts after every id / timestamp suffix
+
+
+def input_key(input_details):
+    return json.dumps(input_details, sort_keys=True)
+
+
+def summary(record):
+    """[timestamp, top role, top confidence, flagged] — what the filters need."""
+    predictions = record.get("predictions") or []
+    top = predictions[0] if predictions else {}
+    try:
+        confidence = float(top["confidence"])
+    except (KeyError, TypeError, ValueError):
+        confidence = None
+    return [
+        str(record.get("timestamp", "")),
+        top.get("job_role"),
+        confidence,
+        bool(record.get("flagged", False)),
+    ]
+
+
+def sort_key(field, record_id, record_summary):
+    if field == "timestamp":
+        return (record_summary[0], record_id)
+    confidence = record_summary[2]
+    return (confidence if confidence is not None else -1.0, record_id)
+
+
+class SortedKeys:
+    """Sorted list of (value, id) keys."""
+
+    def __init__(self):
+        self.keys = []
+
+    def add(self, key):
+        insort(self.keys, key)
+
+    def remove(self, key):
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+
+
+class PredictionHistory:
+    def __init__(self, directory, legacy_file=None, segment_bytes=DEFAULT_SEGMENT_BYTES):
+        self.log = SegmentedLog(directory, segment_bytes)
+        self._index = LineTail(os.path.join(directory, INDEX_FILE))
+        self._flag_log = LineTail(os.path.join(directory, FLAGS_FILE))
+
+        # id -> location of the newest version, in first-seen order
+        self._locations = {}
+        # user_id -> {id: None}, ordered like self._locations
+        self._by_user = {}
+        # (user_id, input_details json) -> id, for de-duplication
+        self._by_input = {}
+        # id -> flagged, from the flag side-table (overrides the record)
+        self._flags = {}
+        # id -> summary(record), plus sort orders over it for query()
+        self._summaries = {}
+        self._sorted = {field: SortedKeys() for field in SORT_FIELDS}
+        # guards the in-memory index against concurrent request threads
+        self._mutex = threading.Lock()
+
+        with self.log.lock():
+            self._catch_up()
+            if not self._locations and legacy_file and os.path.exists(legacy_file):
+                self._import_legacy(legacy_file)
+
+            # role counters for the dashboard charts
+            self.stats = PredictionStats(directory, INDEX_FILE)
+            if not self.stats.loaded:
+                self.stats.rebuild(self)
+
+    # ---------- index ----------
+
+    def _apply(self, entry):
+        record_id = entry["id"]
+        self._locations[record_id] = entry["loc"]
+        self._by_user.setdefault(entry.get("u"), {})[record_id] = None
+        if entry.get("k") is not None:
+            self._by_input[(entry.get("u"), entry["k"])] = record_id
+
+        # index lines written before summaries existed: read the record once
+        new_summary = entry.get("s") or summary(self.log.read(entry["loc"]))
+        old_summary = self._summaries.get(record_id)
+        for field, keys in self._sorted.items():
+            if old_summary is not None:
+                keys.remove(sort_key(field, record_id, old_summary))
+            keys.add(sort_key(field, record_id, new_summary))
+        self._summaries[record_id] = new_summary
+
+    def _catch_up(self):
+        with self._mutex:
+            for entry in self._index.read_new():
+                self._apply(entry)
+            for entry in self._flag_log.read_new():
+                self._flags[entry["id"]] = entry["f"]
+
+    def _overlay(self, record):
+        flagged = self._flags.get(record.get("id"))
+        if flagged is not None:
+            record["flagged"] = flagged
+        return record
+
+    def _read(self, location):
+        return self._overlay(self.log.read(location))
+
+    def _write(self, record, previous=None):
+        """Append record + index line. Caller holds the log lock."""
+        location = self.log.append(record)
+        details = record.get("input_details")
+        entry = {
+            "id": record["id"],
+            "u": record.get("user_id"),
+            "k": input_key(details) if details is not None else None,
+            "loc": location,
+            "s": summary(record),
+        }
+        agg = delta(previous, record)
+        if agg:
+            entry["agg"] = agg
+        self._index.append(entry)
+        self._catch_up()
+        return record
+
+    def _import_legacy(self, legacy_file):
+        """One-shot import of the old prediction_history.json array."""
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return
+        for entry in entries:
+            entry.setdefault("id", uuid.uuid4().hex)
+            self._write(entry)
+
+    # ---------- writes ----------
+
+    def record(self, entry):
+        """
+        Store a new prediction. If the user already has an entry with the same
+        input_details, that entry's predictions and timestamp are replaced.
+        Returns the stored record (with its "id").
+        """
+        with self.log.lock():
+            self._catch_up()
+            key = (entry.get("user_id"), input_key(entry.get("input_details")))
+            existing_id = self._by_input.get(key)
+
+            previous = None
+            if existing_id is not None:
+                previous = self.log.read(self._locations[existing_id])
+                record = dict(previous, predictions=entry["predictions"], timestamp=entry["timestamp"])
+            else:
+                record = dict(entry, id=uuid.uuid4().hex)
+            return self._write(record, previous)
+
+    def update(self, record_id, changes):
+        """Append a new version of a record with `changes` applied."""
+        with self.log.lock():
+            self._catch_up()
+            location = self._locations.get(record_id)
+            if location is None:
+                return None
+            previous = self.log.read(location)
+            record = dict(previous, **changes)
+            return self._write(record, previous)
+
+    def set_flags(self, record_ids, flagged=True):
+        """Flag / unflag records by id. Returns the ids that exist."""
+        with self.log.lock():
+            self._catch_up()
+            with self._mutex:
+                found = [i for i in dict.fromkeys(record_ids) if i in self._locations]
+            if found:
+                self._flag_log.extend({"id": i, "f": bool(flagged)} for i in found)
+                self._catch_up()
+            return found
+
+    # ---------- reads ----------
+
+    def get(self, record_id):
+        self._catch_up()
+        with self._mutex:
+            location = self._locations.get(record_id)
+        return self._read(location) if location else None
+
+    def latest_for_user(self, user_id):
+        self._catch_up()
+        with self._mutex:
+            ids = self._by_user.get(user_id)
+            if not ids:
+                return None
+            location = self._locations[next(reversed(ids))]
+        return self._read(location)
+
+    def find_by_timestamp(self, timestamp):
+        """Id of the first record with exactly this timestamp (legacy lookups)."""
+        self._catch_up()
+        with self._mutex:
+            keys = self._sorted["timestamp"].keys
+            i = bisect_left(keys, (str(timestamp),))
+            if i < len(keys) and keys[i][0] == str(timestamp):
+                return keys[i][1]
+        return None
+
+    def for_user(self, user_id, offset=0, limit=None):
+        """User's history, oldest first, optionally paginated."""
+        self._catch_up()
+        end = None if limit is None else offset + limit
+        with self._mutex:
+            ids = list(self._by_user.get(user_id, ()))
+            locations = [self._locations[i] for i in ids[offset:end]]
+        return [self._read(location) for location in locations]
+
+    def count_for_user(self, user_id):
+        self._catch_up()
+        with self._mutex:
+            return len(self._by_user.get(user_id, ()))
+
+    def query(self, user=None, role=None, flagged=None, min_confidence=None, max_confidence=None,
+              since=None, until=None, sort="timestamp", descending=True, after=None, limit=50):
+        """
+        One page of records matching the filters, ordered by `sort`
+        ("timestamp" or "confidence"). `after` is the last sort key of the
+        previous page. `until` matches by prefix ("2026-10-18" = whole day).
+        Returns (records, next_key); records are read lazily, next_key is
+        None on the last page.
+        """
+        self._catch_up()
+        with self._mutex:
+            if user is not None:
+                keys = sorted(
+                    sort_key(sort, i, self._summaries[i]) for i in self._by_user.get(user, ())
+                )
+            else:
+                keys = self._sorted[sort].keys
+
+            # range filters on the sort field itself are bisected
+            lo, hi = 0, len(keys)
+            if sort == "timestamp":
+                if since:
+                    lo = bisect_left(keys, (since,))
+                if until:
+                    hi = bisect_right(keys, (until + HIGH,))
+            else:
+                if min_confidence is not None:
+                    lo = bisect_left(keys, (float(min_confidence),))
+                if max_confidence is not None:
+                    hi = bisect_right(keys, (float(max_confidence), HIGH))
+            if after is not None:
+                after = tuple(after)
+                if descending:
+                    hi = min(hi, bisect_left(keys, after))
+                else:
+                    lo = max(lo, bisect_right(keys, after))
+
+            picked = []
+            for pos in (range(hi - 1, lo - 1, -1) if descending else range(lo, hi)):
+                key = keys[pos]
+                timestamp, top_role, confidence, is_flagged = self._summaries[key[1]]
+                is_flagged = self._flags.get(key[1], is_flagged)
+                if role is not None and top_role != role:
+                    continue
+                if flagged is not None and is_flagged != flagged:
+                    continue
+                if sort != "confidence" and (
+                    (min_confidence is not None and (confidence is None or confidence < min_confidence))
+                    or (max_confidence is not None and (confidence is None or confidence > max_confidence))
+                ):
+                    continue
+                if sort != "timestamp" and (
+                    (since and timestamp < since) or (until and timestamp[:len(until)] > until)
+                ):
+                    continue
+                picked.append(key)
+                if len(picked) > limit:
+                    break
+
+            next_key = picked[limit - 1] if len(picked) > limit else None
+            locations = [self._locations[key[1]] for key in picked[:limit]]
+
+        return (self._read(location) for location in locations), next_key
+
+    def iter_all(self):
+        """Every current record in history order."""
+        self._catch_up()
+        with self._mutex:
+            locations = list(self._locations.values())
+        for location in locations:
+            yield self._read(location)
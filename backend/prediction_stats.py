@@ -0,0 +1,164 @@
+# prediction_stats.py — incremental role counters for the dashboard charts
+#
+# /api/visualizations/* used to re-read every history record and count every
+# prediction on each load. The counts are now maintained incrementally:
+#
+#   - PredictionHistory writes a small delta into each index line whose
+#     record changed what it contributes ("agg": roles added / removed, with
+#     the record's degree and day)
+#   - PredictionStats tails index.jsonl and folds those deltas into
+#     role / per-degree / per-day counters, so reads cost O(number of roles)
+#   - the counters and the index position they cover are snapshotted to
+#     <history dir>/stats.json, so a restart only replays newer index lines
+#
+# Rebuild from the full history (e.g. after editing records by hand):
+#   python prediction_stats.py rebuild [history_dir]
+
+import json
+import os
+import sys
+import threading
+from collections import Counter
+
+from append_log import LineTail
+from fsutil import write_json_atomic
+
+STATS_FILE = "stats.json"
+SNAPSHOT_EVERY = 500   # deltas applied between snapshots
+
+
+def contribution(record):
+    """(degree, day, roles) a history record adds to the charts."""
+    if not record:
+        return None
+    details = record.get("input_details") or {}
+    roles = [p.get("job_role") for p in record.get("predictions") or [] if p.get("job_role")]
+    return [details.get("degree") or "Unknown", str(record.get("timestamp", ""))[:10], roles]
+
+
+def delta(previous, record):
+    """Index "agg" field for replacing `previous` with `record`, or None."""
+    old, new = contribution(previous), contribution(record)
+    if old == new:
+        return None
+    agg = {}
+    if new and new[2]:
+        agg["add"] = new
+    if old and old[2]:
+        agg["sub"] = old
+    return agg or None
+
+
+class PredictionStats:
+    def __init__(self, directory, index_file="index.jsonl"):
+        self.path = os.path.join(directory, STATS_FILE)
+        self._index_path = os.path.join(directory, index_file)
+        self._tail = LineTail(self._index_path)
+        self._lock = threading.Lock()
+        self._reset()
+        self.loaded = self._load()
+
+    def _reset(self):
+        self.roles = Counter()
+        self.by_degree = {}
+        self.by_day = {}
+        self._pending = 0
+
+    # ---------- persistence ----------
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        self.roles = Counter(snapshot["roles"])
+        self.by_degree = {k: Counter(v) for k, v in snapshot["by_degree"].items()}
+        self.by_day = {k: Counter(v) for k, v in snapshot["by_day"].items()}
+        self._tail.position = snapshot["position"]
+        return True
+
+    def _save(self):
+        # caller holds self._lock
+        snapshot = {
+            "position": self._tail.position,
+            "roles": self.roles,
+            "by_degree": self.by_degree,
+            "by_day": self.by_day,
+        }
+        write_json_atomic(self.path, snapshot, tmp_suffix=f".{os.getpid()}.tmp", separators=(",", ":"))
+        self._pending = 0
+
+    # ---------- counting ----------
+
+    def _add(self, part, sign):
+        degree, day, roles = part
+        for counter in (
+            self.roles,
+            self.by_degree.setdefault(degree, Counter()),
+            self.by_day.setdefault(day, Counter()),
+        ):
+            for role in roles:
+                counter[role] += sign
+                if counter[role] <= 0:
+                    del counter[role]
+        for table, key in ((self.by_degree, degree), (self.by_day, day)):
+            if not table[key]:
+                del table[key]
+
+    def catch_up(self):
+        with self._lock:
+            for entry in self._tail.read_new():
+                agg = entry.get("agg")
+                if not agg:
+                    continue
+                if "sub" in agg:
+                    self._add(agg["sub"], -1)
+                if "add" in agg:
+                    self._add(agg["add"], +1)
+                self._pending += 1
+            if self._pending >= SNAPSHOT_EVERY:
+                self._save()
+
+    def rebuild(self, history):
+        """Recount from every current record. Holds the history's write lock."""
+        with history.log.lock():
+            records = list(history.iter_all())
+            with self._lock:
+                self._reset()
+                for record in records:
+                    c = contribution(record)
+                    if c[2]:
+                        self._add(c, +1)
+                self._tail.position = os.path.getsize(self._index_path) if os.path.exists(self._index_path) else 0
+                self._save()
+        return len(records)
+
+    # ---------- reads ----------
+
+    def role_counts(self, degree=None):
+        self.catch_up()
+        with self._lock:
+            counter = self.roles if degree is None else self.by_degree.get(degree, Counter())
+            return dict(counter)
+
+    def daily_counts(self):
+        """{day: total predictions}."""
+        self.catch_up()
+        with self._lock:
+            return {day: sum(c.values()) for day, c in sorted(self.by_day.items())}
+
+
+# ------------------ MAIN ------------------
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Usage: python prediction_stats.py rebuild [history_dir]")
+        sys.exit(1)
+
+    from prediction_history import PredictionHistory
+
+    directory = sys.argv[2] if len(sys.argv) > 2 else os.environ.get("HISTORY_DIR", "prediction_history")
+    history = PredictionHistory(directory)
+    count = history.stats.rebuild(history)
+    print(f"✅ Chart counters rebuilt from {count} records ({history.stats.path})")
@@ -1,7 +1,18 @@
 # preprocess.py — Edu2Job user data preprocessing
-
+#
+#   preprocess_user(user)     one feature vector (list)
+#   preprocess_users(users)   float32 matrix, same column layout, built column
+#                             by column with pandas/NumPy instead of per user
+#
+#   python preprocess.py [--json]   → feature store (feature_store.py), only
+#                                     changed users recomputed (+ legacy JSON)
+
+import argparse
 import json
 
+import numpy as np
+import pandas as pd
+
 # ------------------ CATEGORIES ------------------
 
 DEGREES = ["B.Tech", "M.Tech", "M.Sc", "MBA", "B.Com", "Diploma", "Unknown"]
@@ -22,6 +33,18 @@ SKILL_FIELDS = [
     "problem_solving"
 ]
 
+FEATURE_NAMES = (
+    [f"degree={d}" for d in DEGREES] +
+    [f"specialization={s}" for s in SPECIALIZATIONS] +
+    ["college_tier", "cgpa", "internship", "projects", "backlogs"] +
+    [f"skill={s}" for s in SKILL_FIELDS]
+)
+
+# category -> column index, for the batch path
+DEGREE_INDEX = {d: i for i, d in enumerate(DEGREES)}
+SPECIALIZATION_INDEX = {s: i for i, s in enumerate(SPECIALIZATIONS)}
+TIER_VALUE = {t: i + 1 for i, t in enumerate(COLLEGE_TIERS)}   # 1–4
+
 # ------------------ HELPERS ------------------
 
 def one_hot(value, categories):
@@ -117,43 +140,155 @@ def preprocess_user(user):
     return feature_vector
 
 
+# ------------------ PREPROCESS MANY USERS ------------------
+
+INPUT_FIELDS = ["degree", "specialization", "college_tier", "cgpa", "internship", "projects", "backlogs"]
+
+
+def _input_frame(users):
+    """Only the columns preprocessing reads; skills flattened to skills.<field>."""
+    if isinstance(users, pd.DataFrame):
+        frame = users.reset_index(drop=True)
+        records = frame["skills"] if "skills" in frame.columns else None
+    else:
+        users = list(users)
+        frame = pd.DataFrame({name: [u.get(name) for u in users] for name in INPUT_FIELDS}, dtype=object)
+        records = [u.get("skills") for u in users]
+
+    if records is not None:
+        skills = [s if isinstance(s, dict) else {} for s in records]
+        for field in SKILL_FIELDS:
+            frame[f"skills.{field}"] = pd.Series([s.get(field) for s in skills], dtype=object)
+    return frame
+
+
+def _column(frame, name):
+    if name in frame.columns:
+        return frame[name].astype(object)
+    return pd.Series([None] * len(frame), index=frame.index, dtype=object)
+
+
+def _category_index(values, index, unknown):
+    """Same rule as one_hot(): stripped value, anything unlisted is Unknown."""
+    stripped = values.where(values.fillna("").astype(bool), "Unknown").astype(str).str.strip()
+    return stripped.map(index).fillna(unknown).to_numpy(dtype=np.intp)
+
+
+def _to_float(values):
+    return pd.to_numeric(values, errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+
+
+def _projects(values):
+    """projects_to_num() on a column."""
+    text = values.where(values.fillna("").astype(bool), "").astype(str)
+    return np.select(
+        [text.str.contains("0", regex=False), text.str.contains("2", regex=False), text.str.contains("4", regex=False)],
+        [1, 2, 3],
+        default=0
+    )
+
+
+def _backlogs(values):
+    """safe_int() on a column: integer strings, numbers truncated, else 0."""
+    is_text = values.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+    result = np.zeros(len(values), dtype=np.float64)
+
+    # .str only on the string cells: a column of numbers / None has none
+    text = values[is_text].astype(str).str.strip()
+    result[is_text] = pd.to_numeric(
+        text.where(text.str.fullmatch(r"[+-]?\d+", na=False)), errors="coerce"
+    ).fillna(0).to_numpy(dtype=np.float64)
+
+    numbers = np.trunc(pd.to_numeric(values[~is_text], errors="coerce").to_numpy(dtype=np.float64))
+    result[~is_text] = np.where(np.isfinite(numbers), numbers, 0)   # int(nan / inf) fails → 0
+    return result
+
+
+def preprocess_users(users, dtype=np.float32):
+    """
+    Feature matrix (n_users × len(FEATURE_NAMES)) for a list of user dicts
+    or a DataFrame; row i equals preprocess_user(users[i]).
+    """
+    frame = _input_frame(users)
+    n = len(frame)
+    rows = np.arange(n)
+    matrix = np.zeros((n, len(FEATURE_NAMES)), dtype=np.float64)
+
+    offset = 0
+    for name, categories, index in (
+        ("degree", DEGREES, DEGREE_INDEX),
+        ("specialization", SPECIALIZATIONS, SPECIALIZATION_INDEX),
+    ):
+        columns = _category_index(_column(frame, name), index, index["Unknown"])
+        matrix[rows, offset + columns] = 1
+        offset += len(categories)
+
+    tier = _column(frame, "college_tier").fillna("Unknown")
+    matrix[:, offset] = tier.map(TIER_VALUE).fillna(TIER_VALUE["Unknown"])
+    matrix[:, offset + 1] = np.round(_to_float(_column(frame, "cgpa")) / 10, 3)
+    matrix[:, offset + 2] = _column(frame, "internship").astype(str).str.strip().str.lower().eq("yes")
+    matrix[:, offset + 3] = _projects(_column(frame, "projects"))
+    matrix[:, offset + 4] = _backlogs(_column(frame, "backlogs"))
+    offset += 5
+
+    for i, skill in enumerate(SKILL_FIELDS):
+        matrix[:, offset + i] = np.round(_to_float(_column(frame, f"skills.{skill}")) / 10, 2)
+
+    return matrix.astype(dtype, copy=False)
+
+
+def has_academic_data(users):
+    """Boolean mask: users with a degree or a cgpa (run_preprocessing keeps these)."""
+    frame = _input_frame(users)
+    degree = _column(frame, "degree").fillna("").astype(bool)
+    cgpa = _column(frame, "cgpa").fillna("").astype(bool)
+    return (degree | cgpa).to_numpy()
+
+
+def save_features(path, matrix, emails=None):
+    """.npy for the bare matrix, .npz with column names (+ emails) otherwise."""
+    if path.endswith(".npy"):
+        np.save(path, matrix)
+        return
+    arrays = {"X": matrix, "columns": np.array(FEATURE_NAMES)}
+    if emails is not None:
+        arrays["emails"] = np.array(emails, dtype=str)
+    np.savez(path, **arrays)
+
+
 # ------------------ MAIN ------------------
 
-def run_preprocessing():
-    with open("users.json", "r") as f:
-        users = json.load(f)
-
-    processed_users = []
-
-    for user in users:
-        # Skip users with no academic data
-        if not user.get("degree") and not user.get("cgpa"):
-            continue
-
-        processed_vector = preprocess_user(user)
-
-        processed_users.append({
-            "username": user.get("username"),
-            "email": user.get("email"),
-            "raw": {
-                "degree": user.get("degree"),
-                "specialization": user.get("specialization"),
-                "cgpa": user.get("cgpa"),
-                "college_tier": user.get("college_tier"),
-                "internship": user.get("internship"),
-                "projects": user.get("projects"),
-                "backlogs": user.get("backlogs"),
-                "skills": user.get("skills", {})
-            },
-            "processed": processed_vector
-        })
-
-    with open("users_preprocessed.json", "w") as out:
-        json.dump(processed_users, out, indent=4)
+def run_preprocessing(write_json=True):
+    """Bring the feature store up to date and write users_preprocessed.json."""
+    from feature_store import FeatureStore, raw_fields
+    from user_store import open_user_store
+
+    users = list(open_user_store().all_users())
+    store = FeatureStore()
+    changed = store.sync(users)
+
+    emails, matrix = store.dense()
+    if write_json:
+        by_email = {user.get("email"): user for user in users}
+        processed_users = [
+            {
+                "username": by_email[email].get("username"),
+                "email": email,
+                "raw": raw_fields(by_email[email]),
+                "processed": vector
+            }
+            # every value has at most 3 decimals; drop the float32 noise
+            for email, vector in zip(emails, np.round(matrix.astype(np.float64), 3).tolist())
+        ]
+        with open("users_preprocessed.json", "w") as out:
+            json.dump(processed_users, out)
 
     print("✅ Preprocessing completed")
-    print(f"📊 Total processed users: {len(processed_users)}")
+    print(f"📊 Total processed users: {len(emails)} ({changed} recomputed)")
 
 
 if __name__ == "__main__":
-    run_preprocessing()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-json", action="store_true", help="only sync the feature store")
+    args = parser.parse_args()
+    run_preprocessing(write_json=not args.no_json)
@@ -0,0 +1,192 @@
+# retrain_jobs.py — background model retraining
+#
+# /admin/retrain-model submits a job here instead of blocking a request
+# worker. Each job runs day6_train_model.run_training() in a separate
+# process (ProcessPoolExecutor, one job at a time by default) and writes its
+# candidate artifacts to models/jobs/<job_id>/.
+#
+# Job state lives in models/jobs/<job_id>/status.json, written by the child
+# process as it goes, so progress can be polled from any worker:
+#
+#   queued → running → succeeded → promoted | rejected
+#                    ↘ failed | cancelled
+#
+# Cancellation: queued jobs are dropped from the pool; running jobs see a
+# `cancel` marker file and stop at the next step boundary.
+#
+# The child and the app both update status.json (read, update, replace);
+# each update holds an flock on the job's .lock file so neither overwrites
+# the other's fields.
+#
+# When a job succeeds, the candidate is promoted only if its accuracy clears
+# the gate (RETRAIN_MIN_ACCURACY); `on_success(job_dir, result)` then
+# publishes it and hot-swaps the in-memory model.
+
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from fsutil import JOB_ID_RE, locked, now as _now, read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+JOBS_DIR = os.environ.get("RETRAIN_JOBS_DIR", "models/jobs")
+MIN_ACCURACY = float(os.environ.get("RETRAIN_MIN_ACCURACY", 0.5))
+
+TERMINAL_STATES = {"failed", "cancelled", "promoted", "rejected"}
+_status_thread_lock = threading.Lock()
+
+
+def _status_locked(job_dir):
+    return locked(os.path.join(job_dir, ".lock"), _status_thread_lock)
+
+
+def _store_status(job_dir, status, **fields):
+    # caller holds _status_locked(job_dir)
+    status.update(fields, updated_at=_now())
+    write_json_atomic(os.path.join(job_dir, "status.json"), status, indent=2)
+    return status
+
+
+def _write_status(job_dir, **fields):
+    with _status_locked(job_dir):
+        return _store_status(job_dir, _read_status(job_dir) or {}, **fields)
+
+
+def _read_status(job_dir):
+    return read_json(os.path.join(job_dir, "status.json"))
+
+
+def _run_job(job_dir):
+    """Child-process entry point."""
+    from day6_train_model import run_training, TrainingCancelled
+
+    cancel_marker = os.path.join(job_dir, "cancel")
+    _write_status(job_dir, state="running", progress=0, message="Training started")
+
+    def progress(message, percent):
+        _write_status(job_dir, progress=percent, message=message)
+
+    try:
+        result = run_training(
+            output_dir=job_dir,
+            progress=progress,
+            cancelled=lambda: os.path.exists(cancel_marker)
+        )
+    except TrainingCancelled as e:
+        _write_status(job_dir, state="cancelled", message=f"Cancelled after: {e}")
+        return None
+
+    _write_status(job_dir, state="succeeded", result=result)
+    return result
+
+
+class RetrainJobManager:
+    def __init__(self, jobs_dir=JOBS_DIR, min_accuracy=MIN_ACCURACY, on_success=None, max_workers=1):
+        self.jobs_dir = jobs_dir
+        self.min_accuracy = min_accuracy
+        self.on_success = on_success
+        self.max_workers = max_workers
+        self._pool = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _executor(self):
+        if self._pool is None:
+            # spawn: never fork a process that holds Flask threads and locks
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def job_dir(self, job_id):
+        return os.path.join(self.jobs_dir, job_id)
+
+    # ---------- public ----------
+
+    def submit(self, requested_by=None):
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = self.job_dir(job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        _write_status(
+            job_dir, job_id=job_id, state="queued", progress=0,
+            message="Waiting for a training slot", requested_by=requested_by,
+            created_at=_now(), min_accuracy=self.min_accuracy
+        )
+
+        with self._lock:
+            future = self._executor().submit(_run_job, job_dir)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._finished(job_id, f))
+        return job_id
+
+    def _finished(self, job_id, future):
+        job_dir = self.job_dir(job_id)
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+        if future.cancelled():
+            _write_status(job_dir, state="cancelled", message="Cancelled before start")
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error("Retrain job %s failed: %s", job_id, error)
+            _write_status(job_dir, state="failed", message=str(error))
+            return
+
+        result = future.result()
+        if result is None:
+            return  # cancelled while running
+
+        if result["accuracy"] < self.min_accuracy:
+            _write_status(
+                job_dir, state="rejected",
+                message=f"Accuracy {result['accuracy']:.4f} below gate {self.min_accuracy:.4f}"
+            )
+            return
+
+        try:
+            if self.on_success:
+                self.on_success(job_dir, result)
+            _write_status(job_dir, state="promoted", message="New model is live")
+        except Exception as e:
+            logger.exception("Promoting retrain job %s failed", job_id)
+            _write_status(job_dir, state="failed", message=f"Promotion failed: {e}")
+
+    def status(self, job_id):
+        if not JOB_ID_RE.match(job_id or ""):
+            return None
+        return _read_status(self.job_dir(job_id))
+
+    def cancel(self, job_id):
+        status = self.status(job_id)
+        if status is None:
+            return None
+        if status.get("state") in TERMINAL_STATES or status.get("state") == "succeeded":
+            return status
+
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            return _write_status(self.job_dir(job_id), state="cancelled", message="Cancelled before start")
+
+        # running: the child stops at its next step boundary
+        job_dir = self.job_dir(job_id)
+        open(os.path.join(job_dir, "cancel"), "w").close()
+        with _status_locked(job_dir):
+            # re-checked under the lock: the job may have finished meanwhile
+            status = _read_status(job_dir) or {}
+            if status.get("state") in TERMINAL_STATES or status.get("state") == "succeeded":
+                return status
+            return _store_status(job_dir, status, message="Cancellation requested")
+
+    def list_jobs(self):
+        if not os.path.isdir(self.jobs_dir):
+            return []
+        jobs = [self.status(name) for name in os.listdir(self.jobs_dir)]
+        jobs = [job for job in jobs if job]
+        return sorted(jobs, key=lambda job: job.get("created_at", ""), reverse=True)
@@ -0,0 +1,126 @@
+# stream_preprocess.py — chunked resume dataset preprocessing
+#
+# Same output as dataset_preprocess.py + day4_train_test_split.py, but the
+# source CSVs are read with `chunksize`, so peak memory is bounded by the
+# chunk size instead of the corpus size.
+#
+#   pass 1: collect the job roles (sorted, same codes as LabelEncoder)
+#   pass 2: per chunk → clean, encode, append to edu2job_cleaned.csv and
+#           write train/test shards
+#
+# The train/test split is hash based on the row content (role + resume), so
+# it is deterministic, independent of chunk size, and identical duplicates
+# always land on the same side.
+#
+#   python stream_preprocess.py [--chunksize 50000] [--test-fraction 0.2]
+
+import argparse
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from dataset_store import convert_csv
+
+SOURCES = [
+    "dataset/Technical_Category_Resume.csv",
+    "dataset/NonTechnical_Category_Resume.csv",
+]
+CLEANED_PATH = "dataset/edu2job_cleaned.csv"
+TRAIN_PATH = "dataset/train_data.csv"
+TEST_PATH = "dataset/test_data.csv"
+SHARD_DIR = "dataset/shards"
+LABELS_PATH = "dataset/job_roles.json"
+
+CHUNK_SIZE = 50_000
+TEST_FRACTION = 0.2
+
+
+# ------------------ HELPERS ------------------
+
+def iter_clean_chunks(sources=SOURCES, chunksize=CHUNK_SIZE):
+    """Yield cleaned (job_role, Resume) chunks in source order."""
+    for path in sources:
+        for chunk in pd.read_csv(path, usecols=["Category", "Resume"], chunksize=chunksize):
+            chunk = chunk.rename(columns={"Category": "job_role"})[["job_role", "Resume"]]
+            yield chunk.dropna()
+
+
+def collect_labels(sources=SOURCES, chunksize=CHUNK_SIZE):
+    """Sorted unique job roles — the same order LabelEncoder would assign."""
+    roles = set()
+    for chunk in iter_clean_chunks(sources, chunksize):
+        roles.update(chunk["job_role"].unique())
+    return sorted(roles)
+
+
+def is_test_row(role, resume, test_fraction=TEST_FRACTION):
+    digest = hashlib.md5(f"{role}\0{resume}".encode("utf-8")).digest()
+    bucket = int.from_bytes(digest[:8], "big") / 2 ** 64
+    return bucket < test_fraction
+
+
+def write_csv(df, path, first):
+    df.to_csv(path, mode="w" if first else "a", header=first, index=False)
+
+
+# ------------------ MAIN ------------------
+
+def run_streaming_preprocess(sources=SOURCES, chunksize=CHUNK_SIZE, test_fraction=TEST_FRACTION):
+    print("\n==============================")
+    print("📌 STREAMING DATASET PREPROCESSING")
+    print("==============================\n")
+
+    labels = collect_labels(sources, chunksize)
+    encoding = {role: code for code, role in enumerate(labels)}
+    print(f"✅ {len(labels)} job roles found")
+
+    with open(LABELS_PATH, "w", encoding="utf-8") as f:
+        json.dump(labels, f, indent=2)
+
+    os.makedirs(SHARD_DIR, exist_ok=True)
+    for name in os.listdir(SHARD_DIR):
+        if name.endswith(".csv"):
+            os.remove(os.path.join(SHARD_DIR, name))
+
+    total = n_train = n_test = 0
+    for shard, chunk in enumerate(iter_clean_chunks(sources, chunksize)):
+        chunk = chunk.assign(job_role_encoded=chunk["job_role"].map(encoding))
+        first = shard == 0
+
+        write_csv(chunk, CLEANED_PATH, first)
+
+        test_mask = [
+            is_test_row(role, resume, test_fraction)
+            for role, resume in zip(chunk["job_role"], chunk["Resume"])
+        ]
+        split = chunk[["Resume", "job_role_encoded"]]
+        train_part = split[[not t for t in test_mask]]
+        test_part = split[test_mask]
+
+        train_part.to_csv(os.path.join(SHARD_DIR, f"train-{shard:05d}.csv"), index=False)
+        test_part.to_csv(os.path.join(SHARD_DIR, f"test-{shard:05d}.csv"), index=False)
+        write_csv(train_part, TRAIN_PATH, first)
+        write_csv(test_part, TEST_PATH, first)
+
+        total += len(chunk)
+        n_train += len(train_part)
+        n_test += len(test_part)
+        print(f"🧹 Chunk {shard}: {len(chunk)} rows")
+
+    print(f"\n💾 Cleaned dataset saved: {CLEANED_PATH} ({total} rows)")
+    print(f"💾 Train / test: {n_train} / {n_test} rows (shards in {SHARD_DIR})")
+
+    if convert_csv(CLEANED_PATH, chunksize=chunksize) is not None:
+        print("💾 Columnar dataset saved: dataset/edu2job_cleaned.parquet")
+    print("\n🎯 Preprocessing completed successfully!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--test-fraction", type=float, default=TEST_FRACTION)
+    args = parser.parse_args()
+
+    run_streaming_preprocess(chunksize=args.chunksize, test_fraction=args.test_fraction)
@@ -0,0 +1,97 @@
+# tracing.py — per-request stage timings
+#
+#   with span("vectorize"):
+#       matrix = vectorizer.transform(texts)
+#
+# Every span is observed into stage_duration_ms{endpoint, stage} and added to
+# the current request's trace (thread-local). app.py opens a trace per request
+# and closes it after the response, which observes request_duration_ms and,
+# when SLOW_REQUEST_MS is set, logs the per-stage breakdown of slow requests
+# (logger "slow_requests"; also appended to SLOW_REQUEST_LOG if set).
+#
+# Spans outside a request (scripts, background threads) still feed the
+# histograms, under endpoint="background".
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from metrics import HistogramFamily, LATENCY_BUCKETS_MS
+
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", 0))
+SLOW_REQUEST_LOG = os.environ.get("SLOW_REQUEST_LOG")
+
+STAGE_MS = HistogramFamily(
+    "stage_duration_ms", LATENCY_BUCKETS_MS,
+    "Time spent in one stage of a request", ("endpoint", "stage")
+)
+REQUEST_MS = HistogramFamily(
+    "request_duration_ms", LATENCY_BUCKETS_MS,
+    "Total request handling time", ("endpoint", "status")
+)
+
+slow_logger = logging.getLogger("slow_requests")
+if SLOW_REQUEST_LOG:
+    slow_logger.addHandler(logging.FileHandler(SLOW_REQUEST_LOG))
+
+_local = threading.local()
+
+
+class Trace:
+    def __init__(self, endpoint, path=None):
+        self.endpoint = endpoint
+        self.path = path
+        self.started = time.perf_counter()
+        self.stages = []   # [(stage, ms)] in call order
+
+
+def start_trace(endpoint, path=None):
+    _local.trace = Trace(endpoint, path)
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+def record(stage, ms):
+    trace = current_trace()
+    STAGE_MS.labels(trace.endpoint if trace else "background", stage).observe(ms)
+    if trace is not None:
+        trace.stages.append((stage, round(ms, 3)))
+
+
+def record_stages(timings):
+    for stage, ms in timings.items():
+        record(stage, ms)
+
+
+@contextmanager
+def span(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, (time.perf_counter() - start) * 1000)
+
+
+def finish_trace(status):
+    trace = current_trace()
+    if trace is None:
+        return None
+    _local.trace = None
+
+    total_ms = (time.perf_counter() - trace.started) * 1000
+    REQUEST_MS.labels(trace.endpoint, str(status)).observe(total_ms)
+
+    if SLOW_REQUEST_MS and total_ms >= SLOW_REQUEST_MS:
+        slow_logger.warning(json.dumps({
+            "endpoint": trace.endpoint,
+            "path": trace.path,
+            "status": status,
+            "total_ms": round(total_ms, 3),
+            "stages": trace.stages
+        }))
+    return total_ms
@@ -4,7 +4,13 @@ import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
+import os
 import pickle
+import shutil
+import tempfile
+
+from artifacts import export_artifacts, install_artifacts
+from model_registry import ModelRegistry
 
 print("\n==============================")
 print("📌 DAY-3: MODEL TRAINING")
@@ -43,8 +49,24 @@ accuracy = accuracy_score(y_test, y_pred)
 
 print(f"🎯 Model Accuracy: {accuracy:.4f}")
 
-# Save model files
-pickle.dump(model, open("models/job_model.pkl", "wb"))
-pickle.dump(vectorizer, open("models/vectorizer.pkl", "wb"))
+# Save model files (+ fast-start copies used by app.py) to a staging dir,
+# then move them over models/*.pkl so a running app never reads a partial file
+staging_dir = tempfile.mkdtemp(prefix=".staging-", dir="models")
+try:
+    staged_model = os.path.join(staging_dir, "job_model.pkl")
+    staged_vectorizer = os.path.join(staging_dir, "vectorizer.pkl")
+    with open(staged_model, "wb") as f:
+        pickle.dump(model, f)
+    with open(staged_vectorizer, "wb") as f:
+        pickle.dump(vectorizer, f)
+    export_artifacts(model, vectorizer, staged_model, staged_vectorizer)
+    install_artifacts(staged_model, staged_vectorizer)
+finally:
+    shutil.rmtree(staging_dir, ignore_errors=True)
 
 print("💾 Model files saved successfully")
+print("💾 Fast artifacts saved")
+
+# new registry version: running app workers swap it in without a restart
+version = ModelRegistry().publish(metrics={"accuracy": float(accuracy)}, source="train_model.py")
+print(f"💾 Published model version {version}")
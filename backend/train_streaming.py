@@ -0,0 +1,230 @@
+# train_streaming.py — out-of-core training with hashed TF-IDF + SGD
+#
+# train_model.py / day6_train_model.py fit TfidfVectorizer on the whole
+# training text in memory. This trainer never holds more than one batch:
+#
+#   HashingVectorizer      stateless, no vocabulary to build
+#   online IDF             document frequencies accumulated batch by batch
+#   SGDClassifier          logistic loss, trained with partial_fit
+#
+# The saved vectorizer is a Pipeline(HashingVectorizer → TfidfTransformer)
+# and the model an SGDClassifier, so both expose the same
+# transform / predict_proba / classes_ that /predict-job-role already uses.
+#
+#   python train_streaming.py [--batch-size 20000] [--epochs 2]
+#   python train_streaming.py --resume      # continue on new data, update IDF
+#
+# --resume expects rows appended to the training CSV: the state file keeps
+# how many rows were already counted and a hash of them, and only rows past
+# that point update the IDF and the model. If the first rows no longer
+# match, it stops instead of counting documents twice.
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.pipeline import make_pipeline
+
+from artifacts import export_artifacts, install_artifacts, MODEL_PATH, VECTORIZER_PATH
+from model_registry import ModelRegistry
+
+COLUMNS = ["Resume", "job_role_encoded"]
+TRAIN_PATH = "dataset/train_data.csv"
+TEST_PATH = "dataset/test_data.csv"
+LABELS_PATH = "dataset/job_roles.json"
+STATE_PATH = "models/streaming_state.joblib"
+
+N_FEATURES = 2 ** 18
+BATCH_SIZE = 20_000
+
+
+def make_hashing_vectorizer(n_features=N_FEATURES):
+    # norm=None: raw counts, TF-IDF weighting + l2 norm happen afterwards
+    return HashingVectorizer(
+        n_features=n_features,
+        stop_words="english",
+        alternate_sign=False,
+        norm=None
+    )
+
+
+def iter_batches(path, batch_size, skip=0):
+    """(texts, labels) batches, after the first `skip` data rows."""
+    skiprows = range(1, skip + 1) if skip else None
+    for chunk in pd.read_csv(path, usecols=COLUMNS, chunksize=batch_size, skiprows=skiprows):
+        chunk = chunk.dropna()
+        yield chunk["Resume"].astype(str).tolist(), chunk["job_role_encoded"].to_numpy()
+
+
+def hash_rows(digest, chunk):
+    digest.update(pd.util.hash_pandas_object(chunk, index=False).to_numpy().tobytes())
+
+
+def collect_classes(path, batch_size):
+    if os.path.exists(LABELS_PATH):
+        with open(LABELS_PATH, "r", encoding="utf-8") as f:
+            return np.arange(len(json.load(f)))
+    classes = set()
+    for chunk in pd.read_csv(path, usecols=["job_role_encoded"], chunksize=batch_size):
+        classes.update(chunk["job_role_encoded"].dropna().astype(int).unique())
+    return np.array(sorted(classes))
+
+
+# ------------------ ONLINE IDF ------------------
+
+class OnlineIdf:
+    """Document frequencies over hashed features, updated one batch at a time."""
+
+    def __init__(self, n_features):
+        self.n_features = n_features
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+
+    def update(self, counts):
+        # counts: CSR term counts; each stored entry is one (doc, term) pair
+        self.doc_freq += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_docs += counts.shape[0]
+
+    def idf(self):
+        # same smoothing as TfidfVectorizer(smooth_idf=True)
+        return np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1.0
+
+    def transformer(self):
+        tfidf = TfidfTransformer()
+        tfidf.idf_ = self.idf()
+        tfidf.n_features_in_ = self.n_features
+        return tfidf
+
+
+def accumulate_idf(path, batch_size, idf, hashing, seen_rows=0, seen_digest=None):
+    """
+    One pass over the training CSV. The first `seen_rows` rows must hash to
+    `seen_digest` (a previous run counted them); the rest add to the
+    document frequencies. Returns (rows, digest) for the state file.
+    """
+    digest = hashlib.sha256()
+    rows = 0
+    for chunk in pd.read_csv(path, usecols=COLUMNS, chunksize=batch_size):
+        if rows < seen_rows:
+            old = chunk.iloc[:seen_rows - rows]
+            hash_rows(digest, old)
+            rows += len(old)
+            chunk = chunk.iloc[len(old):]
+            if rows == seen_rows and digest.hexdigest() != seen_digest:
+                raise ValueError(
+                    f"The first {seen_rows} rows of {path} changed since the last run; "
+                    "--resume only adds appended rows (retrain without --resume)"
+                )
+        if len(chunk):
+            hash_rows(digest, chunk)
+            rows += len(chunk)
+            texts = chunk.dropna()["Resume"].astype(str).tolist()
+            idf.update(hashing.transform(texts))
+
+    if rows < seen_rows:
+        raise ValueError(
+            f"{path} has {rows} rows but {seen_rows} were already counted; "
+            "retrain without --resume"
+        )
+    return rows, digest.hexdigest()
+
+
+# ------------------ TRAINING ------------------
+
+def train_streaming(batch_size=BATCH_SIZE, epochs=2, n_features=N_FEATURES, resume=False):
+    print("\n📌 STREAMING MODEL TRAINING STARTED\n")
+
+    hashing = make_hashing_vectorizer(n_features)
+
+    seen_rows, seen_digest = 0, None
+    if resume and os.path.exists(STATE_PATH):
+        state = joblib.load(STATE_PATH)
+        if "rows" not in state:
+            raise ValueError(f"{STATE_PATH} has no row count to resume from; retrain without --resume")
+        idf, model = state["idf"], state["model"]
+        seen_rows, seen_digest = state["rows"], state["digest"]
+        classes = model.classes_
+        print(f"✅ Resuming from {STATE_PATH} ({idf.n_docs} docs, {seen_rows} rows seen)")
+    else:
+        idf = OnlineIdf(n_features)
+        model = SGDClassifier(loss="log_loss", alpha=1e-5, random_state=42)
+        classes = collect_classes(TRAIN_PATH, batch_size)
+
+    # STEP 1: document frequencies of the unseen rows (one pass, one batch in memory)
+    start = time.perf_counter()
+    rows, digest = accumulate_idf(TRAIN_PATH, batch_size, idf, hashing, seen_rows, seen_digest)
+    print(f"✅ IDF accumulated over {idf.n_docs} documents ({rows - seen_rows} new rows)")
+
+    vectorizer = make_pipeline(hashing, idf.transformer())
+    if rows == seen_rows:
+        print("✅ No new rows since the last run, nothing to train")
+        return model, vectorizer
+
+    # STEP 2: incremental fit on the unseen rows
+    for epoch in range(epochs):
+        for texts, y in iter_batches(TRAIN_PATH, batch_size, skip=seen_rows):
+            model.partial_fit(vectorizer.transform(texts), y, classes=classes)
+        print(f"✅ Epoch {epoch + 1}/{epochs} done")
+    print(f"⏱️ Training time: {time.perf_counter() - start:.1f}s\n")
+
+    # STEP 3: evaluation (streamed too)
+    y_true, y_pred = [], []
+    metrics = {}
+    if os.path.exists(TEST_PATH):
+        for texts, y in iter_batches(TEST_PATH, batch_size):
+            y_true.append(y)
+            y_pred.append(model.predict(vectorizer.transform(texts)))
+    if y_true:
+        y_true, y_pred = np.concatenate(y_true), np.concatenate(y_pred)
+        metrics = {
+            "accuracy": float(accuracy_score(y_true, y_pred)),
+            "f1": float(f1_score(y_true, y_pred, average="weighted"))
+        }
+        print("📊 MODEL PERFORMANCE")
+        print(f"Accuracy : {metrics['accuracy'] * 100:.2f}%")
+        print(f"F1 Score : {metrics['f1']:.4f}\n")
+
+    # STEP 4: save (same files the app serves) + state for --resume
+    # (staged, then moved over the live files: a running app never reads a partial pickle)
+    os.makedirs("models", exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=".staging-", dir="models")
+    try:
+        staged_model = os.path.join(staging_dir, "job_model.pkl")
+        staged_vectorizer = os.path.join(staging_dir, "vectorizer.pkl")
+        joblib.dump(model, staged_model)
+        joblib.dump(vectorizer, staged_vectorizer)
+        export_artifacts(model, vectorizer, staged_model, staged_vectorizer)
+        install_artifacts(staged_model, staged_vectorizer)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+    joblib.dump({"idf": idf, "model": model, "rows": rows, "digest": digest}, STATE_PATH + ".tmp")
+    os.replace(STATE_PATH + ".tmp", STATE_PATH)
+
+    print(f"💾 Model saved: {MODEL_PATH}")
+    print(f"💾 Vectorizer saved: {VECTORIZER_PATH}")
+    print(f"💾 Training state saved: {STATE_PATH}")
+
+    version = ModelRegistry().publish(metrics=metrics, source="train_streaming.py")
+    print(f"💾 Published model version {version}")
+    return model, vectorizer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--n-features", type=int, default=N_FEATURES)
+    parser.add_argument("--resume", action="store_true")
+    args = parser.parse_args()
+
+    train_streaming(args.batch_size, args.epochs, args.n_features, args.resume)
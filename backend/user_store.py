@@ -0,0 +1,369 @@
+# user_store.py — Edu2Job user repository
+#
+# The app used to parse the whole users.json on every request and rewrite it
+# on every change. UserStore hides that behind a small repository API so the
+# backend can be swapped:
+#
+#   "sqlite" (default) → users.db with a unique index on email and an index on
+#                        username; reads and single-field updates are one row.
+#   "json"             → the original users.json file (kept for local hacking).
+#
+# Existing users.json data is migrated into SQLite automatically the first
+# time an empty database is opened, or on demand with:
+#
+#   python user_store.py migrate [users.json] [users.db]
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+
+from fsutil import write_json_atomic
+from models import User, UserColumns
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+USERS_JSON_PATH = os.path.join(BASE_DIR, "users.json")
+USERS_DB_PATH = os.environ.get("USER_DB_PATH", os.path.join(BASE_DIR, "users.db"))
+
+# Top-level keys that get their own column; everything else (about, degree,
+# cgpa, ...) lives in the `profile` JSON column.
+COLUMN_FIELDS = ("email", "username", "password", "role", "education", "skills")
+
+
+# ------------------ BASE ------------------
+
+class UserStore:
+    """
+    Repository interface used by app.py. Users are plain dicts;
+    get_record() / columns() return them as models records.
+    """
+
+    def get_by_email(self, email):
+        raise NotImplementedError
+
+    def get_by_login(self, identifier):
+        """Find a user by email or username (login form accepts both)."""
+        raise NotImplementedError
+
+    def create_user(self, user):
+        """Insert a new user. Returns False if the email is already taken."""
+        raise NotImplementedError
+
+    def update_profile(self, email, fields):
+        """Update top-level profile fields. Returns False if user not found."""
+        raise NotImplementedError
+
+    def set_education(self, email, education):
+        raise NotImplementedError
+
+    def set_skills(self, email, skills):
+        raise NotImplementedError
+
+    def all_users(self):
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+    # ---------- records ----------
+
+    def get_record(self, email):
+        """The user as a models.User record, or None."""
+        user = self.get_by_email(email)
+        return User.from_dict(user) if user else None
+
+    def columns(self):
+        """Every user as one models.UserColumns (struct of arrays)."""
+        return UserColumns.from_records(self.all_users())
+
+
+# ------------------ JSON BACKEND ------------------
+
+class JsonUserStore(UserStore):
+    """Original whole-file users.json behaviour."""
+
+    def __init__(self, path=USERS_JSON_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            try:
+                return json.load(f)
+            except Exception as e:
+                logger.error("Failed to load users.json: %s", str(e))
+                return []
+
+    def _save(self, users):
+        write_json_atomic(self.path, users, indent=2)
+
+    def _update(self, email, apply):
+        with self._lock:
+            users = self._load()
+            user = next((u for u in users if u.get("email") == email), None)
+            if not user:
+                return False
+            apply(user)
+            self._save(users)
+            return True
+
+    def get_by_email(self, email):
+        return next((u for u in self._load() if u.get("email") == email), None)
+
+    def get_by_login(self, identifier):
+        return next(
+            (u for u in self._load()
+             if u.get("email") == identifier or u.get("username") == identifier),
+            None
+        )
+
+    def create_user(self, user):
+        with self._lock:
+            users = self._load()
+            if any(u.get("email") == user["email"] for u in users):
+                return False
+            users.append(user)
+            self._save(users)
+            return True
+
+    def update_profile(self, email, fields):
+        return self._update(email, lambda u: u.update(fields))
+
+    def set_education(self, email, education):
+        return self._update(email, lambda u: u.__setitem__("education", education))
+
+    def set_skills(self, email, skills):
+        return self._update(email, lambda u: u.__setitem__("skills", skills))
+
+    def all_users(self):
+        return self._load()
+
+    def count(self):
+        return len(self._load())
+
+
+# ------------------ SQLITE BACKEND ------------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    email     TEXT NOT NULL,
+    username  TEXT,
+    password  TEXT,
+    role      TEXT,
+    profile   TEXT NOT NULL DEFAULT '{}',
+    education TEXT,
+    skills    TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users(email);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+"""
+
+
+class SqliteUserStore(UserStore):
+    """
+    Embedded SQLite backend.
+
+    Usernames are indexed but not unique: Google sign-in uses the display name
+    as username, so existing data already has duplicates. Login by username
+    keeps the old "first match wins" behaviour (ORDER BY id).
+    """
+
+    def __init__(self, path=USERS_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------- row <-> dict ----------
+
+    @staticmethod
+    def _to_row(user):
+        profile = {k: v for k, v in user.items() if k not in COLUMN_FIELDS}
+        education = user.get("education")
+        skills = user.get("skills")
+        return (
+            user["email"],
+            user.get("username"),
+            user.get("password"),
+            user.get("role"),
+            json.dumps(profile),
+            json.dumps(education) if education is not None else None,
+            json.dumps(skills) if skills is not None else None,
+        )
+
+    @staticmethod
+    def _to_user(row):
+        if row is None:
+            return None
+        user = {
+            "username": row["username"],
+            "email": row["email"],
+            "password": row["password"],
+        }
+        if row["role"] is not None:
+            user["role"] = row["role"]
+        user.update(json.loads(row["profile"] or "{}"))
+        if row["education"] is not None:
+            user["education"] = json.loads(row["education"])
+        if row["skills"] is not None:
+            user["skills"] = json.loads(row["skills"])
+        return user
+
+    # ---------- reads ----------
+
+    def get_by_email(self, email):
+        row = self._conn().execute(
+            "SELECT * FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        return self._to_user(row)
+
+    def get_by_login(self, identifier):
+        user = self.get_by_email(identifier)
+        if user:
+            return user
+        row = self._conn().execute(
+            "SELECT * FROM users WHERE username = ? ORDER BY id LIMIT 1",
+            (identifier,)
+        ).fetchone()
+        return self._to_user(row)
+
+    def all_users(self):
+        cursor = self._conn().execute("SELECT * FROM users ORDER BY id")
+        for row in cursor:
+            yield self._to_user(row)
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    # ---------- writes ----------
+
+    def create_user(self, user):
+        conn = self._conn()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO users (email, username, password, role, profile, education, skills) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self._to_row(user)
+                )
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def update_profile(self, email, fields):
+        conn = self._conn()
+        with conn:
+            # BEGIN IMMEDIATE so the profile read-modify-write can't interleave
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT profile FROM users WHERE email = ?", (email,)
+            ).fetchone()
+            if row is None:
+                return False
+
+            profile = json.loads(row["profile"] or "{}")
+            columns = {}
+            for key, value in fields.items():
+                if key == "email":
+                    continue
+                if key in COLUMN_FIELDS:
+                    columns[key] = json.dumps(value) if key in ("education", "skills") else value
+                else:
+                    profile[key] = value
+
+            assignments = ", ".join(f"{col} = ?" for col in columns)
+            sql = "UPDATE users SET profile = ?" + (", " + assignments if assignments else "")
+            conn.execute(
+                sql + " WHERE email = ?",
+                (json.dumps(profile), *columns.values(), email)
+            )
+            return True
+
+    def _set_json_column(self, email, column, value):
+        conn = self._conn()
+        with conn:
+            cursor = conn.execute(
+                f"UPDATE users SET {column} = ? WHERE email = ?",
+                (json.dumps(value), email)
+            )
+        return cursor.rowcount > 0
+
+    def set_education(self, email, education):
+        return self._set_json_column(email, "education", education)
+
+    def set_skills(self, email, skills):
+        return self._set_json_column(email, "skills", skills)
+
+
+# ------------------ MIGRATION ------------------
+
+def migrate_json_users(json_path, store):
+    """
+    One-shot import of users.json into `store`.
+    Users whose email already exists in the store are skipped.
+    Returns (imported, skipped).
+    """
+    if not os.path.exists(json_path):
+        return 0, 0
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        users = json.load(f)
+
+    imported = skipped = 0
+    for user in users:
+        if not user.get("email") or not store.create_user(user):
+            skipped += 1
+            continue
+        imported += 1
+
+    logger.info("Migrated %d users from %s (%d skipped)", imported, json_path, skipped)
+    return imported, skipped
+
+
+def open_user_store(backend=None):
+    """
+    Build the configured store (USER_STORE env var: "sqlite" or "json").
+    An empty SQLite database is seeded from users.json on first open.
+    """
+    backend = backend or os.environ.get("USER_STORE", "sqlite")
+
+    if backend == "json":
+        return JsonUserStore(USERS_JSON_PATH)
+    if backend != "sqlite":
+        raise ValueError(f"Unknown user store backend: {backend}")
+
+    store = SqliteUserStore(USERS_DB_PATH)
+    if store.count() == 0:
+        migrate_json_users(USERS_JSON_PATH, store)
+    return store
+
+
+# ------------------ MAIN ------------------
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "migrate":
+        print("Usage: python user_store.py migrate [users.json] [users.db]")
+        sys.exit(1)
+
+    json_path = sys.argv[2] if len(sys.argv) > 2 else USERS_JSON_PATH
+    db_path = sys.argv[3] if len(sys.argv) > 3 else USERS_DB_PATH
+
+    imported, skipped = migrate_json_users(json_path, SqliteUserStore(db_path))
+    print(f"✅ Migrated {imported} users into {db_path} ({skipped} skipped)")
@@ -29,7 +29,11 @@ function uploadDataset() {
     })
     .then(res => res.json())
     .then(data => {
-        status.innerText = data.message || "Dataset uploaded successfully.";
+        if (data.error) {
+            status.innerText = data.error + (data.details ? ": " + data.details.join("; ") : "");
+        } else {
+            status.innerText = data.message || "Dataset uploaded successfully.";
+        }
     })
     .catch(err => {
         status.innerText = "Dataset upload failed.";
@@ -57,14 +61,14 @@ function retrainModel() {
 }
 
 
-function flag(ts) {
+function flag(id) {
   fetch("http://127.0.0.1:5000/admin/flag-prediction", {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
       "Authorization": `Bearer ${localStorage.getItem("token")}`
     },
-    body: JSON.stringify({ timestamp: ts })
+    body: JSON.stringify({ id: id })
   })
   .then(res => res.json())
   .then(data => {
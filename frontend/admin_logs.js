@@ -9,8 +9,14 @@ if (!token) {
 
 
 
-function loadFeedback() {
-  fetch("http://127.0.0.1:5000/admin/feedback", {
+let feedbackOffset = 0;
+
+// First page, or the next one when `more` is true (newest first)
+function loadFeedback(more = false) {
+  if (!more) feedbackOffset = 0;
+  const params = new URLSearchParams({ limit: 50, offset: feedbackOffset });
+
+  fetch("http://127.0.0.1:5000/admin/feedback?" + params, {
     headers: {
       "Authorization": "Bearer " + token
     }
@@ -18,9 +24,9 @@ function loadFeedback() {
   .then(res => res.json())
   .then(data => {
     const table = document.querySelector("#feedbackTable tbody");
-    table.innerHTML = "";
+    if (!more) table.innerHTML = "";
 
-    data.forEach(fb => {
+    data.items.forEach(fb => {
       table.innerHTML += `
         <tr>
           <td>${fb.user}</td>
@@ -31,12 +37,21 @@ function loadFeedback() {
         </tr>
       `;
     });
+
+    feedbackOffset = data.next_offset;
+    document.getElementById("loadMoreFeedback").style.display = data.next_offset != null ? "inline-block" : "none";
   });
 }
 
 
-function loadLogs() {
-  fetch("http://127.0.0.1:5000/admin/prediction-logs", {
+let logsCursor = null;
+
+// First page, or the next one when `more` is true (cursor pagination)
+function loadLogs(more = false) {
+  const params = new URLSearchParams({ limit: 50 });
+  if (more && logsCursor) params.set("cursor", logsCursor);
+
+  fetch("http://127.0.0.1:5000/admin/prediction-logs?" + params, {
     headers: {
       "Authorization": "Bearer " + token
     }
@@ -44,38 +59,41 @@ function loadLogs() {
   .then(res => res.json())
   .then(data => {
     const table = document.querySelector("#logsTable tbody");
-    table.innerHTML = "";
+    if (!more) table.innerHTML = "";
 
-    data.forEach(log => {
+    data.items.forEach(log => {
       table.innerHTML += `
         <tr>
           <td>${log.user}</td>
-          <td>${log.predicted_role}</td>
-          <td>${log.confidence}%</td>
+          <td>${log.predicted_role || "N/A"}</td>
+          <td>${log.confidence != null ? log.confidence + "%" : "-"}</td>
           <td>${log.timestamp}</td>
           <td>${log.flagged ? "🚩 Flagged" : "OK"}</td>
           <td>
             ${
               log.flagged
               ? "<span style='color:red;'>Flagged</span>"
-              : `<button class="flag-btn" onclick="flag('${log.timestamp}')">Flag</button>`
+              : `<button class="flag-btn" onclick="flag('${log.id}')">Flag</button>`
             }
           </td>
         </tr>
       `;
     });
+
+    logsCursor = data.next_cursor;
+    document.getElementById("loadMoreLogs").style.display = logsCursor ? "inline-block" : "none";
   });
 }
 loadLogs();
 
-function flag(ts) {
+function flag(id) {
   fetch("http://127.0.0.1:5000/admin/flag-prediction", {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
       "Authorization": "Bearer " + token
     },
-    body: JSON.stringify({ timestamp: ts })
+    body: JSON.stringify({ id: id })
   })
   .then(res => res.json())
   .then(data => {